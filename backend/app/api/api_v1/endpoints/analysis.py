@@ -1,30 +1,46 @@
-from fastapi import APIRouter, Depends, Query, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, Query, HTTPException, Response
 from typing import List, Optional
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
-from app.models.schemas import ArticleResponse, BiasDistribution
-from app.services.news_service import get_news_by_ticker
+from app.models.schemas import ArticleResponse, BiasDistribution, AnalysisJobResponse
+from app.services.news_service import get_news_page
 from app.services.analysis_manager import AnalysisManager
+from app.services.job_queue import get_job
+from app.services.result_cache import result_cache
 
 router = APIRouter()
 
 @router.get("/ticker/{ticker}", response_model=List[ArticleResponse])
 def get_ticker_news(
     ticker: str,
+    response: Response,
     bias: Optional[str] = Query(None, description="Comma-separated bias categories (left,lean_left,center,lean_right,right)"),
     sentiment: Optional[str] = Query(None, description="Comma-separated sentiment values (bullish,bearish,neutral)"),
     limit: int = Query(20, description="Number of articles to return"),
-    offset: int = Query(0, description="Offset for pagination"),
+    offset: int = Query(0, description="Offset for pagination, ignored when a cursor is given"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     db: Session = Depends(get_db)
 ):
     """
     Get news articles for a specific ticker with optional filtering by bias and sentiment.
+    
+    The cursor of the next page, if any, is returned in the X-Next-Cursor header.
     """
     bias_list = bias.split(",") if bias else None
     sentiment_list = sentiment.split(",") if sentiment else None
     
-    return get_news_by_ticker(db, ticker, bias_list, sentiment_list, limit, offset)
+    try:
+        articles, next_cursor = get_news_page(
+            db, ticker=ticker, bias_list=bias_list, sentiment_list=sentiment_list,
+            limit=limit, offset=offset, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return articles
 
 @router.get("/ticker/{ticker}/analysis")
 def get_ticker_analysis(
@@ -35,8 +51,9 @@ def get_ticker_analysis(
     """
     Get comprehensive analysis for a ticker including bias and sentiment.
     """
-    analysis_manager = AnalysisManager(db)
-    return analysis_manager.analyze_ticker(ticker, days)
+    return result_cache.get_or_compute(
+        "analysis", [ticker], days, lambda: AnalysisManager(db).analyze_ticker(ticker, days)
+    )
 
 @router.get("/ticker/{ticker}/bias", response_model=BiasDistribution)
 def get_ticker_bias_distribution(
@@ -47,8 +64,9 @@ def get_ticker_bias_distribution(
     """
     Get bias distribution statistics for a specific ticker.
     """
-    analysis_manager = AnalysisManager(db)
-    return analysis_manager.bias_service.calculate_bias_distribution(ticker, days)
+    return result_cache.get_or_compute(
+        "bias", [ticker], days, lambda: AnalysisManager(db).bias_service.calculate_bias_distribution(ticker, days)
+    )
 
 @router.get("/ticker/{ticker}/sentiment")
 def get_ticker_sentiment(
@@ -59,8 +77,9 @@ def get_ticker_sentiment(
     """
     Get sentiment distribution statistics for a specific ticker.
     """
-    analysis_manager = AnalysisManager(db)
-    return analysis_manager.sentiment_service.get_sentiment_distribution(ticker, days)
+    return result_cache.get_or_compute(
+        "sentiment", [ticker], days, lambda: AnalysisManager(db).sentiment_service.get_sentiment_distribution(ticker, days)
+    )
 
 @router.get("/portfolio")
 def get_portfolio_analysis(
@@ -70,19 +89,39 @@ def get_portfolio_analysis(
 ):
     """
     Get comprehensive analysis for a portfolio of tickers.
+    
+    Tickers are deduplicated and returned in alphabetical order.
     """
-    ticker_list = tickers.split(",")
-    analysis_manager = AnalysisManager(db)
-    return analysis_manager.get_portfolio_analysis(ticker_list, days)
+    # The cache shares one result between orderings and repeats, so compute it in one canonical form
+    ticker_list = sorted(set(tickers.split(",")))
+    return result_cache.get_or_compute(
+        "portfolio", ticker_list, days, lambda: AnalysisManager(db).get_portfolio_analysis(ticker_list, days)
+    )
 
-@router.post("/analyze")
+@router.post("/analyze", status_code=202)
 def run_analysis(
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """
-    Trigger background analysis of news articles.
+    Queue background analysis of news articles for the analysis worker.
     """
     analysis_manager = AnalysisManager(db)
-    analysis_manager.run_batch_analysis(background_tasks)
-    return {"message": "Analysis started in background"}
+    job, created = analysis_manager.enqueue_batch_analysis()
+    return {
+        "message": "Analysis queued" if created else "Analysis already queued",
+        "job_id": job.id,
+        "status": job.status
+    }
+
+@router.get("/jobs/{job_id}", response_model=AnalysisJobResponse)
+def get_analysis_job(
+    job_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    Get the status and progress of a background analysis job.
+    """
+    job = get_job(db, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
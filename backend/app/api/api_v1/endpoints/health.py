@@ -1,5 +1,11 @@
 from fastapi import APIRouter
 
+from app.services.ingestion_pipeline import load_metrics as load_ingestion_metrics
+from app.services.rate_limiter import rate_limiters
+from app.services.result_cache import result_cache
+from app.services.single_flight import analysis_single_flight
+from app.services.sentiment_cache import sentiment_cache
+
 router = APIRouter()
 
 @router.get("")
@@ -8,3 +14,41 @@ def health_check():
     Health check endpoint to verify API is running.
     """
     return {"status": "ok", "message": "API is operational"}
+
+@router.get("/rate-limits")
+def rate_limit_metrics():
+    """
+    Per-provider rate limiter metrics (waiting time, delayed and rejected requests).
+    """
+    return rate_limiters.metrics()
+
+@router.get("/sentiment-cache")
+def sentiment_cache_metrics():
+    """
+    Sentiment result cache metrics (hits, misses, hit rate and size).
+    """
+    return sentiment_cache.metrics()
+
+@router.get("/result-cache")
+def result_cache_metrics():
+    """
+    Analysis result cache metrics (hits, misses and hit rate per endpoint, size).
+    """
+    return result_cache.metrics()
+
+@router.get("/analysis-coalescing")
+def analysis_coalescing_metrics():
+    """
+    Concurrent identical analysis requests that shared one computation.
+    """
+    return analysis_single_flight.metrics()
+
+@router.get("/ingestion")
+def ingestion_metrics():
+    """
+    Per-stage metrics of the last ingestion pipeline run (throughput, queue depth, latency).
+    """
+    metrics = load_ingestion_metrics()
+    if metrics is None:
+        return {"status": "no data", "message": "No ingestion cycle has finished yet"}
+    return metrics
@@ -1,29 +1,43 @@
-from fastapi import APIRouter, Depends, Query, HTTPException, Path
+from fastapi import APIRouter, Depends, Query, HTTPException, Path, Response
 from typing import List, Optional
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
-from app.models.schemas import ArticleResponse
-from app.services.news_service import get_news_by_ticker
+from app.models.schemas import ArticleResponse, SimilarArticleResponse
+from app.services.news_service import get_news_page, get_news_for_tickers, get_similar_articles
 
 router = APIRouter()
 
 @router.get("", response_model=List[ArticleResponse])
 def get_news(
+    response: Response,
     ticker: str = Query(..., description="Stock ticker symbol"),
     bias: Optional[str] = Query(None, description="Comma-separated bias categories (left,lean_left,center,lean_right,right)"),
     sentiment: Optional[str] = Query(None, description="Comma-separated sentiment values (bullish,bearish,neutral)"),
     limit: int = Query(20, description="Number of articles to return"),
-    offset: int = Query(0, description="Offset for pagination"),
+    offset: int = Query(0, description="Offset for pagination, ignored when a cursor is given"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     db: Session = Depends(get_db)
 ):
     """
     Get news articles for a specific ticker with optional filtering by bias and sentiment.
+    
+    The cursor of the next page, if any, is returned in the X-Next-Cursor header.
     """
     bias_list = bias.split(",") if bias else None
     sentiment_list = sentiment.split(",") if sentiment else None
     
-    return get_news_by_ticker(db, ticker, bias_list, sentiment_list, limit, offset)
+    try:
+        articles, next_cursor = get_news_page(
+            db, ticker=ticker, bias_list=bias_list, sentiment_list=sentiment_list,
+            limit=limit, offset=offset, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return articles
 
 @router.get("/portfolio")
 def get_portfolio_news(
@@ -35,12 +49,9 @@ def get_portfolio_news(
     Get news for multiple tickers (portfolio view).
     """
     ticker_list = tickers.split(",")
-    result = {}
-    
-    for ticker in ticker_list:
-        result[ticker] = get_news_by_ticker(db, ticker, None, None, limit, 0)
     
-    return result
+    # The newest articles of every ticker in one query
+    return get_news_for_tickers(db, ticker_list, limit=limit)
 
 @router.get("/trending")
 def get_trending_news(
@@ -58,8 +69,7 @@ def get_trending_news(
     default_tickers = ["AAPL", "MSFT", "GOOGL", "AMZN", "TSLA"]
     result = []
     
-    for ticker in default_tickers:
-        articles = get_news_by_ticker(db, ticker, None, None, 2, 0)
+    for articles in get_news_for_tickers(db, default_tickers, limit=2).values():
         result.extend(articles)
     
     # Sort by published date (newest first) and limit
@@ -78,3 +88,18 @@ def get_news_sources(
     return {
         "message": "This endpoint will return a list of news sources with their bias ratings."
     }
+
+@router.get("/{article_id}/similar", response_model=List[SimilarArticleResponse])
+def get_similar_news(
+    article_id: int = Path(..., description="ID of the article to find related coverage for"),
+    limit: int = Query(10, ge=1, le=100, description="Number of similar articles to return"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get related coverage of an article: the most similar articles across sources and bias categories.
+    """
+    articles = get_similar_articles(db, article_id, limit)
+    if articles is None:
+        raise HTTPException(status_code=404, detail=f"Article {article_id} not found")
+    
+    return articles
@@ -19,6 +19,8 @@ class Settings(BaseSettings):
     # External API keys
     POLYGON_API_KEY: Optional[str] = None
     FINNHUB_API_KEY: Optional[str] = None
+    FINANCIAL_DATASETS_API_KEY: Optional[str] = None
+    WHALEWISDOM_API_KEY: Optional[str] = None
     OPENAI_API_KEY: Optional[str] = None
     REDDIT_CLIENT_ID: Optional[str] = None
     REDDIT_CLIENT_SECRET: Optional[str] = None
@@ -26,6 +28,34 @@ class Settings(BaseSettings):
     # News fetch settings
     NEWS_FETCH_INTERVAL_MINUTES: int = 5
     MAX_NEWS_AGE_DAYS: int = 7
+    NEWS_FETCH_CONCURRENCY: int = 20  # Max tickers fetched concurrently per cycle
+    NEWS_FETCH_OVERLAP_MINUTES: int = 30  # Re-fetch window behind each watermark for late arrivals
+    
+    # Outbound HTTP client settings (shared, pooled client per provider)
+    HTTP_MAX_CONNECTIONS: int = 20
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 60.0
+    HTTP_TIMEOUT_SECONDS: float = 15.0
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    HTTP2_ENABLED: bool = False  # Requires the optional 'h2' package
+    
+    # Per-provider rate limits (token bucket: sustained rate and burst size)
+    POLYGON_RATE_LIMIT_PER_MINUTE: float = 5.0  # Free tier quota
+    POLYGON_RATE_LIMIT_BURST: int = 5
+    FINNHUB_RATE_LIMIT_PER_MINUTE: float = 60.0
+    FINNHUB_RATE_LIMIT_BURST: int = 30
+    FINANCIAL_DATASETS_RATE_LIMIT_PER_MINUTE: float = 60.0
+    FINANCIAL_DATASETS_RATE_LIMIT_BURST: int = 10
+    WHALEWISDOM_RATE_LIMIT_PER_MINUTE: float = 20.0
+    WHALEWISDOM_RATE_LIMIT_BURST: int = 5
+    RATE_LIMIT_MAX_WAIT_SECONDS: float = 120.0  # Requests that would wait longer are rejected
+    
+    # Streaming ingestion pipeline settings (fetch -> normalize/dedup -> enrich -> persist)
+    INGESTION_QUEUE_SIZE: int = 32  # Ticker batches buffered between stages before upstream stages wait
+    INGESTION_ENRICH_BATCH_SIZE: int = 64  # Articles per sentiment/embedding pass during ingestion
+    INGESTION_ENRICH_MAX_WAIT_SECONDS: float = 0.2  # How long enrichment waits to fill a batch
+    INGESTION_EMBEDDINGS_ENABLED: bool = True  # Embed articles during ingestion instead of only in the embedding job
+    INGESTION_METRICS_PATH: str = os.getenv("INGESTION_METRICS_PATH", "data/ingestion_metrics.json")
     
     # Security settings (if implementing user auth)
     SECRET_KEY: str = os.getenv("SECRET_KEY", "supersecretkey")
@@ -33,8 +63,50 @@ class Settings(BaseSettings):
     
     # NLP settings
     SENTIMENT_MODEL_NAME: str = "ProsusAI/finbert"
+    SENTIMENT_INFERENCE_BACKEND: str = "pytorch"  # pytorch, pytorch_int8 or onnx (needs optimum[onnxruntime])
+    SENTIMENT_ONNX_DIR: str = os.getenv("SENTIMENT_ONNX_DIR", "data/onnx")  # Cached ONNX exports
+    SENTIMENT_BATCH_SIZE: int = 32  # Texts per sentiment model forward pass
+    MODEL_WARMUP_ON_STARTUP: bool = False  # Load NLP models in the background when the API starts
+    SENTIMENT_MODEL_VERSION: str = "1"  # Bump when the model or its weights change to invalidate cached results
+    SENTIMENT_CACHE_ENABLED: bool = True
+    SENTIMENT_CACHE_PATH: str = os.getenv("SENTIMENT_CACHE_PATH", "data/sentiment_cache.sqlite3")
+    SENTIMENT_CACHE_MAX_ENTRIES: int = 500000
+    SENTIMENT_CACHE_MAX_AGE_DAYS: float = 90.0
+    SENTIMENT_WORKERS: int = 0  # Worker processes for batch sentiment analysis, 0 runs it in-process
+    SENTIMENT_WORKER_THREADS: Optional[int] = None  # Torch threads per worker (default: cores / workers)
+    SENTIMENT_WORKER_CHUNK_SIZE: int = 64  # Articles per task sent to a worker
     EMBEDDING_MODEL_NAME: str = "sentence-transformers/all-MiniLM-L6-v2"
+    EMBEDDING_BATCH_SIZE: int = 64  # Texts per encoder forward pass
+    EMBEDDING_CHUNK_SIZE: int = 1024  # Articles read, embedded and committed together
     SIMILARITY_THRESHOLD: float = 0.85  # Threshold for article similarity
+    NEAR_DUPLICATE_DETECTION_ENABLED: bool = True
+    NEAR_DUPLICATE_WINDOW_HOURS: int = 48  # Sliding window of articles kept in the MinHash/LSH index
+    NEAR_DUPLICATE_NUM_PERM: int = 128  # MinHash signature length
+    
+    # Similar-article (ANN) index settings
+    SIMILARITY_INDEX_PATH: str = os.getenv("SIMILARITY_INDEX_PATH", "data/similarity_index")
+    SIMILARITY_INDEX_NLIST: int = 256  # Number of IVF clusters
+    SIMILARITY_INDEX_NPROBE: int = 32  # Clusters scanned per query
+    SIMILARITY_INDEX_MIN_POINTS_PER_LIST: int = 39  # Vectors per cluster needed before training
+    SIMILARITY_INDEX_REFRESH_SECONDS: int = 60  # How often the API picks up newly embedded articles
+    
+    # Background analysis job queue settings
+    ANALYSIS_JOB_LEASE_SECONDS: int = 300  # Jobs whose worker stops renewing the lease are taken over
+    ANALYSIS_JOB_MAX_ATTEMPTS: int = 3
+    ANALYSIS_JOB_RETRY_BACKOFF_SECONDS: int = 30  # Doubled after each failed attempt
+    ANALYSIS_WORKER_POLL_SECONDS: float = 5.0  # Idle wait between queue checks
+    ANALYSIS_BATCH_LIMIT: int = 200  # Articles per bias and sentiment pass in a batch analysis job
+    ANALYSIS_COALESCE_REQUESTS: bool = True  # Concurrent identical analysis endpoint requests share one computation
+    
+    # Analysis endpoint result cache settings
+    RESULT_CACHE_ENABLED: bool = True
+    RESULT_CACHE_BACKEND: str = "memory"  # memory (per process) or redis (shared, needs the 'redis' package)
+    RESULT_CACHE_REDIS_URL: Optional[str] = None  # e.g. redis://redis:6379/0
+    RESULT_CACHE_TTL_SECONDS: float = 300.0  # Upper bound on staleness when writes happen in another process
+    RESULT_CACHE_MAX_ENTRIES: int = 1024  # LRU bound of the memory backend
+    
+    # Source bias resolver settings
+    SOURCE_BIAS_REFRESH_SECONDS: int = 300  # How often to check the sources table for changes
     
     class Config:
         env_file = ".env"
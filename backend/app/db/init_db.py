@@ -5,7 +5,7 @@ import os
 import sys
 
 from app.db.session import Base, engine
-from app.models.models import Article, Source, User, Watchlist
+from app.models.models import Article, ArticleDuplicate, ArticleDailyCount, Source, FetchWatermark, AnalysisJob, User, Watchlist
 from app.core.config import settings
 
 def init_db():
@@ -20,7 +20,7 @@ if config.config_file_name is not None:
 # add your model's MetaData object here
 # for 'autogenerate' support
 from app.db.session import Base
-from app.models.models import Article, Source, User, Watchlist
+from app.models.models import Article, ArticleDuplicate, ArticleDailyCount, Source, FetchWatermark, AnalysisJob, User, Watchlist
 target_metadata = Base.metadata
 
 # other values from the config, defined by the needs of env.py,
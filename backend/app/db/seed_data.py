@@ -12,6 +12,7 @@ from sqlalchemy.orm import Session
 from app.db.session import SessionLocal
 from app.models.models import Source
 from app.models.schemas import BiasCategory
+from app.services.source_bias_resolver import source_bias_resolver
 
 # Initial sources with bias ratings based on AllSides
 INITIAL_SOURCES = [
@@ -52,6 +53,7 @@ def seed_sources(db: Session):
             db.add(source)
     
     db.commit()
+    source_bias_resolver.invalidate()
     print(f"Added {len(INITIAL_SOURCES)} initial sources to the database.")
 
 def main():
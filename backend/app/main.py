@@ -1,8 +1,12 @@
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
 from app.api.api_v1.api import api_router
+from app.services.http_client import http_clients
+from app.services.model_registry import model_registry
+from app.services.sentiment_worker_pool import sentiment_worker_pool
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -17,8 +21,27 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        # Let browsers read the cursor of the next news page
+        expose_headers=["X-Next-Cursor"],
     )
 
+@app.on_event("startup")
+async def warmup_models():
+    """Load NLP models in the background so the first analysis request doesn't wait for them."""
+    if settings.MODEL_WARMUP_ON_STARTUP:
+        asyncio.get_running_loop().run_in_executor(None, model_registry.warmup)
+
+@app.on_event("shutdown")
+async def close_http_clients():
+    """Release pooled outbound HTTP connections on shutdown."""
+    await http_clients.aclose()
+
+@app.on_event("shutdown")
+def stop_sentiment_workers():
+    """Stop sentiment worker processes, letting running chunks finish."""
+    sentiment_worker_pool.shutdown()
+
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Text, Enum, ARRAY
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Float, Text, Enum, ARRAY, JSON, UniqueConstraint, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -19,11 +19,54 @@ class Article(Base):
     source = Column(String, nullable=False)
     bias_label = Column(Enum(BiasCategory), nullable=False)
     sentiment_label = Column(Enum(SentimentCategory), nullable=False)
+    sentiment_analyzed_at = Column(DateTime, nullable=True)  # UTC, NULL until sentiment analysis ran
+    sentiment_model_version = Column(String, nullable=True)  # Model that produced sentiment_label
     published_date = Column(DateTime, nullable=False, index=True)
     embedding_vector = Column(ARRAY(Float), nullable=True)
     created_at = Column(DateTime, server_default=func.now(), nullable=False)
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
 
+    __table_args__ = (
+        # Finds articles still waiting for sentiment analysis with the current model
+        Index("ix_articles_sentiment_model_version", "sentiment_model_version", "id"),
+        # Serves the newest-articles-per-ticker window of the news endpoints
+        Index("ix_articles_ticker_published_date_id", "ticker", "published_date", "id"),
+    )
+
+
+class ArticleDuplicate(Base):
+    """Database model for near-duplicate articles linked to their canonical article."""
+    __tablename__ = "article_duplicates"
+
+    id = Column(Integer, primary_key=True, index=True)
+    canonical_article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), nullable=False, index=True)
+    ticker = Column(String, nullable=False)
+    headline = Column(String, nullable=False)
+    url = Column(String, unique=True, nullable=False)
+    source = Column(String, nullable=False)
+    published_date = Column(DateTime, nullable=False)
+    similarity = Column(Float, nullable=False)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+
+    canonical_article = relationship("Article")
+
+
+class ArticleDailyCount(Base):
+    """Database model for article counts per ticker, publication day and label pair."""
+    __tablename__ = "article_daily_counts"
+
+    id = Column(Integer, primary_key=True, index=True)
+    ticker = Column(String, nullable=False)
+    day = Column(Date, nullable=False)  # Publication date of the articles
+    bias_label = Column(Enum(BiasCategory), nullable=False)
+    sentiment_label = Column(Enum(SentimentCategory), nullable=False)
+    count = Column(Integer, nullable=False, default=0)  # Kept in step with articles by article_stats
+
+    __table_args__ = (
+        # Also serves the (ticker, day >= ...) range scans of the analytics endpoints
+        UniqueConstraint("ticker", "day", "bias_label", "sentiment_label", name="uq_article_daily_counts_key"),
+    )
+
 
 class Source(Base):
     """Database model for news sources."""
@@ -38,6 +81,54 @@ class Source(Base):
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
 
 
+class FetchWatermark(Base):
+    """Database model for the newest article seen per news provider and ticker."""
+    __tablename__ = "fetch_watermarks"
+
+    id = Column(Integer, primary_key=True, index=True)
+    provider = Column(String, nullable=False)
+    ticker = Column(String, nullable=False)
+    last_published_at = Column(DateTime, nullable=False)  # UTC
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("provider", "ticker", name="uq_fetch_watermarks_provider_ticker"),
+    )
+
+
+class AnalysisJob(Base):
+    """Database model for queued background analysis jobs."""
+    __tablename__ = "analysis_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False)
+    payload = Column(JSON, nullable=True)
+    dedup_key = Column(String, nullable=True)  # At most one queued or running job per key
+    status = Column(String, nullable=False, default="queued")  # queued, running, succeeded, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False)
+    run_after = Column(DateTime, nullable=False)  # UTC, delays retries
+    worker_id = Column(String, nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)  # UTC, another worker may take the job after this
+    progress = Column(Float, nullable=False, default=0.0)  # 0.0 to 1.0
+    progress_message = Column(String, nullable=True)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    started_at = Column(DateTime, nullable=True)  # UTC
+    finished_at = Column(DateTime, nullable=True)  # UTC
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_analysis_jobs_status_run_after", "status", "run_after"),
+        Index(
+            "uq_analysis_jobs_active_dedup_key", "dedup_key", unique=True,
+            postgresql_where=text("status IN ('queued', 'running')"),
+            sqlite_where=text("status IN ('queued', 'running')")
+        ),
+    )
+
+
 class User(Base):
     """Database model for users (optional)."""
     __tablename__ = "users"
@@ -34,6 +34,9 @@ class ArticleCreate(ArticleBase):
     bias_label: BiasCategory
     sentiment_label: SentimentCategory
     embedding_vector: Optional[List[float]] = None
+    sentiment_analyzed_at: Optional[datetime] = None  # Set when sentiment was analyzed before saving
+    sentiment_model_version: Optional[str] = None
+    provider: Optional[str] = None  # News API the article was fetched from
 
 
 class ArticleResponse(ArticleBase):
@@ -44,7 +47,38 @@ class ArticleResponse(ArticleBase):
     created_at: datetime
 
     class Config:
-        orm_mode = True
+        from_attributes = True
+
+
+class SimilarArticleResponse(ArticleResponse):
+    """Schema for a related article with its similarity to the queried article."""
+    similarity: float
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class AnalysisJobResponse(BaseModel):
+    """Schema for the state of a background analysis job."""
+    id: int
+    kind: str
+    status: JobStatus
+    attempts: int
+    max_attempts: int
+    progress: float
+    progress_message: Optional[str] = None
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
 
 
 class BiasDistribution(BaseModel):
@@ -87,4 +121,4 @@ class SourceResponse(SourceBase):
     created_at: datetime
 
     class Config:
-        orm_mode = True
+        from_attributes = True
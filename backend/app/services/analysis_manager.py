@@ -1,14 +1,22 @@
 import logging
-from fastapi import BackgroundTasks
+from collections import Counter
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Tuple
 
 from app.services.bias_analysis_service import BiasAnalysisService
 from app.services.sentiment_analysis_service import SentimentAnalysisService
-from app.models.schemas import BiasDistribution
+from app.services.article_stats import (
+    LabelCounts, count_labels, count_labels_by_ticker, build_bias_distribution, build_sentiment_distribution
+)
+from app.services.job_queue import enqueue_job
+from app.models.models import AnalysisJob
+from app.models.schemas import BiasCategory, BiasDistribution
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+BATCH_ANALYSIS_JOB = "batch_analysis"
+
 class AnalysisManager:
     """Manager for coordinating bias and sentiment analysis."""
     
@@ -28,49 +36,75 @@ class AnalysisManager:
         Returns:
             Dictionary with analysis results
         """
-        # Get bias distribution
-        bias_distribution = self.bias_service.calculate_bias_distribution(ticker, days)
-        
-        # Get sentiment distribution
-        sentiment_distribution = self.sentiment_service.get_sentiment_distribution(ticker, days)
-        
-        # Get viewpoint diversity warning
-        diversity_warning = self.bias_service.get_viewpoint_diversity_warning(ticker, days)
+        # One contingency table query feeds every part of the analysis
+        return self._analysis_from_counts(ticker, days, count_labels(self.db, ticker, days))
+    
+    def _analysis_from_counts(self, ticker: str, days: int, counts: LabelCounts) -> Dict[str, Any]:
+        """
+        Build the ticker analysis from its bias x sentiment article counts, without querying.
         
-        # Get sentiment summary
-        sentiment_summary = self.sentiment_service.get_sentiment_summary(ticker, days)
+        Args:
+            ticker: Stock ticker symbol
+            days: Number of days included in the counts
+            counts: Label counts from ``count_labels``
+            
+        Returns:
+            Dictionary with analysis results
+        """
+        bias_distribution = build_bias_distribution(ticker, days, counts)
+        sentiment_distribution = build_sentiment_distribution(ticker, days, counts)
         
         return {
             "ticker": ticker,
             "days": days,
             "bias_distribution": bias_distribution,
             "sentiment_distribution": sentiment_distribution,
-            "diversity_warning": diversity_warning,
-            "sentiment_summary": sentiment_summary
+            "diversity_warning": BiasAnalysisService.diversity_warning_for(ticker, bias_distribution),
+            "sentiment_summary": SentimentAnalysisService.sentiment_summary_for(ticker, days, sentiment_distribution)
         }
     
-    def run_batch_analysis(self, background_tasks: BackgroundTasks):
+    def enqueue_batch_analysis(self) -> Tuple[AnalysisJob, bool]:
         """
-        Run batch analysis for bias and sentiment in the background.
+        Queue batch analysis for bias and sentiment, run by the analysis worker.
         
-        Args:
-            background_tasks: FastAPI BackgroundTasks object
+        Only one batch analysis job is queued or running at a time; while one is,
+        the existing job is returned.
+        
+        Returns:
+            Tuple of the job and whether it was newly queued
         """
-        background_tasks.add_task(self._perform_batch_analysis)
+        return enqueue_job(self.db, BATCH_ANALYSIS_JOB, dedup_key=BATCH_ANALYSIS_JOB)
     
-    def _perform_batch_analysis(self):
-        """Perform batch analysis for bias and sentiment."""
-        try:
-            # Update bias labels
-            bias_count = self.bias_service.update_article_bias_labels(limit=200)
-            logger.info(f"Updated bias labels for {bias_count} articles")
-            
-            # Update sentiment labels
-            sentiment_count = self.sentiment_service.batch_analyze_articles(limit=200)
-            logger.info(f"Updated sentiment labels for {sentiment_count} articles")
+    def perform_batch_analysis(
+        self,
+        limit: Optional[int] = None,
+        report_progress: Optional[Callable[[float, str], None]] = None
+    ) -> Dict[str, int]:
+        """
+        Perform batch analysis for bias and sentiment.
+        
+        Args:
+            limit: Articles per bias and sentiment pass (default: ANALYSIS_BATCH_LIMIT)
+            report_progress: Called with the fraction done and a message after each step
             
-        except Exception as e:
-            logger.error(f"Error in batch analysis: {str(e)}")
+        Returns:
+            Dictionary with the number of articles updated by each step
+        """
+        limit = limit or settings.ANALYSIS_BATCH_LIMIT
+        
+        # Update bias labels
+        bias_count = self.bias_service.update_article_bias_labels(limit=limit)
+        logger.info(f"Updated bias labels for {bias_count} articles")
+        if report_progress:
+            report_progress(0.5, f"Updated bias labels for {bias_count} articles")
+        
+        # Update sentiment labels
+        sentiment_count = self.sentiment_service.batch_analyze_articles(limit=limit)
+        logger.info(f"Updated sentiment labels for {sentiment_count} articles")
+        if report_progress:
+            report_progress(1.0, f"Updated sentiment labels for {sentiment_count} articles")
+        
+        return {"bias_updated": bias_count, "sentiment_updated": sentiment_count}
     
     def get_portfolio_analysis(self, tickers: List[str], days: int = 7) -> Dict[str, Any]:
         """
@@ -83,14 +117,16 @@ class AnalysisManager:
         Returns:
             Dictionary with analysis results
         """
-        results = {}
+        # One grouped query for the whole portfolio, per-ticker results are built from it
+        counts_by_ticker = count_labels_by_ticker(self.db, list(dict.fromkeys(tickers)), days)
         
-        # Analyze each ticker
-        for ticker in tickers:
-            results[ticker] = self.analyze_ticker(ticker, days)
+        results = {
+            ticker: self._analysis_from_counts(ticker, days, counts)
+            for ticker, counts in counts_by_ticker.items()
+        }
         
         # Calculate aggregate statistics
-        aggregate = self._calculate_portfolio_aggregate(results)
+        aggregate = self._calculate_portfolio_aggregate(counts_by_ticker, results, days)
         
         return {
             "tickers": tickers,
@@ -99,98 +135,44 @@ class AnalysisManager:
             "aggregate": aggregate
         }
     
-    def _calculate_portfolio_aggregate(self, ticker_results: Dict[str, Any]) -> Dict[str, Any]:
+    def _calculate_portfolio_aggregate(
+        self,
+        counts_by_ticker: Dict[str, LabelCounts],
+        ticker_results: Dict[str, Any],
+        days: int
+    ) -> Dict[str, Any]:
         """
         Calculate aggregate statistics for a portfolio.
         
         Args:
+            counts_by_ticker: Label counts per ticker from ``count_labels_by_ticker``
             ticker_results: Dictionary of analysis results by ticker
+            days: Number of days included in the counts
             
         Returns:
             Dictionary with aggregate statistics
         """
-        # Initialize counters
-        total_articles = 0
-        left_count = 0
-        lean_left_count = 0
-        center_count = 0
-        lean_right_count = 0
-        right_count = 0
-        unknown_count = 0
-        
-        bullish_count = 0
-        bearish_count = 0
-        neutral_count = 0
-        
-        biased_tickers = []
-        
-        # Aggregate counts
-        for ticker, result in ticker_results.items():
-            bias_dist = result["bias_distribution"]
-            sent_dist = result["sentiment_distribution"]
-            
-            total_articles += bias_dist.total_articles
-            left_count += bias_dist.left_count
-            lean_left_count += bias_dist.lean_left_count
-            center_count += bias_dist.center_count
-            lean_right_count += bias_dist.lean_right_count
-            right_count += bias_dist.right_count
-            unknown_count += bias_dist.unknown_count
-            
-            bullish_count += sent_dist["bullish_count"]
-            bearish_count += sent_dist["bearish_count"]
-            neutral_count += sent_dist["neutral_count"]
-            
-            if bias_dist.is_biased:
-                biased_tickers.append(ticker)
-        
-        # Calculate percentages
-        if total_articles > 0:
-            left_percentage = (left_count / total_articles) * 100
-            lean_left_percentage = (lean_left_count / total_articles) * 100
-            center_percentage = (center_count / total_articles) * 100
-            lean_right_percentage = (lean_right_count / total_articles) * 100
-            right_percentage = (right_count / total_articles) * 100
-            unknown_percentage = (unknown_count / total_articles) * 100
-            
-            bullish_percentage = (bullish_count / total_articles) * 100
-            bearish_percentage = (bearish_count / total_articles) * 100
-            neutral_percentage = (neutral_count / total_articles) * 100
-        else:
-            left_percentage = 0
-            lean_left_percentage = 0
-            center_percentage = 0
-            lean_right_percentage = 0
-            right_percentage = 0
-            unknown_percentage = 0
-            
-            bullish_percentage = 0
-            bearish_percentage = 0
-            neutral_percentage = 0
+        # Sum the per-ticker counts instead of re-aggregating the ticker results
+        total_counts = sum(counts_by_ticker.values(), Counter())
+        bias = build_bias_distribution("portfolio", days, total_counts)
+        sentiment = build_sentiment_distribution("portfolio", days, total_counts)
+        
+        biased_tickers = [
+            ticker for ticker, result in ticker_results.items()
+            if result["bias_distribution"].is_biased
+        ]
         
         return {
-            "total_articles": total_articles,
+            "total_articles": bias.total_articles,
             "bias_distribution": {
-                "left_count": left_count,
-                "lean_left_count": lean_left_count,
-                "center_count": center_count,
-                "lean_right_count": lean_right_count,
-                "right_count": right_count,
-                "unknown_count": unknown_count,
-                "left_percentage": left_percentage,
-                "lean_left_percentage": lean_left_percentage,
-                "center_percentage": center_percentage,
-                "lean_right_percentage": lean_right_percentage,
-                "right_percentage": right_percentage,
-                "unknown_percentage": unknown_percentage
+                **{f"{category.value}_count": getattr(bias, f"{category.value}_count") for category in BiasCategory},
+                **{f"{category.value}_percentage": getattr(bias, f"{category.value}_percentage") for category in BiasCategory}
             },
             "sentiment_distribution": {
-                "bullish_count": bullish_count,
-                "bearish_count": bearish_count,
-                "neutral_count": neutral_count,
-                "bullish_percentage": bullish_percentage,
-                "bearish_percentage": bearish_percentage,
-                "neutral_percentage": neutral_percentage
+                key: sentiment[key] for key in (
+                    "bullish_count", "bearish_count", "neutral_count",
+                    "bullish_percentage", "bearish_percentage", "neutral_percentage"
+                )
             },
             "biased_tickers": biased_tickers,
             "has_biased_coverage": len(biased_tickers) > 0
@@ -0,0 +1,165 @@
+import logging
+import os
+import signal
+import socket
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.services.analysis_manager import AnalysisManager, BATCH_ANALYSIS_JOB
+from app.services.job_queue import claim_job, renew_lease, complete_job, fail_job
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Handler signature: (db, payload, report_progress) -> JSON result
+JobHandler = Callable[[Session, Dict[str, Any], Callable[[float, str], None]], Optional[Dict[str, Any]]]
+
+
+def run_batch_analysis_job(db: Session, payload: Dict[str, Any], report_progress: Callable[[float, str], None]):
+    """Run a batch bias and sentiment analysis job."""
+    return AnalysisManager(db).perform_batch_analysis(payload.get("limit"), report_progress)
+
+
+JOB_HANDLERS: Dict[str, JobHandler] = {
+    BATCH_ANALYSIS_JOB: run_batch_analysis_job,
+}
+
+
+class _LeaseHeartbeat(threading.Thread):
+    """Renews a job's lease in the background and writes progress reported by the handler."""
+
+    def __init__(self, session_factory, job_id: int, worker_id: str, interval: float):
+        super().__init__(name=f"lease-heartbeat-{job_id}", daemon=True)
+        self.session_factory = session_factory
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.interval = interval
+        self.lost = False
+        self._progress: Optional[float] = None
+        self._message: Optional[str] = None
+        self._wake = threading.Event()
+        self._stopped = False
+
+    def report(self, progress: float, message: str):
+        """Record progress, written to the job right away."""
+        self._progress = progress
+        self._message = message
+        self._wake.set()
+
+    def run(self):
+        db = self.session_factory()
+        try:
+            while True:
+                self._wake.wait(self.interval)
+                self._wake.clear()
+                if self._stopped:
+                    return
+                try:
+                    if not renew_lease(db, self.job_id, self.worker_id, self._progress, self._message):
+                        logger.warning(f"Worker {self.worker_id} lost the lease on job {self.job_id}")
+                        self.lost = True
+                        return
+                except Exception as e:
+                    db.rollback()
+                    logger.error(f"Error renewing lease on job {self.job_id}: {str(e)}")
+        finally:
+            db.close()
+
+    def stop(self):
+        self._stopped = True
+        self._wake.set()
+        self.join()
+
+
+class AnalysisWorker:
+    """
+    Standalone worker that runs jobs from the analysis job queue.
+
+    Jobs are claimed one at a time. While a job runs, a heartbeat thread renews
+    its lease and records progress, so a worker that dies mid-job leaves a lease
+    that expires and another worker retries the job. Failed jobs are re-queued
+    with exponential backoff until they run out of attempts.
+    """
+
+    def __init__(
+        self,
+        worker_id: Optional[str] = None,
+        handlers: Optional[Dict[str, JobHandler]] = None,
+        session_factory=SessionLocal
+    ):
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.handlers = handlers or JOB_HANDLERS
+        self.session_factory = session_factory
+        self.heartbeat_seconds = max(1.0, settings.ANALYSIS_JOB_LEASE_SECONDS / 3)
+        self._stopping = threading.Event()
+
+    def run_once(self) -> bool:
+        """
+        Claim and run one job.
+
+        Returns:
+            True if a job was run, False if the queue was empty
+        """
+        db = self.session_factory()
+        try:
+            job = claim_job(db, self.worker_id, kinds=list(self.handlers))
+            if job is None:
+                return False
+
+            job_id, kind, payload = job.id, job.kind, job.payload or {}
+            logger.info(f"Worker {self.worker_id} running {kind} job {job_id} (attempt {job.attempts})")
+
+            heartbeat = _LeaseHeartbeat(self.session_factory, job_id, self.worker_id, self.heartbeat_seconds)
+            heartbeat.start()
+            try:
+                result = self.handlers[kind](db, payload, heartbeat.report)
+            except Exception as e:
+                db.rollback()
+                heartbeat.stop()
+                status = fail_job(db, job_id, self.worker_id, f"{type(e).__name__}: {str(e)}")
+                logger.error(f"Job {job_id} failed ({status.value if status else 'lease lost'}): {str(e)}")
+                return True
+
+            heartbeat.stop()
+            if complete_job(db, job_id, self.worker_id, result):
+                logger.info(f"Job {job_id} succeeded: {result}")
+            else:
+                logger.warning(f"Job {job_id} finished after its lease was lost, result discarded")
+            return True
+        finally:
+            db.close()
+
+    def run_forever(self):
+        """Run jobs until ``stop`` is called, polling while the queue is empty."""
+        logger.info(f"Starting analysis worker {self.worker_id}")
+        while not self._stopping.is_set():
+            try:
+                ran = self.run_once()
+            except Exception as e:
+                logger.error(f"Error in analysis worker: {str(e)}")
+                ran = False
+            if not ran:
+                self._stopping.wait(settings.ANALYSIS_WORKER_POLL_SECONDS)
+        logger.info(f"Analysis worker {self.worker_id} stopped")
+
+    def stop(self):
+        """Stop after the current job finishes."""
+        self._stopping.set()
+
+
+if __name__ == "__main__":
+    # Configure logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+    worker = AnalysisWorker()
+    signal.signal(signal.SIGTERM, lambda signum, frame: worker.stop())
+    try:
+        worker.run_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,151 @@
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import List, Dict, Any
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.models import ArticleDailyCount
+from app.models.schemas import BiasCategory, SentimentCategory, BiasDistribution
+
+# Article counts keyed by (bias label, sentiment label)
+LabelCounts = Counter
+
+# Bias categories that can dominate coverage, in tie-break order
+_DOMINANT_BIAS_CANDIDATES = (
+    BiasCategory.LEFT,
+    BiasCategory.LEAN_LEFT,
+    BiasCategory.CENTER,
+    BiasCategory.LEAN_RIGHT,
+    BiasCategory.RIGHT,
+)
+
+
+def count_labels_by_ticker(db: Session, tickers: List[str], days: int = 7) -> Dict[str, LabelCounts]:
+    """
+    Count recent articles per ticker by bias and sentiment label, in one query.
+
+    Sums the article_daily_counts rollup, which is kept in step with the articles
+    table by ``article_store``, so a query reads at most one small row per ticker,
+    day and label pair instead of every article. The window covers whole UTC
+    days, the buckets the rollup is kept in: it starts at the start of the UTC
+    day ``days`` days ago, so it can reach up to a day further back than a
+    rolling ``days * 24`` hours.
+
+    Args:
+        db: Database session
+        tickers: Stock ticker symbols
+        days: Number of whole UTC days to include before today
+
+    Returns:
+        Dictionary from ticker to its label counts (tickers without articles have empty counts)
+    """
+    first_day = (datetime.utcnow() - timedelta(days=days)).date()
+
+    rows = db.query(
+        ArticleDailyCount.ticker,
+        ArticleDailyCount.bias_label,
+        ArticleDailyCount.sentiment_label,
+        func.sum(ArticleDailyCount.count)
+    ).filter(
+        ArticleDailyCount.ticker.in_(tickers),
+        ArticleDailyCount.day >= first_day
+    ).group_by(
+        ArticleDailyCount.ticker,
+        ArticleDailyCount.bias_label,
+        ArticleDailyCount.sentiment_label
+    ).all()
+
+    counts: Dict[str, LabelCounts] = {ticker: Counter() for ticker in tickers}
+    for ticker, bias_label, sentiment_label, count in rows:
+        if count:
+            counts.setdefault(ticker, Counter())[(BiasCategory(bias_label), SentimentCategory(sentiment_label))] += count
+    return counts
+
+
+def count_labels(db: Session, ticker: str, days: int = 7) -> LabelCounts:
+    """Count recent articles for one ticker by bias and sentiment label."""
+    return count_labels_by_ticker(db, [ticker], days)[ticker]
+
+
+def _count_by(counts: LabelCounts, position: int) -> Counter:
+    """Collapse (bias, sentiment) counts onto one of the two labels."""
+    collapsed = Counter()
+    for labels, count in counts.items():
+        collapsed[labels[position]] += count
+    return collapsed
+
+
+def build_bias_distribution(ticker: str, days: int, counts: LabelCounts) -> BiasDistribution:
+    """
+    Build bias distribution statistics from label counts.
+
+    Args:
+        ticker: Stock ticker symbol
+        days: Number of days included in the counts
+        counts: Label counts from ``count_labels``
+
+    Returns:
+        BiasDistribution object with statistics
+    """
+    total_articles = sum(counts.values())
+    if total_articles == 0:
+        return BiasDistribution(ticker=ticker, total_articles=0, days=days, is_biased=False)
+
+    by_bias = _count_by(counts, 0)
+    percentages = {bias: (by_bias[bias] / total_articles) * 100 for bias in BiasCategory}
+
+    # Coverage is biased when one category has more than 60% of the articles
+    dominant_bias = next((bias for bias in _DOMINANT_BIAS_CANDIDATES if percentages[bias] > 60), None)
+
+    return BiasDistribution(
+        ticker=ticker,
+        total_articles=total_articles,
+        **{f"{bias.value}_count": by_bias[bias] for bias in BiasCategory},
+        **{f"{bias.value}_percentage": percentages[bias] for bias in BiasCategory},
+        days=days,
+        is_biased=dominant_bias is not None,
+        dominant_bias=dominant_bias
+    )
+
+
+def build_sentiment_distribution(ticker: str, days: int, counts: LabelCounts) -> Dict[str, Any]:
+    """
+    Build sentiment distribution statistics from label counts.
+
+    Args:
+        ticker: Stock ticker symbol
+        days: Number of days included in the counts
+        counts: Label counts from ``count_labels``
+
+    Returns:
+        Dictionary with sentiment distribution statistics
+    """
+    total_articles = sum(counts.values())
+    by_sentiment = _count_by(counts, 1)
+
+    def percentage(sentiment: SentimentCategory) -> float:
+        return (by_sentiment[sentiment] / total_articles) * 100 if total_articles > 0 else 0
+
+    bullish_percentage = percentage(SentimentCategory.BULLISH)
+    bearish_percentage = percentage(SentimentCategory.BEARISH)
+
+    # Determine overall sentiment
+    overall_sentiment = SentimentCategory.NEUTRAL
+    if bullish_percentage > bearish_percentage + 20:
+        overall_sentiment = SentimentCategory.BULLISH
+    elif bearish_percentage > bullish_percentage + 20:
+        overall_sentiment = SentimentCategory.BEARISH
+
+    return {
+        "ticker": ticker,
+        "total_articles": total_articles,
+        "bullish_count": by_sentiment[SentimentCategory.BULLISH],
+        "bearish_count": by_sentiment[SentimentCategory.BEARISH],
+        "neutral_count": by_sentiment[SentimentCategory.NEUTRAL],
+        "bullish_percentage": bullish_percentage,
+        "bearish_percentage": bearish_percentage,
+        "neutral_percentage": percentage(SentimentCategory.NEUTRAL),
+        "days": days,
+        "overall_sentiment": overall_sentiment
+    }
@@ -0,0 +1,324 @@
+import logging
+from collections import Counter
+from datetime import date, timezone
+from typing import List, Dict, Any, Tuple, Optional, Set
+
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.models import Article, ArticleDuplicate, ArticleDailyCount
+from app.models.schemas import ArticleCreate, BiasCategory, SentimentCategory
+
+logger = logging.getLogger(__name__)
+
+# Change in article counts keyed by (ticker, day, bias label, sentiment label)
+DailyCountDeltas = Counter
+
+# Dialects that support INSERT ... ON CONFLICT
+_UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def _article_values(article_data: ArticleCreate) -> Dict[str, Any]:
+    """Column values for a new Article row."""
+    return {
+        "ticker": article_data.ticker,
+        "headline": article_data.headline,
+        "summary": article_data.summary,
+        "url": article_data.url,
+        "source": article_data.source,
+        "bias_label": article_data.bias_label,
+        "sentiment_label": article_data.sentiment_label,
+        "published_date": article_data.published_date,
+        "embedding_vector": article_data.embedding_vector,
+        "sentiment_analyzed_at": article_data.sentiment_analyzed_at,
+        "sentiment_model_version": article_data.sentiment_model_version,
+    }
+
+
+def filter_unstored_articles(db: Session, articles: List[ArticleCreate]) -> List[ArticleCreate]:
+    """
+    Drop articles whose URL is already stored, with one ``url IN (...)`` lookup.
+
+    Args:
+        db: Database session
+        articles: Standardized articles
+
+    Returns:
+        The articles that are not in the database yet, in their original order
+    """
+    urls = list({article.url for article in articles if article.url})
+    if not urls:
+        return []
+
+    stored_urls = {url for (url,) in db.query(Article.url).filter(Article.url.in_(urls)).all()}
+    return [article for article in articles if article.url and article.url not in stored_urls]
+
+
+def insert_new_articles(db: Session, articles: List[ArticleCreate]) -> List[Article]:
+    """
+    Insert a batch of articles, skipping any whose URL is already stored.
+
+    Uses a single ``INSERT ... ON CONFLICT (url) DO NOTHING RETURNING`` statement where
+    the dialect supports it, otherwise one ``url IN (...)`` lookup followed by a bulk
+    insert. The inserted articles are added to the daily count rollup. The caller is
+    responsible for committing.
+
+    Args:
+        db: Database session
+        articles: Standardized articles to insert
+
+    Returns:
+        The Article rows that were actually inserted
+    """
+    # De-duplicate within the batch, first occurrence wins
+    values_by_url: Dict[str, Dict[str, Any]] = {}
+    for article_data in articles:
+        if article_data.url and article_data.url not in values_by_url:
+            values_by_url[article_data.url] = _article_values(article_data)
+
+    if not values_by_url:
+        return []
+
+    values = list(values_by_url.values())
+    insert = _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+
+    if insert is not None:
+        stmt = (
+            insert(Article)
+            .values(values)
+            .on_conflict_do_nothing(index_elements=[Article.url])
+            .returning(Article)
+        )
+        new_articles = list(db.scalars(stmt))
+    else:
+        # Fallback: one IN lookup for existing URLs, then a bulk insert of the rest
+        existing_urls = {
+            url for (url,) in db.query(Article.url).filter(Article.url.in_(list(values_by_url))).all()
+        }
+        new_articles = [Article(**row) for row in values if row["url"] not in existing_urls]
+        db.add_all(new_articles)
+        db.flush()
+
+    # Count only the rows that were actually inserted, in the same transaction
+    apply_daily_count_deltas(db, Counter(daily_count_key(article) for article in new_articles))
+
+    return new_articles
+
+
+def link_near_duplicates(db: Session, duplicates: List[Tuple[ArticleCreate, str, float]]) -> int:
+    """
+    Record near-duplicate articles as links to their canonical article.
+
+    Canonical article IDs are resolved with one ``url IN (...)`` lookup. Duplicates
+    whose URL is already linked, or whose canonical article is not stored, are
+    skipped. The caller is responsible for committing.
+
+    Args:
+        db: Database session
+        duplicates: (duplicate article, canonical URL, similarity) tuples
+
+    Returns:
+        Number of links written
+    """
+    if not duplicates:
+        return 0
+
+    canonical_urls = list({canonical_url for _, canonical_url, _ in duplicates})
+    canonical_ids = dict(
+        db.query(Article.url, Article.id).filter(Article.url.in_(canonical_urls)).all()
+    )
+
+    rows_by_url: Dict[str, Dict[str, Any]] = {}
+    for article_data, canonical_url, similarity in duplicates:
+        canonical_id = canonical_ids.get(canonical_url)
+        if canonical_id is None or not article_data.url or article_data.url in rows_by_url:
+            continue
+        rows_by_url[article_data.url] = {
+            "canonical_article_id": canonical_id,
+            "ticker": article_data.ticker,
+            "headline": article_data.headline,
+            "url": article_data.url,
+            "source": article_data.source,
+            "published_date": article_data.published_date,
+            "similarity": similarity,
+        }
+
+    if not rows_by_url:
+        return 0
+
+    insert = _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if insert is not None:
+        stmt = (
+            insert(ArticleDuplicate)
+            .values(list(rows_by_url.values()))
+            .on_conflict_do_nothing(index_elements=[ArticleDuplicate.url])
+            .returning(ArticleDuplicate.id)
+        )
+        return len(db.execute(stmt).all())
+
+    existing_urls = {
+        url for (url,) in db.query(ArticleDuplicate.url).filter(
+            ArticleDuplicate.url.in_(list(rows_by_url))
+        ).all()
+    }
+    new_links = [ArticleDuplicate(**row) for url, row in rows_by_url.items() if url not in existing_urls]
+    db.add_all(new_links)
+    db.flush()
+
+    return len(new_links)
+
+
+def daily_count_key(
+    article: Any,
+    bias_label: Optional[BiasCategory] = None,
+    sentiment_label: Optional[SentimentCategory] = None
+) -> Tuple[str, date, BiasCategory, SentimentCategory]:
+    """
+    Rollup key of an article: its ticker, UTC publication day and label pair.
+
+    Args:
+        article: Article row or schema with ticker, published_date and labels
+        bias_label: Bias label to use instead of the article's current one
+        sentiment_label: Sentiment label to use instead of the article's current one
+
+    Returns:
+        (ticker, day, bias label, sentiment label) tuple
+    """
+    published = article.published_date
+    if published.tzinfo is not None:
+        # Days are UTC days, like the naive UTC timestamps stored by the pipeline
+        published = published.astimezone(timezone.utc)
+    return (
+        article.ticker,
+        published.date(),
+        BiasCategory(bias_label or article.bias_label),
+        SentimentCategory(sentiment_label or article.sentiment_label),
+    )
+
+
+def apply_daily_count_deltas(db: Session, deltas: DailyCountDeltas) -> Set[str]:
+    """
+    Add count changes to the article_daily_counts rollup.
+
+    Uses a single ``INSERT ... ON CONFLICT DO UPDATE SET count = count + excluded.count``
+    statement where the dialect supports it, otherwise an UPDATE per key with an insert
+    for keys that have no row yet. Keys are written in sorted order so concurrent
+    writers lock rows in the same order. The caller is responsible for committing, in
+    the same transaction as the article changes the deltas describe.
+
+    Args:
+        db: Database session
+        deltas: Count changes keyed by ``daily_count_key``, zero changes are skipped
+
+    Returns:
+        Tickers whose counts changed
+    """
+    rows = [
+        {"ticker": ticker, "day": day, "bias_label": bias_label, "sentiment_label": sentiment_label, "count": count}
+        for (ticker, day, bias_label, sentiment_label), count in sorted(deltas.items())
+        if count
+    ]
+    if not rows:
+        return set()
+
+    insert = _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if insert is not None:
+        stmt = insert(ArticleDailyCount).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                ArticleDailyCount.ticker,
+                ArticleDailyCount.day,
+                ArticleDailyCount.bias_label,
+                ArticleDailyCount.sentiment_label,
+            ],
+            set_={"count": ArticleDailyCount.count + stmt.excluded.count}
+        )
+        db.execute(stmt)
+        return {row["ticker"] for row in rows}
+
+    for row in rows:
+        result = db.execute(
+            update(ArticleDailyCount)
+            .where(
+                ArticleDailyCount.ticker == row["ticker"],
+                ArticleDailyCount.day == row["day"],
+                ArticleDailyCount.bias_label == row["bias_label"],
+                ArticleDailyCount.sentiment_label == row["sentiment_label"]
+            )
+            .values(count=ArticleDailyCount.count + row["count"])
+        )
+        if result.rowcount == 0:
+            db.add(ArticleDailyCount(**row))
+    db.flush()
+
+    return {row["ticker"] for row in rows}
+
+
+def rebuild_daily_counts(db: Session) -> int:
+    """
+    Recompute the article_daily_counts rollup from the articles table and commit.
+
+    Only needed to backfill the rollup for articles stored before it existed, or to
+    repair it after articles were changed outside the application. Run it while
+    ingestion and analysis are stopped, so no other transaction updates the rollup.
+
+    Args:
+        db: Database session
+
+    Returns:
+        Number of rollup rows written
+    """
+    day = func.date(Article.published_date)
+    counts = select(
+        Article.ticker,
+        day,
+        Article.bias_label,
+        Article.sentiment_label,
+        func.count(Article.id)
+    ).group_by(
+        Article.ticker,
+        day,
+        Article.bias_label,
+        Article.sentiment_label
+    )
+
+    db.query(ArticleDailyCount).delete(synchronize_session=False)
+    result = db.execute(
+        ArticleDailyCount.__table__.insert().from_select(
+            ["ticker", "day", "bias_label", "sentiment_label", "count"], counts
+        )
+    )
+    db.commit()
+
+    return result.rowcount
+
+
+if __name__ == "__main__":
+    from app.db.session import SessionLocal
+
+    # Configure logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+    from app.services.result_cache import result_cache, RedisResultCacheBackend
+
+    db = SessionLocal()
+    try:
+        logger.info(f"Rebuilt article_daily_counts with {rebuild_daily_counts(db)} rows")
+        if result_cache.enabled and isinstance(result_cache.backend, RedisResultCacheBackend):
+            result_cache.clear()
+            logger.info("Cleared the shared analysis result cache")
+        elif result_cache.enabled:
+            # The memory backend lives inside each API process, out of reach from here
+            logger.warning(
+                "Running API processes keep cached analysis results for up to "
+                f"{result_cache.ttl_seconds:g}s (RESULT_CACHE_TTL_SECONDS), restart them to drop them now"
+            )
+    finally:
+        db.close()
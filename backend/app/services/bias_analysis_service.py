@@ -1,18 +1,22 @@
 import logging
 from typing import List, Dict, Any, Optional
 from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
 
-from app.models.models import Article, Source
+from app.models.models import Article
 from app.models.schemas import BiasCategory, BiasDistribution
+from app.services.source_bias_resolver import SourceBiasResolver, source_bias_resolver
+from app.services.article_stats import count_labels, build_bias_distribution
+from app.services.article_store import DailyCountDeltas, daily_count_key, apply_daily_count_deltas
+from app.services.result_cache import result_cache
 
 logger = logging.getLogger(__name__)
 
 class BiasAnalysisService:
     """Service for analyzing bias in news articles."""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, resolver: Optional[SourceBiasResolver] = None):
         self.db = db
+        self.resolver = resolver or source_bias_resolver
         
     def get_source_bias(self, source_domain: str) -> BiasCategory:
         """
@@ -24,26 +28,8 @@ class BiasAnalysisService:
         Returns:
             BiasCategory enum value
         """
-        # Clean up the domain
-        domain = source_domain.lower().strip()
-        if domain.startswith('www.'):
-            domain = domain[4:]
-            
-        # Query the database for the source
-        source = self.db.query(Source).filter(Source.domain == domain).first()
-        
-        if source:
-            return source.bias_rating
-            
-        # Try partial match if exact match not found
-        for source in self.db.query(Source).all():
-            if source.domain in domain or domain in source.domain:
-                logger.info(f"Partial domain match for {domain}: {source.domain} with bias {source.bias_rating}")
-                return source.bias_rating
-        
-        # Default to unknown if source not found
-        logger.warning(f"No bias rating found for domain: {domain}")
-        return BiasCategory.UNKNOWN
+        # Suffix-indexed lookup (handles www., subdomains and publisher names)
+        return self.resolver.resolve(source_domain, self.db)
         
     def calculate_bias_distribution(self, ticker: str, days: int = 7) -> BiasDistribution:
         """
@@ -56,77 +42,8 @@ class BiasAnalysisService:
         Returns:
             BiasDistribution object with statistics
         """
-        # Calculate date threshold
-        date_threshold = datetime.now() - timedelta(days=days)
-        
-        # Get articles within date range
-        articles = self.db.query(Article).filter(
-            Article.ticker == ticker,
-            Article.published_date >= date_threshold
-        ).all()
-        
-        # Count total articles
-        total_articles = len(articles)
-        
-        if total_articles == 0:
-            return BiasDistribution(
-                ticker=ticker,
-                total_articles=0,
-                days=days,
-                is_biased=False
-            )
-        
-        # Count articles by bias category
-        left_count = sum(1 for a in articles if a.bias_label == BiasCategory.LEFT)
-        lean_left_count = sum(1 for a in articles if a.bias_label == BiasCategory.LEAN_LEFT)
-        center_count = sum(1 for a in articles if a.bias_label == BiasCategory.CENTER)
-        lean_right_count = sum(1 for a in articles if a.bias_label == BiasCategory.LEAN_RIGHT)
-        right_count = sum(1 for a in articles if a.bias_label == BiasCategory.RIGHT)
-        unknown_count = sum(1 for a in articles if a.bias_label == BiasCategory.UNKNOWN)
-        
-        # Calculate percentages
-        left_percentage = (left_count / total_articles) * 100 if total_articles > 0 else 0
-        lean_left_percentage = (lean_left_count / total_articles) * 100 if total_articles > 0 else 0
-        center_percentage = (center_count / total_articles) * 100 if total_articles > 0 else 0
-        lean_right_percentage = (lean_right_count / total_articles) * 100 if total_articles > 0 else 0
-        right_percentage = (right_count / total_articles) * 100 if total_articles > 0 else 0
-        unknown_percentage = (unknown_count / total_articles) * 100 if total_articles > 0 else 0
-        
-        # Determine if coverage is biased (one category > 60%)
-        is_biased = False
-        dominant_bias = None
-        
-        for bias, percentage in [
-            (BiasCategory.LEFT, left_percentage),
-            (BiasCategory.LEAN_LEFT, lean_left_percentage),
-            (BiasCategory.CENTER, center_percentage),
-            (BiasCategory.LEAN_RIGHT, lean_right_percentage),
-            (BiasCategory.RIGHT, right_percentage)
-        ]:
-            if percentage > 60:
-                is_biased = True
-                dominant_bias = bias
-                break
-        
-        return BiasDistribution(
-            ticker=ticker,
-            total_articles=total_articles,
-            left_count=left_count,
-            lean_left_count=lean_left_count,
-            center_count=center_count,
-            lean_right_count=lean_right_count,
-            right_count=right_count,
-            unknown_count=unknown_count,
-            left_percentage=left_percentage,
-            lean_left_percentage=lean_left_percentage,
-            center_percentage=center_percentage,
-            lean_right_percentage=lean_right_percentage,
-            right_percentage=right_percentage,
-            unknown_percentage=unknown_percentage,
-            days=days,
-            is_biased=is_biased,
-            dominant_bias=dominant_bias
-        )
+        # Counts come from one GROUP BY query instead of loading every article
+        return build_bias_distribution(ticker, days, count_labels(self.db, ticker, days))
     
     def get_viewpoint_diversity_warning(self, ticker: str, days: int = 7) -> Optional[str]:
         """
@@ -139,10 +56,24 @@ class BiasAnalysisService:
         Returns:
             Warning message if coverage is biased, None otherwise
         """
-        distribution = self.calculate_bias_distribution(ticker, days)
+        return self.diversity_warning_for(ticker, self.calculate_bias_distribution(ticker, days))
+    
+    @staticmethod
+    def diversity_warning_for(ticker: str, distribution: BiasDistribution) -> Optional[str]:
+        """
+        Build the viewpoint diversity warning from an already computed bias distribution.
         
+        Args:
+            ticker: Stock ticker symbol
+            distribution: Bias distribution of the ticker's coverage
+            
+        Returns:
+            Warning message if coverage is biased, None otherwise
+        """
         if distribution.is_biased and distribution.dominant_bias:
-            return f"Warning: News coverage for {ticker} is predominantly from {distribution.dominant_bias} sources ({round(getattr(distribution, f'{distribution.dominant_bias}_percentage'), 1)}%)."
+            # Use the enum value: f-strings format str enums as "BiasCategory.LEFT" on Python 3.11+
+            dominant_bias = BiasCategory(distribution.dominant_bias).value
+            return f"Warning: News coverage for {ticker} is predominantly from {dominant_bias} sources ({round(getattr(distribution, f'{dominant_bias}_percentage'), 1)}%)."
         
         return None
     
@@ -161,18 +92,16 @@ class BiasAnalysisService:
             Article.bias_label == BiasCategory.UNKNOWN
         ).limit(limit).all()
         
+        deltas = DailyCountDeltas()
         count = 0
         for article in articles:
             try:
-                # Extract domain from source
-                source_parts = article.source.split('.')
-                if len(source_parts) >= 2:
-                    domain = f"{source_parts[-2]}.{source_parts[-1]}"
-                else:
-                    domain = article.source
+                # Get bias for source (the resolver accepts domains and publisher names)
+                bias = self.get_source_bias(article.source)
                 
-                # Get bias for source
-                bias = self.get_source_bias(domain)
+                # Move the article to its new label in the daily count rollup
+                deltas[daily_count_key(article)] -= 1
+                deltas[daily_count_key(article, bias_label=bias)] += 1
                 
                 # Update article
                 article.bias_label = bias
@@ -181,7 +110,9 @@ class BiasAnalysisService:
             except Exception as e:
                 logger.error(f"Error updating bias for article {article.id}: {str(e)}")
         
-        # Commit changes
+        # Commit changes together with the rollup
+        changed_tickers = apply_daily_count_deltas(self.db, deltas)
         self.db.commit()
+        result_cache.invalidate_tickers(changed_tickers)
         
         return count
@@ -2,16 +2,17 @@ import logging
 from typing import List, Dict, Any, Optional
 from sqlalchemy.orm import Session
 
-from app.models.models import Source
 from app.models.schemas import BiasCategory
+from app.services.source_bias_resolver import SourceBiasResolver, source_bias_resolver
 
 logger = logging.getLogger(__name__)
 
 class BiasAnalyzer:
     """Analyze and determine bias for news sources."""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, resolver: Optional[SourceBiasResolver] = None):
         self.db = db
+        self.resolver = resolver or source_bias_resolver
         
     def get_bias_for_source(self, source_domain: str) -> BiasCategory:
         """
@@ -23,26 +24,8 @@ class BiasAnalyzer:
         Returns:
             BiasCategory enum value
         """
-        # Clean up the domain
-        domain = source_domain.lower().strip()
-        if domain.startswith('www.'):
-            domain = domain[4:]
-            
-        # Query the database for the source
-        source = self.db.query(Source).filter(Source.domain == domain).first()
-        
-        if source:
-            return source.bias_rating
-            
-        # Try partial match if exact match not found
-        for source in self.db.query(Source).all():
-            if source.domain in domain or domain in source.domain:
-                logger.info(f"Partial domain match for {domain}: {source.domain} with bias {source.bias_rating}")
-                return source.bias_rating
-        
-        # Default to unknown if source not found
-        logger.warning(f"No bias rating found for domain: {domain}")
-        return BiasCategory.UNKNOWN
+        # Suffix-indexed lookup (handles www., subdomains and publisher names)
+        return self.resolver.resolve(source_domain, self.db)
         
     def get_bias_distribution(self, articles: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -0,0 +1,158 @@
+import logging
+import time
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.models.models import Article
+from app.services.model_registry import model_registry
+from app.services.similarity_index import SimilarityIndex
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingService:
+    """
+    Batched CPU embedding stage that fills ``Article.embedding_vector``.
+
+    Unembedded articles are read in keyset-paginated chunks of EMBEDDING_CHUNK_SIZE,
+    sorted by text length so each EMBEDDING_BATCH_SIZE encoder batch pads to similar
+    lengths, and written back with one bulk UPDATE per chunk. Every chunk is
+    committed on its own, so an interrupted run resumes from the articles that
+    still have no embedding.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        model: Optional[Any] = None,
+        batch_size: Optional[int] = None,
+        chunk_size: Optional[int] = None
+    ):
+        self.db = db
+        self._model = model
+        self.batch_size = batch_size or settings.EMBEDDING_BATCH_SIZE
+        self.chunk_size = chunk_size or settings.EMBEDDING_CHUNK_SIZE
+
+    @property
+    def model(self):
+        """Sentence-transformers model, shared across the process."""
+        if self._model is None:
+            self._model = model_registry.embedding_model()
+        return self._model
+
+    def embed_texts(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode texts into normalized embeddings.
+
+        Args:
+            texts: Texts to encode
+
+        Returns:
+            Array of shape (len(texts), dimension), in the order of ``texts``
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+
+        # Encode longest first so each batch pads to similar lengths
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]), reverse=True)
+        encoded = self.model.encode(
+            [texts[i] for i in order],
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        )
+
+        embeddings = np.empty_like(encoded)
+        embeddings[order] = encoded
+        return embeddings
+
+    def embed_pending(self, limit: Optional[int] = None, index: Optional[SimilarityIndex] = None) -> Dict[str, Any]:
+        """
+        Embed articles that don't have an embedding yet.
+
+        Args:
+            limit: Maximum number of articles to embed (all pending if None)
+            index: Similarity index to add each committed chunk to. Its ``sync``
+                only reads IDs above the newest indexed one, which misses older
+                articles embedded here
+
+        Returns:
+            Dictionary with the number of articles embedded, elapsed seconds and
+            throughput in articles per second
+        """
+        started_at = time.monotonic()
+        embedded = 0
+        last_id = 0
+
+        while limit is None or embedded < limit:
+            chunk_size = self.chunk_size if limit is None else min(self.chunk_size, limit - embedded)
+            rows = self.db.query(Article.id, Article.headline, Article.summary).filter(
+                Article.embedding_vector.is_(None),
+                Article.id > last_id
+            ).order_by(Article.id).limit(chunk_size).all()
+
+            if not rows:
+                break
+
+            chunk_started_at = time.monotonic()
+            embeddings = self.embed_texts([f"{headline} {summary}" for _, headline, summary in rows])
+
+            # One bulk UPDATE by primary key per chunk
+            self.db.execute(update(Article), [
+                {"id": article_id, "embedding_vector": embedding.tolist()}
+                for (article_id, _, _), embedding in zip(rows, embeddings)
+            ])
+            self.db.commit()
+            if index is not None:
+                index.add([article_id for article_id, _, _ in rows], embeddings)
+
+            embedded += len(rows)
+            last_id = rows[-1][0]
+            chunk_seconds = time.monotonic() - chunk_started_at
+            logger.info(
+                f"Embedded {len(rows)} articles in {chunk_seconds:.1f}s "
+                f"({len(rows) / max(chunk_seconds, 1e-9):.1f} articles/s), {embedded} total"
+            )
+
+        elapsed = time.monotonic() - started_at
+        articles_per_second = embedded / elapsed if embedded and elapsed > 0 else 0.0
+        logger.info(f"Embedded {embedded} articles in {elapsed:.1f}s ({articles_per_second:.1f} articles/s)")
+
+        return {
+            "embedded": embedded,
+            "seconds": elapsed,
+            "articles_per_second": articles_per_second,
+        }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from app.db.session import SessionLocal
+    from app.services.similarity_index import similarity_index
+
+    # Configure logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+    parser = argparse.ArgumentParser(description="Compute embeddings for articles that don't have one yet")
+    parser.add_argument("--limit", type=int, default=None, help="Maximum number of articles to embed")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        # Load the saved similar-article index first, so it can take the new embeddings
+        similarity_index.sync(db, force=True)
+        EmbeddingService(db).embed_pending(limit=args.limit, index=similarity_index)
+
+        # Persist it for the API
+        similarity_index.save()
+    finally:
+        db.close()
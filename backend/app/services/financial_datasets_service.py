@@ -1,19 +1,28 @@
 import httpx
 import logging
 from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 from app.core.config import settings
+from app.services.http_client import http_clients
+from app.services.rate_limiter import rate_limiters
 
 logger = logging.getLogger(__name__)
 
 class FinancialDatasetsService:
     """Service to fetch data from Financial Datasets API."""
     
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, client: Optional[httpx.AsyncClient] = None):
         self.api_key = api_key or settings.FINANCIAL_DATASETS_API_KEY
         self.base_url = "https://api.financialdatasets.ai/v1"
         self.headers = {"Authorization": f"Bearer {self.api_key}"}
+        self._client = client
+        self.rate_limiter = rate_limiters.get("financial_datasets")
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Pooled HTTP client, shared across service instances unless one was injected."""
+        return self._client or http_clients.get("financial_datasets")
         
     async def get_ticker_news(
         self, 
@@ -38,10 +47,10 @@ class FinancialDatasetsService:
             
         # Set default published_after to 7 days ago if not provided
         if published_after is None:
-            published_after = datetime.now() - timedelta(days=settings.MAX_NEWS_AGE_DAYS)
+            published_after = datetime.now(timezone.utc) - timedelta(days=settings.MAX_NEWS_AGE_DAYS)
             
         # Format date for API
-        published_after_str = published_after.strftime("%Y-%m-%dT%H:%M:%SZ")
+        published_after_str = published_after.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
         
         # Build URL
         url = f"{self.base_url}/news"
@@ -54,15 +63,21 @@ class FinancialDatasetsService:
             "sort": "published_at:desc",
         }
         
+        # Wait for the provider's rate-limit budget
+        if not await self.rate_limiter.acquire():
+            logger.warning("Financial Datasets rate limit budget exhausted, skipping request")
+            return []
+            
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, headers=self.headers, params=params)
-                response.raise_for_status()
-                data = response.json()
+            response = await self.client.get(url, headers=self.headers, params=params)
+            response.raise_for_status()
+            data = response.json()
                 
-                return data.get("data", [])
+            return data.get("data", [])
                     
         except httpx.HTTPStatusError as e:
+            if e.response.status_code == 429:
+                self.rate_limiter.record_throttled()
             logger.error(f"HTTP error fetching news from Financial Datasets: {str(e)}")
             return []
         except Exception as e:
@@ -108,15 +123,21 @@ class FinancialDatasetsService:
             "sort": "filed_at:desc",
         }
         
+        # Wait for the provider's rate-limit budget
+        if not await self.rate_limiter.acquire():
+            logger.warning("Financial Datasets rate limit budget exhausted, skipping request")
+            return []
+            
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, headers=self.headers, params=params)
-                response.raise_for_status()
-                data = response.json()
+            response = await self.client.get(url, headers=self.headers, params=params)
+            response.raise_for_status()
+            data = response.json()
                 
-                return data.get("data", [])
+            return data.get("data", [])
                     
         except httpx.HTTPStatusError as e:
+            if e.response.status_code == 429:
+                self.rate_limiter.record_throttled()
             logger.error(f"HTTP error fetching filings from Financial Datasets: {str(e)}")
             return []
         except Exception as e:
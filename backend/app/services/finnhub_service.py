@@ -1,18 +1,27 @@
 import httpx
 import logging
 from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 from app.core.config import settings
+from app.services.http_client import http_clients
+from app.services.rate_limiter import rate_limiters
 
 logger = logging.getLogger(__name__)
 
 class FinnhubService:
     """Service to fetch data from Finnhub API."""
     
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, client: Optional[httpx.AsyncClient] = None):
         self.api_key = api_key or settings.FINNHUB_API_KEY
         self.base_url = "https://finnhub.io/api/v1"
+        self._client = client
+        self.rate_limiter = rate_limiters.get("finnhub")
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Pooled HTTP client, shared across service instances unless one was injected."""
+        return self._client or http_clients.get("finnhub")
         
     async def get_company_news(
         self, 
@@ -37,11 +46,11 @@ class FinnhubService:
             
         # Set default published_after to 7 days ago if not provided
         if published_after is None:
-            published_after = datetime.now() - timedelta(days=settings.MAX_NEWS_AGE_DAYS)
+            published_after = datetime.now(timezone.utc) - timedelta(days=settings.MAX_NEWS_AGE_DAYS)
             
-        # Format dates for API
-        from_date = published_after.strftime("%Y-%m-%d")
-        to_date = datetime.now().strftime("%Y-%m-%d")
+        # Format dates for API (Finnhub only filters by day, callers trim the overlap)
+        from_date = published_after.astimezone(timezone.utc).strftime("%Y-%m-%d")
+        to_date = datetime.now(timezone.utc).strftime("%Y-%m-%d")
         
         # Build URL
         url = f"{self.base_url}/company-news"
@@ -54,17 +63,22 @@ class FinnhubService:
             "token": self.api_key
         }
         
+        # Wait for the provider's rate-limit budget
+        if not await self.rate_limiter.acquire():
+            logger.warning("Finnhub rate limit budget exhausted, skipping request")
+            return []
+            
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, params=params)
-                response.raise_for_status()
-                data = response.json()
+            response = await self.client.get(url, params=params)
+            response.raise_for_status()
+            data = response.json()
                 
-                # Limit the number of results
-                return data[:limit] if isinstance(data, list) else []
+            # Limit the number of results
+            return data[:limit] if isinstance(data, list) else []
                     
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 429:
+                self.rate_limiter.record_throttled()
                 logger.warning("Finnhub API rate limit exceeded")
             logger.error(f"HTTP error fetching news from Finnhub: {str(e)}")
             return []
@@ -95,13 +109,19 @@ class FinnhubService:
             "token": self.api_key
         }
         
+        # Wait for the provider's rate-limit budget
+        if not await self.rate_limiter.acquire():
+            logger.warning("Finnhub rate limit budget exhausted, skipping request")
+            return {}
+            
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, params=params)
-                response.raise_for_status()
-                return response.json()
+            response = await self.client.get(url, params=params)
+            response.raise_for_status()
+            return response.json()
                     
         except httpx.HTTPStatusError as e:
+            if e.response.status_code == 429:
+                self.rate_limiter.record_throttled()
             logger.error(f"HTTP error fetching sentiment from Finnhub: {str(e)}")
             return {}
         except Exception as e:
@@ -0,0 +1,77 @@
+import asyncio
+import logging
+from typing import Dict, Optional
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _http2_available() -> bool:
+    """Return True if the optional ``h2`` package needed for HTTP/2 is installed."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class HTTPClientRegistry:
+    """
+    Registry of long-lived, pooled ``httpx.AsyncClient`` instances, one per provider.
+
+    Clients keep their connections alive between calls so repeated requests to the
+    same provider skip the TCP/TLS handshake. A client is bound to the event loop it
+    is first used on, so callers should keep a single long-running loop (as the
+    scheduler does) and call ``aclose`` on shutdown.
+    """
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._http2_enabled = settings.HTTP2_ENABLED and _http2_available()
+
+        if settings.HTTP2_ENABLED and not self._http2_enabled:
+            logger.warning("HTTP/2 requested but the 'h2' package is not installed, using HTTP/1.1")
+
+    def _build_client(self) -> httpx.AsyncClient:
+        """Create a new pooled client from the configured limits and timeouts."""
+        limits = httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        )
+        timeout = httpx.Timeout(
+            settings.HTTP_TIMEOUT_SECONDS,
+            connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS,
+        )
+        return httpx.AsyncClient(limits=limits, timeout=timeout, http2=self._http2_enabled)
+
+    def get(self, provider: str) -> httpx.AsyncClient:
+        """
+        Get the shared client for a provider, creating it on first use.
+
+        Args:
+            provider: Provider name (e.g. "polygon", "finnhub")
+
+        Returns:
+            Pooled AsyncClient for the provider
+        """
+        client = self._clients.get(provider)
+        if client is None or client.is_closed:
+            client = self._build_client()
+            self._clients[provider] = client
+            logger.info(f"Created pooled HTTP client for {provider}")
+        return client
+
+    async def aclose(self):
+        """Close all clients and release their pooled connections."""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        await asyncio.gather(*(client.aclose() for client in clients), return_exceptions=True)
+        if clients:
+            logger.info(f"Closed {len(clients)} pooled HTTP clients")
+
+
+http_clients = HTTPClientRegistry()
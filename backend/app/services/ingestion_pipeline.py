@@ -0,0 +1,354 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from app.models.schemas import ArticleCreate
+from app.services.article_store import filter_unstored_articles
+from app.services.embedding_service import EmbeddingService
+from app.services.news_processor import NewsProcessor
+from app.services.sentiment_analyzer import SentimentAnalyzer, sentiment_model_version
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of the stream on a stage's input queue
+_END = object()
+
+
+class _TickerBatch:
+    """The articles of one ticker's fetch, moving through the pipeline as a unit."""
+
+    def __init__(self, ticker: str, fetched_at: float):
+        self.ticker = ticker
+        self.fetched_at = fetched_at
+        self.raw_news: Dict[str, List[Dict[str, Any]]] = {}
+        self.window_starts: Dict[str, datetime] = {}
+        self.fetched: List[ArticleCreate] = []  # Every normalized article, advances the watermarks
+        self.canonical: List[ArticleCreate] = []  # New articles to enrich and insert
+        self.duplicates: List[Tuple[ArticleCreate, str, float]] = []
+
+
+class _StageMetrics:
+    """Counters for one pipeline stage and the queue feeding it."""
+
+    def __init__(self, name: str, workers: int, queue: Optional[asyncio.Queue] = None):
+        self.name = name
+        self.workers = workers
+        self.queue = queue
+        self.items = 0
+        self.articles = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.max_queue_depth = 0
+
+    def observe_queue(self):
+        if self.queue is not None:
+            self.max_queue_depth = max(self.max_queue_depth, self.queue.qsize())
+
+    def snapshot(self, elapsed: float) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "items": self.items,
+            "articles": self.articles,
+            "errors": self.errors,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "articles_per_second": round(self.articles / elapsed, 2) if elapsed > 0 else 0.0,
+            "utilization": round(self.busy_seconds / (elapsed * self.workers), 3) if elapsed > 0 else 0.0,
+            "queue_depth": self.queue.qsize() if self.queue is not None else 0,
+            "max_queue_depth": self.max_queue_depth,
+            "queue_capacity": self.queue.maxsize if self.queue is not None else 0,
+        }
+
+
+class IngestionPipeline:
+    """
+    Streaming ingestion pipeline: fetch -> normalize/dedup -> enrich -> persist.
+
+    Stages run concurrently and are connected by bounded queues, so a slow stage
+    fills its input queue and blocks the stages before it instead of letting
+    fetched articles pile up in memory. Tickers move through as one batch each:
+
+    - fetch: up to ``fetch_concurrency`` tickers are fetched at once, paced per
+      provider by the shared rate limiters
+    - normalize/dedup: standardizes articles and resolves source bias, drops URLs
+      that are already stored and splits off near-duplicates
+    - enrich: labels sentiment and computes embeddings for new articles, coalescing
+      tickers into model batches of up to ``batch_size`` articles
+    - persist: inserts articles with their labels, links duplicates and advances
+      the watermarks of each ticker in one transaction
+
+    Every stage touching the database runs on the event loop thread, so one session
+    is never used concurrently; model inference runs in a worker thread.
+    """
+
+    def __init__(
+        self,
+        processor: NewsProcessor,
+        analyzer: Optional[SentimentAnalyzer] = None,
+        embedder: Optional[EmbeddingService] = None,
+        fetch_concurrency: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        batch_wait_seconds: Optional[float] = None,
+        embeddings_enabled: Optional[bool] = None,
+        limit_per_source: int = 10
+    ):
+        self.processor = processor
+        self.db = processor.db
+        self.analyzer = analyzer or SentimentAnalyzer()
+        self.embedder = embedder or EmbeddingService(processor.db)
+        self.fetch_concurrency = fetch_concurrency or settings.NEWS_FETCH_CONCURRENCY
+        self.queue_size = queue_size or settings.INGESTION_QUEUE_SIZE
+        self.batch_size = batch_size or settings.INGESTION_ENRICH_BATCH_SIZE
+        self.batch_wait_seconds = (
+            settings.INGESTION_ENRICH_MAX_WAIT_SECONDS if batch_wait_seconds is None else batch_wait_seconds
+        )
+        self.embeddings_enabled = (
+            settings.INGESTION_EMBEDDINGS_ENABLED if embeddings_enabled is None else embeddings_enabled
+        )
+        self.limit_per_source = limit_per_source
+        self._latencies: List[float] = []
+        self._stages: Dict[str, _StageMetrics] = {}
+        self._elapsed = 0.0
+
+    async def run(self, tickers: List[str]) -> int:
+        """
+        Ingest news for tickers.
+
+        Args:
+            tickers: List of stock ticker symbols
+
+        Returns:
+            Number of new articles saved
+        """
+        started_at = time.monotonic()
+        self._latencies = []
+
+        fetched: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        deduped: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        enriched: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        pending_tickers: asyncio.Queue = asyncio.Queue()
+        for ticker in tickers:
+            pending_tickers.put_nowait(ticker)
+
+        fetch_workers = max(1, min(self.fetch_concurrency, len(tickers)))
+        self._stages = {
+            "fetch": _StageMetrics("fetch", fetch_workers),
+            "normalize": _StageMetrics("normalize", 1, fetched),
+            "enrich": _StageMetrics("enrich", 1, deduped),
+            "persist": _StageMetrics("persist", 1, enriched),
+        }
+
+        async def fetchers():
+            await asyncio.gather(*(self._fetch_worker(pending_tickers, fetched) for _ in range(fetch_workers)))
+            await fetched.put(_END)
+
+        tasks = [
+            asyncio.create_task(fetchers()),
+            asyncio.create_task(self._normalize_worker(fetched, deduped)),
+            asyncio.create_task(self._enrich_worker(deduped, enriched)),
+            asyncio.create_task(self._persist_worker(enriched)),
+        ]
+        try:
+            results = await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        self._elapsed = time.monotonic() - started_at
+        return results[-1]
+
+    async def _fetch_worker(self, pending_tickers: asyncio.Queue, output_queue: asyncio.Queue):
+        stage = self._stages["fetch"]
+        while True:
+            try:
+                ticker = pending_tickers.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+
+            started_at = time.monotonic()
+            batch = _TickerBatch(ticker, started_at)
+            try:
+                batch.window_starts, batch.raw_news = await self.processor.fetch_raw_news(
+                    ticker, self.limit_per_source
+                )
+            except Exception as e:
+                stage.errors += 1
+                logger.error(f"Error fetching news for {ticker}: {str(e)}")
+                continue
+            finally:
+                stage.busy_seconds += time.monotonic() - started_at
+
+            batch.fetched_at = time.monotonic()
+            stage.items += 1
+            stage.articles += sum(len(items) for items in batch.raw_news.values())
+            # Blocks while the next stage is behind
+            await output_queue.put(batch)
+            self._stages["normalize"].observe_queue()
+
+    async def _normalize_worker(self, input_queue: asyncio.Queue, output_queue: asyncio.Queue):
+        stage = self._stages["normalize"]
+        while True:
+            batch = await input_queue.get()
+            if batch is _END:
+                await output_queue.put(_END)
+                return
+
+            started_at = time.monotonic()
+            try:
+                batch.fetched = self.processor.normalize_news(batch.ticker, batch.raw_news, batch.window_starts)
+                batch.raw_news = {}
+
+                # Skip URLs seen in earlier cycles before spending inference on them
+                new_articles = filter_unstored_articles(self.db, batch.fetched)
+                batch.canonical = new_articles
+                if settings.NEAR_DUPLICATE_DETECTION_ENABLED:
+                    batch.canonical, batch.duplicates = self.processor.duplicate_detector.partition(
+                        self.db, new_articles
+                    )
+            except Exception as e:
+                self.db.rollback()
+                self.processor.duplicate_detector.reset()
+                stage.errors += 1
+                logger.error(f"Error normalizing news for {batch.ticker}: {str(e)}")
+                continue
+            finally:
+                stage.busy_seconds += time.monotonic() - started_at
+
+            stage.items += 1
+            stage.articles += len(batch.canonical)
+            await output_queue.put(batch)
+            self._stages["enrich"].observe_queue()
+
+    async def _enrich_worker(self, input_queue: asyncio.Queue, output_queue: asyncio.Queue):
+        stage = self._stages["enrich"]
+        loop = asyncio.get_running_loop()
+        finished = False
+        while not finished:
+            batch = await input_queue.get()
+            if batch is _END:
+                break
+
+            # Coalesce tickers into one model batch, waiting briefly for more to arrive
+            batches = [batch]
+            articles = len(batch.canonical)
+            deadline = loop.time() + self.batch_wait_seconds
+            while articles < self.batch_size:
+                timeout = deadline - loop.time()
+                try:
+                    batch = input_queue.get_nowait() if timeout <= 0 else await asyncio.wait_for(input_queue.get(), timeout)
+                except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                    break
+                if batch is _END:
+                    finished = True
+                    break
+                batches.append(batch)
+                articles += len(batch.canonical)
+
+            started_at = time.monotonic()
+            new_articles = [article for batch in batches for article in batch.canonical]
+            try:
+                await loop.run_in_executor(None, self._enrich, new_articles)
+            except Exception as e:
+                # Articles are stored without labels and picked up by the batch jobs
+                stage.errors += 1
+                logger.error(f"Error enriching {len(new_articles)} articles: {str(e)}")
+            finally:
+                stage.busy_seconds += time.monotonic() - started_at
+
+            stage.items += len(batches)
+            stage.articles += len(new_articles)
+            for batch in batches:
+                await output_queue.put(batch)
+                self._stages["persist"].observe_queue()
+
+        await output_queue.put(_END)
+
+    def _enrich(self, articles: List[ArticleCreate]):
+        """Label sentiment and compute embeddings for articles, in a worker thread."""
+        if not articles:
+            return
+        texts = [f"{article.headline} {article.summary}" for article in articles]
+
+        analyzed_at = datetime.utcnow()
+        version = sentiment_model_version()
+        for article, sentiment in zip(articles, self.analyzer.analyze_sentiments(texts, default=None)):
+            # Articles the model could not analyze stay pending for the batch job
+            if sentiment is not None:
+                article.sentiment_label = sentiment
+                article.sentiment_analyzed_at = analyzed_at
+                article.sentiment_model_version = version
+
+        if self.embeddings_enabled:
+            try:
+                embeddings = self.embedder.embed_texts(texts)
+            except Exception as e:
+                # Left for the embedding job
+                logger.error(f"Error embedding {len(articles)} articles: {str(e)}")
+                return
+            for article, embedding in zip(articles, embeddings):
+                article.embedding_vector = np.asarray(embedding, dtype=float).tolist()
+
+    async def _persist_worker(self, input_queue: asyncio.Queue) -> int:
+        stage = self._stages["persist"]
+        total_saved = 0
+        while True:
+            batch = await input_queue.get()
+            if batch is _END:
+                return total_saved
+
+            started_at = time.monotonic()
+            try:
+                saved = self.processor.store_articles(batch.canonical, batch.duplicates, batch.fetched)
+            except Exception as e:
+                self.db.rollback()
+                stage.errors += 1
+                logger.error(f"Error saving news for {batch.ticker}: {str(e)}")
+                continue
+            finally:
+                stage.busy_seconds += time.monotonic() - started_at
+
+            stage.items += 1
+            stage.articles += len(saved)
+            total_saved += len(saved)
+            self._latencies.extend([time.monotonic() - batch.fetched_at] * len(saved))
+            logger.info(f"Fetched {len(saved)} new articles for {batch.ticker}")
+
+    def metrics(self) -> Dict[str, Any]:
+        """Per-stage throughput, utilization and queue depth, and fetch-to-stored latency, of the last run."""
+        latencies = np.array(self._latencies) if self._latencies else None
+        return {
+            "seconds": round(self._elapsed, 3),
+            "stages": {name: stage.snapshot(self._elapsed) for name, stage in self._stages.items()},
+            "fetch_to_stored_seconds": {
+                "p50": round(float(np.percentile(latencies, 50)), 3),
+                "p95": round(float(np.percentile(latencies, 95)), 3),
+                "max": round(float(latencies.max()), 3),
+            } if latencies is not None else None,
+        }
+
+    def save_metrics(self, path: Optional[str] = None):
+        """Write ``metrics`` to a JSON file, replaced atomically, for the API's health endpoint."""
+        path = path or settings.INGESTION_METRICS_PATH
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"finished_at": datetime.utcnow().isoformat(), **self.metrics()}, f)
+        os.replace(tmp_path, path)
+
+
+def load_metrics(path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Read the metrics of the last pipeline run, or None if there is none yet."""
+    try:
+        with open(path or settings.INGESTION_METRICS_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
@@ -0,0 +1,232 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.models import AnalysisJob
+from app.models.schemas import JobStatus
+
+logger = logging.getLogger(__name__)
+
+
+def _active_job(db: Session, dedup_key: str) -> Optional[AnalysisJob]:
+    """The queued or running job with this dedup key, if any."""
+    return db.query(AnalysisJob).filter(
+        AnalysisJob.dedup_key == dedup_key,
+        AnalysisJob.status.in_([JobStatus.QUEUED.value, JobStatus.RUNNING.value])
+    ).first()
+
+
+def enqueue_job(
+    db: Session,
+    kind: str,
+    payload: Optional[Dict[str, Any]] = None,
+    dedup_key: Optional[str] = None,
+    max_attempts: Optional[int] = None
+) -> Tuple[AnalysisJob, bool]:
+    """
+    Add a job to the queue, unless an equivalent job is already waiting or running.
+
+    A partial unique index on ``dedup_key`` over queued and running jobs makes
+    the check safe against concurrent requests.
+
+    Args:
+        db: Database session
+        kind: Job type, selects the worker handler
+        payload: JSON arguments for the handler
+        dedup_key: Jobs with the same key are not queued twice
+        max_attempts: Attempts before the job is marked failed (default: ANALYSIS_JOB_MAX_ATTEMPTS)
+
+    Returns:
+        Tuple of the job and whether it was newly created
+    """
+    if dedup_key is not None:
+        existing = _active_job(db, dedup_key)
+        if existing is not None:
+            return existing, False
+
+    job = AnalysisJob(
+        kind=kind,
+        payload=payload,
+        dedup_key=dedup_key,
+        status=JobStatus.QUEUED.value,
+        attempts=0,
+        max_attempts=max_attempts or settings.ANALYSIS_JOB_MAX_ATTEMPTS,
+        run_after=datetime.utcnow(),
+        progress=0.0,
+    )
+    db.add(job)
+    try:
+        db.commit()
+    except IntegrityError:
+        # Another request queued the same job in the meantime
+        db.rollback()
+        existing = _active_job(db, dedup_key) if dedup_key is not None else None
+        if existing is None:
+            raise
+        return existing, False
+
+    logger.info(f"Queued {kind} job {job.id}")
+    return job, True
+
+
+def get_job(db: Session, job_id: int) -> Optional[AnalysisJob]:
+    """Get a job by ID."""
+    return db.query(AnalysisJob).filter(AnalysisJob.id == job_id).first()
+
+
+def claim_job(db: Session, worker_id: str, kinds: Optional[List[str]] = None) -> Optional[AnalysisJob]:
+    """
+    Lease the oldest runnable job to a worker.
+
+    Runnable jobs are queued jobs whose retry delay has passed and running jobs
+    whose lease expired because their worker died. Rows are locked with
+    ``FOR UPDATE SKIP LOCKED``, so concurrent workers claim different jobs
+    without waiting on each other.
+
+    Args:
+        db: Database session
+        worker_id: Identifier of the claiming worker
+        kinds: Only claim jobs of these types (default: any)
+
+    Returns:
+        The claimed job, or None if there is nothing to run
+    """
+    while True:
+        now = datetime.utcnow()
+        query = db.query(AnalysisJob).filter(or_(
+            and_(AnalysisJob.status == JobStatus.QUEUED.value, AnalysisJob.run_after <= now),
+            and_(AnalysisJob.status == JobStatus.RUNNING.value, AnalysisJob.lease_expires_at < now)
+        ))
+        if kinds is not None:
+            query = query.filter(AnalysisJob.kind.in_(kinds))
+        job = query.order_by(AnalysisJob.id).with_for_update(skip_locked=True).first()
+
+        if job is None:
+            db.commit()
+            return None
+
+        if job.status == JobStatus.RUNNING.value and job.attempts >= job.max_attempts:
+            # The worker died during the last attempt
+            logger.warning(f"Job {job.id} lease expired on its last attempt, marking it failed")
+            job.status = JobStatus.FAILED.value
+            job.error = f"Lease held by {job.worker_id} expired"
+            job.lease_expires_at = None
+            job.finished_at = now
+            db.commit()
+            continue
+
+        if job.status == JobStatus.RUNNING.value:
+            logger.warning(f"Job {job.id} lease held by {job.worker_id} expired, taking it over")
+        job.status = JobStatus.RUNNING.value
+        job.worker_id = worker_id
+        job.attempts += 1
+        job.lease_expires_at = now + timedelta(seconds=settings.ANALYSIS_JOB_LEASE_SECONDS)
+        job.started_at = now
+        db.commit()
+        return job
+
+
+def renew_lease(
+    db: Session,
+    job_id: int,
+    worker_id: str,
+    progress: Optional[float] = None,
+    progress_message: Optional[str] = None
+) -> bool:
+    """
+    Extend a running job's lease and record its progress.
+
+    Args:
+        db: Database session
+        job_id: ID of the job
+        worker_id: Worker holding the lease
+        progress: Fraction of the work done, 0.0 to 1.0
+        progress_message: Human-readable progress
+
+    Returns:
+        False if the worker no longer holds the lease
+    """
+    values: Dict[str, Any] = {
+        "lease_expires_at": datetime.utcnow() + timedelta(seconds=settings.ANALYSIS_JOB_LEASE_SECONDS)
+    }
+    if progress is not None:
+        values["progress"] = progress
+    if progress_message is not None:
+        values["progress_message"] = progress_message
+
+    updated = _leased(db, job_id, worker_id).update(values, synchronize_session=False)
+    db.commit()
+    return updated == 1
+
+
+def complete_job(db: Session, job_id: int, worker_id: str, result: Optional[Dict[str, Any]] = None) -> bool:
+    """
+    Mark a running job as succeeded.
+
+    Args:
+        db: Database session
+        job_id: ID of the job
+        worker_id: Worker holding the lease
+        result: JSON result of the job
+
+    Returns:
+        False if the worker no longer holds the lease
+    """
+    updated = _leased(db, job_id, worker_id).update({
+        "status": JobStatus.SUCCEEDED.value,
+        "progress": 1.0,
+        "result": result,
+        "error": None,
+        "lease_expires_at": None,
+        "finished_at": datetime.utcnow(),
+    }, synchronize_session=False)
+    db.commit()
+    return updated == 1
+
+
+def fail_job(db: Session, job_id: int, worker_id: str, error: str) -> Optional[JobStatus]:
+    """
+    Record a failed attempt, re-queueing the job with backoff while attempts remain.
+
+    Args:
+        db: Database session
+        job_id: ID of the job
+        worker_id: Worker holding the lease
+        error: Description of the failure
+
+    Returns:
+        The job's new status, or None if the worker no longer holds the lease
+    """
+    job = _leased(db, job_id, worker_id).with_for_update().first()
+    if job is None:
+        db.commit()
+        return None
+
+    now = datetime.utcnow()
+    job.error = error
+    job.lease_expires_at = None
+    if job.attempts < job.max_attempts:
+        job.status = JobStatus.QUEUED.value
+        job.worker_id = None
+        job.run_after = now + timedelta(
+            seconds=settings.ANALYSIS_JOB_RETRY_BACKOFF_SECONDS * 2 ** (job.attempts - 1)
+        )
+    else:
+        job.status = JobStatus.FAILED.value
+        job.finished_at = now
+    db.commit()
+    return JobStatus(job.status)
+
+
+def _leased(db: Session, job_id: int, worker_id: str):
+    """Query for a job that is running under this worker's lease."""
+    return db.query(AnalysisJob).filter(
+        AnalysisJob.id == job_id,
+        AnalysisJob.worker_id == worker_id,
+        AnalysisJob.status == JobStatus.RUNNING.value
+    )
@@ -0,0 +1,173 @@
+import logging
+import os
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+import torch
+from transformers import AutoModelForSequenceClassification, AutoTokenizer, pipeline
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+SENTIMENT_BACKENDS = ("pytorch", "pytorch_int8", "onnx")
+
+
+def _onnx_runtime_available() -> bool:
+    """Return True if the optional ``optimum[onnxruntime]`` package is installed."""
+    try:
+        import optimum.onnxruntime  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def load_sentiment_pipeline(model_name: str, backend: str = "pytorch"):
+    """
+    Build a sentiment analysis pipeline on a CPU inference backend.
+
+    Args:
+        model_name: Hugging Face model name or local directory
+        backend: "pytorch" (fp32), "pytorch_int8" (dynamically quantized Linear
+            layers) or "onnx" (ONNX Runtime export, cached under SENTIMENT_ONNX_DIR)
+
+    Returns:
+        Hugging Face text classification pipeline
+    """
+    if backend not in SENTIMENT_BACKENDS:
+        raise ValueError(f"Unknown sentiment inference backend '{backend}', expected one of {SENTIMENT_BACKENDS}")
+
+    if backend == "onnx" and not _onnx_runtime_available():
+        logger.warning("ONNX backend requested but 'optimum[onnxruntime]' is not installed, using pytorch")
+        backend = "pytorch"
+
+    if backend == "pytorch":
+        return pipeline("sentiment-analysis", model=model_name, tokenizer=model_name)
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+
+    if backend == "pytorch_int8":
+        model = AutoModelForSequenceClassification.from_pretrained(model_name).eval()
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        return pipeline("sentiment-analysis", model=model, tokenizer=tokenizer)
+
+    import onnxruntime
+    from optimum.onnxruntime import ORTModelForSequenceClassification
+
+    # Match ONNX Runtime's thread pool to torch's, which worker processes pin
+    session_options = onnxruntime.SessionOptions()
+    session_options.intra_op_num_threads = torch.get_num_threads()
+
+    export_dir = os.path.join(settings.SENTIMENT_ONNX_DIR, re.sub(r"[^A-Za-z0-9_.-]", "_", model_name))
+    if os.path.exists(os.path.join(export_dir, "model.onnx")):
+        model = ORTModelForSequenceClassification.from_pretrained(export_dir, session_options=session_options)
+    else:
+        model = ORTModelForSequenceClassification.from_pretrained(
+            model_name, export=True, session_options=session_options
+        )
+        model.save_pretrained(export_dir)
+        logger.info(f"Exported {model_name} to ONNX in {export_dir}")
+    return pipeline("sentiment-analysis", model=model, tokenizer=tokenizer)
+
+
+class ModelRegistry:
+    """
+    Process-wide registry of NLP models, each loaded once on first use.
+
+    Loading FinBERT takes seconds and hundreds of MB, so services ask the registry
+    for models instead of building their own. Loads are guarded by a lock per
+    model: concurrent first callers wait for a single load, and callers of an
+    already loaded model never take a lock. After a failed load, further loads
+    of that model fail fast for ``retry_seconds`` instead of blocking every caller.
+    """
+
+    def __init__(self, retry_seconds: float = 60.0):
+        self.retry_seconds = retry_seconds
+        self._models: Dict[str, Any] = {}
+        self._failed_at: Dict[str, float] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._registry_lock = threading.Lock()
+
+    def _lock_for(self, name: str) -> threading.Lock:
+        with self._registry_lock:
+            return self._locks.setdefault(name, threading.Lock())
+
+    def get(self, name: str, loader: Callable[[], Any]) -> Any:
+        """
+        Get a model, loading it with ``loader`` if it isn't loaded yet.
+
+        Args:
+            name: Registry key for the model
+            loader: Function that loads the model
+
+        Returns:
+            The loaded model
+        """
+        model = self._models.get(name)
+        if model is not None:
+            return model
+
+        with self._lock_for(name):
+            model = self._models.get(name)
+            if model is None:
+                failed_at = self._failed_at.get(name)
+                if failed_at is not None and time.monotonic() - failed_at < self.retry_seconds:
+                    raise RuntimeError(f"Model {name} failed to load recently, not retrying yet")
+
+                started_at = time.monotonic()
+                try:
+                    model = loader()
+                except Exception:
+                    self._failed_at[name] = time.monotonic()
+                    raise
+                self._models[name] = model
+                self._failed_at.pop(name, None)
+                logger.info(f"Loaded model {name} in {time.monotonic() - started_at:.1f}s")
+        return model
+
+    def sentiment_pipeline(self):
+        """
+        Get the shared sentiment analysis pipeline on SENTIMENT_INFERENCE_BACKEND.
+
+        Returns:
+            Hugging Face pipeline, or None if the model could not be loaded
+        """
+        try:
+            return self.get("sentiment", lambda: load_sentiment_pipeline(
+                settings.SENTIMENT_MODEL_NAME,
+                settings.SENTIMENT_INFERENCE_BACKEND
+            ))
+        except Exception as e:
+            logger.error(f"Error loading sentiment model: {str(e)}")
+            return None
+
+    def embedding_model(self):
+        """Get the shared sentence-transformers embedding model."""
+        def load():
+            from sentence_transformers import SentenceTransformer
+
+            return SentenceTransformer(settings.EMBEDDING_MODEL_NAME, device="cpu")
+
+        return self.get("embedding", load)
+
+    def loaded(self) -> List[str]:
+        """Names of the models loaded so far."""
+        return list(self._models)
+
+    def warmup(self):
+        """Load the models and run one inference each, so the first request doesn't pay for it."""
+        sentiment_pipeline = self.sentiment_pipeline()
+        if sentiment_pipeline is not None:
+            sentiment_pipeline("Warmup")
+
+        try:
+            self.embedding_model().encode(["Warmup"], show_progress_bar=False)
+        except Exception as e:
+            logger.error(f"Error loading embedding model: {str(e)}")
+
+        logger.info(f"Model warmup finished, loaded: {', '.join(self.loaded()) or 'none'}")
+
+
+model_registry = ModelRegistry()
@@ -0,0 +1,254 @@
+import hashlib
+import heapq
+import logging
+import re
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Set, Tuple, Optional
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.models.models import Article
+from app.models.schemas import ArticleCreate
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def _to_naive_utc(value: datetime) -> datetime:
+    """Convert a datetime to naive UTC, treating naive values as UTC already."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def shingle_text(text: str, size: int = 3) -> Set[int]:
+    """
+    Hash the word shingles of a normalized text.
+
+    Args:
+        text: Headline and summary
+        size: Number of words per shingle
+
+    Returns:
+        Set of 32-bit shingle hashes
+    """
+    tokens = re.findall(r"[a-z0-9]+", text.lower())
+    if len(tokens) < size:
+        grams = [" ".join(tokens)] if tokens else []
+    else:
+        grams = [" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)]
+    return {
+        int.from_bytes(hashlib.blake2b(gram.encode("utf-8"), digest_size=4).digest(), "little")
+        for gram in grams
+    }
+
+
+def _choose_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """
+    Pick (bands, rows) for the LSH index.
+
+    Chooses the highest approximate collision threshold (1/b)^(1/r) that is still at
+    or below the target, so near-duplicates are rarely missed; candidates are then
+    verified against the estimated Jaccard similarity.
+    """
+    best = None
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        approx = (1.0 / bands) ** (1.0 / rows)
+        if approx <= threshold and (best is None or approx > best[0]):
+            best = (approx, bands, rows)
+    if best is None:
+        return num_perm, 1
+    return best[1], best[2]
+
+
+class NearDuplicateDetector:
+    """
+    MinHash/LSH index of recent articles for cross-provider near-duplicate detection.
+
+    Each article's headline and summary are shingled into word 3-grams and reduced
+    to a MinHash signature. Signatures are banded into an LSH index that only keeps
+    articles published within NEAR_DUPLICATE_WINDOW_HOURS. Two articles for the same
+    ticker are duplicates when their estimated Jaccard similarity reaches
+    SIMILARITY_THRESHOLD. Entries are keyed by article URL.
+
+    The index is seeded from the database on first use and is meant to be used from
+    a single thread (the scheduler's event loop).
+    """
+
+    def __init__(
+        self,
+        threshold: Optional[float] = None,
+        window_hours: Optional[int] = None,
+        num_perm: Optional[int] = None,
+        seed: int = 1
+    ):
+        self.threshold = settings.SIMILARITY_THRESHOLD if threshold is None else threshold
+        self.window = timedelta(hours=settings.NEAR_DUPLICATE_WINDOW_HOURS if window_hours is None else window_hours)
+        self.num_perm = settings.NEAR_DUPLICATE_NUM_PERM if num_perm is None else num_perm
+        self.bands, self.rows = _choose_bands(self.num_perm, self.threshold)
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, int(_MERSENNE_PRIME), size=self.num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, int(_MERSENNE_PRIME), size=self.num_perm, dtype=np.uint64)
+
+        self._buckets: List[Dict[bytes, Set[str]]] = [defaultdict(set) for _ in range(self.bands)]
+        self._entries: Dict[str, Tuple[np.ndarray, str, datetime]] = {}
+        self._expiry: List[Tuple[datetime, str]] = []
+        self._seeded = False
+
+    def signature(self, text: str) -> np.ndarray:
+        """
+        Compute the MinHash signature of a text.
+
+        Args:
+            text: Headline and summary
+
+        Returns:
+            Array of ``num_perm`` unsigned 64-bit minimum hashes
+        """
+        shingles = shingle_text(text)
+        if not shingles:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+        hashes = np.fromiter(shingles, dtype=np.uint64, count=len(shingles))
+        permuted = np.bitwise_and((np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME, _MAX_HASH)
+        return permuted.min(axis=0)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def add(self, key: str, signature: np.ndarray, ticker: str, published_date: datetime):
+        """
+        Add an article to the index.
+
+        Args:
+            key: Article URL
+            signature: MinHash signature from ``signature``
+            ticker: Stock ticker symbol
+            published_date: Publication time, used for window eviction
+        """
+        if key in self._entries:
+            self.remove(key)
+        published = _to_naive_utc(published_date)
+        self._entries[key] = (signature, ticker, published)
+        for band, band_key in enumerate(self._band_keys(signature)):
+            self._buckets[band][band_key].add(key)
+        heapq.heappush(self._expiry, (published, key))
+
+    def remove(self, key: str):
+        """Remove an article from the index."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for band, band_key in enumerate(self._band_keys(entry[0])):
+            bucket = self._buckets[band].get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band][band_key]
+
+    def evict_expired(self, now: Optional[datetime] = None):
+        """Drop articles published before the sliding window."""
+        cutoff = _to_naive_utc(now or datetime.now(timezone.utc)) - self.window
+        while self._expiry and self._expiry[0][0] < cutoff:
+            published, key = heapq.heappop(self._expiry)
+            entry = self._entries.get(key)
+            # Skip stale heap entries for keys that were re-added later
+            if entry is not None and entry[2] == published:
+                self.remove(key)
+
+    def find_duplicate(self, key: str, signature: np.ndarray, ticker: str) -> Optional[Tuple[str, float]]:
+        """
+        Find the most similar indexed article for the same ticker.
+
+        Args:
+            key: URL of the article being checked (never matched against itself)
+            signature: MinHash signature of the article
+            ticker: Stock ticker symbol
+
+        Returns:
+            (canonical URL, estimated similarity) or None if no near-duplicate exists
+        """
+        candidates: Set[str] = set()
+        for band, band_key in enumerate(self._band_keys(signature)):
+            candidates.update(self._buckets[band].get(band_key, ()))
+        candidates.discard(key)
+
+        best = None
+        for candidate in candidates:
+            candidate_signature, candidate_ticker, _ = self._entries[candidate]
+            if candidate_ticker != ticker:
+                continue
+            similarity = float(np.mean(candidate_signature == signature))
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (candidate, similarity)
+        return best
+
+    def reset(self):
+        """Clear the index so it is re-seeded from the database on next use."""
+        self._buckets = [defaultdict(set) for _ in range(self.bands)]
+        self._entries = {}
+        self._expiry = []
+        self._seeded = False
+
+    def seed(self, db: Session):
+        """Load articles published within the window from the database."""
+        cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - self.window
+        rows = db.query(
+            Article.url, Article.ticker, Article.headline, Article.summary, Article.published_date
+        ).filter(Article.published_date >= cutoff).all()
+
+        for url, ticker, headline, summary, published_date in rows:
+            self.add(url, self.signature(f"{headline} {summary}"), ticker, published_date)
+
+        self._seeded = True
+        logger.info(f"Seeded near-duplicate index with {len(rows)} recent articles")
+
+    def partition(
+        self,
+        db: Session,
+        articles: List[ArticleCreate]
+    ) -> Tuple[List[ArticleCreate], List[Tuple[ArticleCreate, str, float]]]:
+        """
+        Split a batch into canonical articles and near-duplicates of indexed ones.
+
+        Canonical articles are added to the index so later articles in the same batch
+        (or later batches) can match them.
+
+        Args:
+            db: Database session, used to seed the index on first call
+            articles: Standardized articles to check
+
+        Returns:
+            (canonical articles, [(duplicate article, canonical URL, similarity)])
+        """
+        if not self._seeded:
+            self.seed(db)
+        self.evict_expired()
+
+        canonical: List[ArticleCreate] = []
+        duplicates: List[Tuple[ArticleCreate, str, float]] = []
+
+        for article in articles:
+            signature = self.signature(f"{article.headline} {article.summary}")
+            match = self.find_duplicate(article.url, signature, article.ticker)
+            if match:
+                duplicates.append((article, match[0], match[1]))
+            else:
+                canonical.append(article)
+                self.add(article.url, signature, article.ticker, article.published_date)
+
+        return canonical, duplicates
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+near_duplicate_detector = NearDuplicateDetector()
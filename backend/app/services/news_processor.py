@@ -1,24 +1,40 @@
 import logging
 import asyncio
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime, timedelta, timezone
 from sqlalchemy.orm import Session
 
 from app.services.polygon_service import PolygonNewsService
 from app.services.financial_datasets_service import FinancialDatasetsService
 from app.services.whalewisdom_service import WhaleWisdomService
 from app.services.finnhub_service import FinnhubService
-from app.models.models import Article
+from app.services.article_store import insert_new_articles, link_near_duplicates
+from app.services.result_cache import result_cache
+from app.services.near_duplicate_detector import NearDuplicateDetector, near_duplicate_detector
+from app.services.source_bias_resolver import source_bias_resolver
+from app.models.models import Article, FetchWatermark
 from app.models.schemas import ArticleCreate, BiasCategory, SentimentCategory
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# News providers that feed the article pipeline (watermarks are tracked per provider)
+NEWS_PROVIDERS = ("polygon", "financial_datasets", "finnhub")
+
+
+def _to_naive_utc(value: datetime) -> datetime:
+    """Convert a datetime to naive UTC, treating naive values as UTC already."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
 class NewsProcessor:
     """Process news from various sources and standardize format."""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, duplicate_detector: Optional[NearDuplicateDetector] = None):
         self.db = db
+        self.duplicate_detector = duplicate_detector or near_duplicate_detector
         self.polygon_service = PolygonNewsService()
         self.financial_datasets_service = FinancialDatasetsService()
         self.whalewisdom_service = WhaleWisdomService()
@@ -35,57 +51,212 @@ class NewsProcessor:
         Returns:
             List of processed articles
         """
+        processed_articles = await self.fetch_news(ticker, limit_per_source)
+        return self.save_articles(processed_articles)
+    
+    async def fetch_news(self, ticker: str, limit_per_source: int = 10) -> List[ArticleCreate]:
+        """
+        Fetch news for a ticker from all sources and standardize it, without saving.
+        
+        Args:
+            ticker: Stock ticker symbol
+            limit_per_source: Maximum number of news items to fetch per source
+            
+        Returns:
+            List of standardized articles
+        """
+        window_starts, raw_news = await self.fetch_raw_news(ticker, limit_per_source)
+        return self.normalize_news(ticker, raw_news, window_starts)
+    
+    async def fetch_raw_news(
+        self,
+        ticker: str,
+        limit_per_source: int = 10
+    ) -> Tuple[Dict[str, datetime], Dict[str, List[Dict[str, Any]]]]:
+        """
+        Fetch raw news items for a ticker from all sources.
+        
+        Args:
+            ticker: Stock ticker symbol
+            limit_per_source: Maximum number of news items to fetch per source
+            
+        Returns:
+            Tuple of the fetch window start per provider and the raw items per provider
+        """
+        # Only request what is newer than each provider's watermark (minus an overlap)
+        window_starts = self._get_fetch_window_starts(ticker)
+        
         # Fetch news from all sources concurrently
-        polygon_task = self.polygon_service.get_ticker_news(ticker, limit_per_source)
-        financial_datasets_task = self.financial_datasets_service.get_ticker_news(ticker, limit_per_source)
-        finnhub_task = self.finnhub_service.get_company_news(ticker, limit_per_source)
+        polygon_task = self.polygon_service.get_ticker_news(
+            ticker, limit_per_source, published_after=window_starts["polygon"]
+        )
+        financial_datasets_task = self.financial_datasets_service.get_ticker_news(
+            ticker, limit_per_source, published_after=window_starts["financial_datasets"]
+        )
+        finnhub_task = self.finnhub_service.get_company_news(
+            ticker, limit_per_source, published_after=window_starts["finnhub"]
+        )
         
         # Await all tasks
         polygon_news, financial_datasets_news, finnhub_news = await asyncio.gather(
             polygon_task, financial_datasets_task, finnhub_task
         )
         
+        return window_starts, {
+            "polygon": polygon_news,
+            "financial_datasets": financial_datasets_news,
+            "finnhub": finnhub_news,
+        }
+    
+    def normalize_news(
+        self,
+        ticker: str,
+        raw_news: Dict[str, List[Dict[str, Any]]],
+        window_starts: Dict[str, datetime]
+    ) -> List[ArticleCreate]:
+        """
+        Standardize raw news items and resolve the bias of their sources.
+        
+        Args:
+            ticker: Stock ticker symbol
+            raw_news: Raw items per provider, from ``fetch_raw_news``
+            window_starts: Fetch window start per provider, from ``fetch_raw_news``
+            
+        Returns:
+            List of standardized articles inside the fetch window
+        """
+        processors = {
+            "polygon": self._process_polygon_article,
+            "financial_datasets": self._process_financial_datasets_article,
+            "finnhub": self._process_finnhub_article,
+        }
+        
         # Process news from each source
         processed_articles = []
-        
-        # Process Polygon news
-        for article in polygon_news:
-            processed_article = self._process_polygon_article(article, ticker)
-            if processed_article:
-                processed_articles.append(processed_article)
-                
-        # Process Financial Datasets news
-        for article in financial_datasets_news:
-            processed_article = self._process_financial_datasets_article(article, ticker)
-            if processed_article:
-                processed_articles.append(processed_article)
+        for provider, articles in raw_news.items():
+            for article in articles:
+                processed_article = processors[provider](article, ticker)
+                if processed_article:
+                    processed_articles.append(processed_article)
                 
-        # Process Finnhub news
-        for article in finnhub_news:
-            processed_article = self._process_finnhub_article(article, ticker)
-            if processed_article:
-                processed_articles.append(processed_article)
-                
-        # Save articles to database
-        saved_articles = []
-        for article_data in processed_articles:
-            # Check if article already exists by URL
-            existing_article = self.db.query(Article).filter(Article.url == article_data.url).first()
-            if not existing_article:
-                article = Article(
-                    ticker=article_data.ticker,
-                    headline=article_data.headline,
-                    summary=article_data.summary,
-                    url=article_data.url,
-                    source=article_data.source,
-                    bias_label=article_data.bias_label,
-                    sentiment_label=article_data.sentiment_label,
-                    published_date=article_data.published_date
-                )
-                self.db.add(article)
-                saved_articles.append(article)
+        # Drop anything older than the window (Finnhub only filters by day)
+        return [
+            article for article in processed_articles
+            if _to_naive_utc(article.published_date) >= _to_naive_utc(window_starts[article.provider])
+        ]
+    
+    def _get_fetch_window_starts(self, ticker: str) -> Dict[str, datetime]:
+        """
+        Get the start of the fetch window for each provider for a ticker.
+        
+        The window starts at the provider's watermark minus NEWS_FETCH_OVERLAP_MINUTES,
+        but never earlier than MAX_NEWS_AGE_DAYS ago.
+        
+        Args:
+            ticker: Stock ticker symbol
+            
+        Returns:
+            Dictionary mapping provider names to timezone-aware UTC datetimes
+        """
+        oldest = datetime.now(timezone.utc) - timedelta(days=settings.MAX_NEWS_AGE_DAYS)
+        overlap = timedelta(minutes=settings.NEWS_FETCH_OVERLAP_MINUTES)
+        
+        watermarks = {
+            watermark.provider: watermark.last_published_at.replace(tzinfo=timezone.utc)
+            for watermark in self.db.query(FetchWatermark).filter(FetchWatermark.ticker == ticker).all()
+        }
+        
+        return {
+            provider: max(oldest, watermarks[provider] - overlap) if provider in watermarks else oldest
+            for provider in NEWS_PROVIDERS
+        }
+    
+    def _update_watermarks(self, processed_articles: List[ArticleCreate]):
+        """
+        Advance the (provider, ticker) watermarks to the newest article seen.
+        
+        Changes are added to the session and committed with the articles.
+        
+        Args:
+            processed_articles: Standardized articles from a fetch
+        """
+        newest: Dict[tuple, datetime] = {}
+        for article in processed_articles:
+            if not article.provider:
+                continue
+            key = (article.provider, article.ticker)
+            published = _to_naive_utc(article.published_date)
+            if key not in newest or published > newest[key]:
+                newest[key] = published
                 
-        self.db.commit()
+        for (provider, ticker), published in newest.items():
+            watermark = self.db.query(FetchWatermark).filter(
+                FetchWatermark.provider == provider,
+                FetchWatermark.ticker == ticker
+            ).first()
+            
+            if watermark is None:
+                self.db.add(FetchWatermark(provider=provider, ticker=ticker, last_published_at=published))
+            elif published > watermark.last_published_at:
+                watermark.last_published_at = published
+    
+    def save_articles(self, processed_articles: List[ArticleCreate]) -> List[Article]:
+        """
+        Save standardized articles that are not already in the database.
+        
+        Args:
+            processed_articles: Standardized articles to save
+            
+        Returns:
+            List of newly saved articles
+        """
+        try:
+            # Split off cross-provider copies of stories that are already indexed
+            canonical_articles, duplicates = processed_articles, []
+            if settings.NEAR_DUPLICATE_DETECTION_ENABLED:
+                canonical_articles, duplicates = self.duplicate_detector.partition(self.db, processed_articles)
+        except Exception:
+            # The index may now hold articles that were never stored
+            self.duplicate_detector.reset()
+            raise
+        
+        return self.store_articles(canonical_articles, duplicates, processed_articles)
+    
+    def store_articles(
+        self,
+        canonical_articles: List[ArticleCreate],
+        duplicates: List[Tuple[ArticleCreate, str, float]],
+        fetched_articles: List[ArticleCreate]
+    ) -> List[Article]:
+        """
+        Store articles already split by the near-duplicate detector and commit.
+        
+        Args:
+            canonical_articles: Articles to insert, skipping URLs already stored
+            duplicates: (duplicate article, canonical URL, similarity) tuples to link
+            fetched_articles: Every article of the fetch, used to advance the watermarks
+            
+        Returns:
+            List of newly saved articles
+        """
+        try:
+            # One set-based insert per batch instead of a lookup and insert per article
+            saved_articles = insert_new_articles(self.db, canonical_articles)
+            
+            # Link duplicates to their canonical article instead of storing them again
+            linked = link_near_duplicates(self.db, duplicates)
+            if linked:
+                logger.info(f"Linked {linked} near-duplicate articles to canonical articles")
+            
+            self._update_watermarks(fetched_articles)
+            self.db.commit()
+        except Exception:
+            # The index may now hold articles that were never stored
+            self.duplicate_detector.reset()
+            raise
+        
+        # Cached analysis results for these tickers no longer match the database
+        result_cache.invalidate_tickers(article.ticker for article in saved_articles)
         
         return saved_articles
     
@@ -112,7 +283,8 @@ class NewsProcessor:
                 source=source,
                 bias_label=self._get_bias_for_source(source_domain),
                 sentiment_label=SentimentCategory.NEUTRAL,  # Will be updated by sentiment analysis module
-                published_date=published_date
+                published_date=published_date,
+                provider="polygon"
             )
         except Exception as e:
             logger.error(f"Error processing Polygon article: {str(e)}")
@@ -141,7 +313,8 @@ class NewsProcessor:
                 source=source,
                 bias_label=self._get_bias_for_source(source_domain),
                 sentiment_label=SentimentCategory.NEUTRAL,  # Will be updated by sentiment analysis module
-                published_date=published_date
+                published_date=published_date,
+                provider="financial_datasets"
             )
         except Exception as e:
             logger.error(f"Error processing Financial Datasets article: {str(e)}")
@@ -170,7 +343,8 @@ class NewsProcessor:
                 source=source,
                 bias_label=self._get_bias_for_source(source_domain),
                 sentiment_label=SentimentCategory.NEUTRAL,  # Will be updated by sentiment analysis module
-                published_date=published_date
+                published_date=published_date,
+                provider="finnhub"
             )
         except Exception as e:
             logger.error(f"Error processing Finnhub article: {str(e)}")
@@ -179,13 +353,6 @@ class NewsProcessor:
     def _get_bias_for_source(self, domain: str) -> BiasCategory:
         """
         Get bias category for a news source domain.
-        This is a placeholder - in the real implementation, this would query the database.
+        Resolved from the in-memory source index, without a query per article.
         """
-        # Query the database for the source
-        source = self.db.query(Article).filter_by(domain=domain).first()
-        
-        if source:
-            return source.bias_rating
-        
-        # Default to unknown if source not found
-        return BiasCategory.UNKNOWN
+        return source_bias_resolver.resolve(domain, self.db)
@@ -8,6 +8,9 @@ from typing import List, Optional
 
 from app.db.session import SessionLocal
 from app.services.news_processor import NewsProcessor
+from app.services.ingestion_pipeline import IngestionPipeline
+from app.services.http_client import http_clients
+from app.services.rate_limiter import rate_limiters
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -18,6 +21,8 @@ class NewsScheduler:
     def __init__(self):
         self.default_tickers = ["AAPL", "MSFT", "GOOGL", "AMZN", "TSLA"]
         self.fetch_interval_minutes = settings.NEWS_FETCH_INTERVAL_MINUTES
+        # Long-lived event loop so pooled HTTP clients survive across job runs
+        self.loop = asyncio.new_event_loop()
         
     def start(self):
         """Start the scheduler."""
@@ -30,9 +35,20 @@ class NewsScheduler:
         self.fetch_news_job()
         
         # Keep the scheduler running
-        while True:
-            schedule.run_pending()
-            time.sleep(1)
+        try:
+            while True:
+                schedule.run_pending()
+                time.sleep(1)
+        finally:
+            self.stop()
+            
+    def stop(self):
+        """Close pooled HTTP clients and the scheduler's event loop."""
+        if self.loop.is_closed():
+            return
+        self.loop.run_until_complete(http_clients.aclose())
+        self.loop.close()
+        logger.info("News scheduler stopped")
             
     def fetch_news_job(self):
         """Job to fetch news for all tickers."""
@@ -41,35 +57,52 @@ class NewsScheduler:
         # Get tickers to fetch (in a real implementation, this would include user watchlists)
         tickers = self.get_tickers_to_fetch()
         
-        # Create a new database session
-        db = SessionLocal()
         try:
-            # Create news processor
-            processor = NewsProcessor(db)
-            
-            # Run the async fetch in the event loop
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            for ticker in tickers:
-                try:
-                    # Fetch and process news for each ticker
-                    articles = loop.run_until_complete(processor.fetch_and_process_news(ticker))
-                    logger.info(f"Fetched {len(articles)} new articles for {ticker}")
-                    
-                    # Add delay between tickers to avoid rate limits
-                    time.sleep(1)
-                except Exception as e:
-                    logger.error(f"Error fetching news for {ticker}: {str(e)}")
-            
-            loop.close()
-            
+            # Run the async fetch in the scheduler's long-lived event loop
+            asyncio.set_event_loop(self.loop)
+            self.loop.run_until_complete(self.run_fetch_cycle(tickers))
         except Exception as e:
             logger.error(f"Error in news fetch job: {str(e)}")
+            
+        logger.info(f"Provider rate limiter metrics: {rate_limiters.metrics()}")
+        logger.info("Completed scheduled news fetch job")
+        
+    async def run_fetch_cycle(self, tickers: List[str]) -> int:
+        """
+        Run one ingestion cycle for all tickers through the streaming pipeline.
+        
+        Tickers are fetched concurrently, paced per provider by the shared rate
+        limiters, and each ticker's new articles are stored with their sentiment
+        label and embedding as soon as they get through the pipeline stages.
+        
+        Args:
+            tickers: List of stock ticker symbols
+            
+        Returns:
+            Total number of new articles saved
+        """
+        # Create a new database session
+        db = SessionLocal()
+        try:
+            pipeline = IngestionPipeline(NewsProcessor(db))
+            total_saved = await pipeline.run(tickers)
         finally:
             db.close()
             
-        logger.info("Completed scheduled news fetch job")
+        metrics = pipeline.metrics()
+        logger.info(f"Fetched {total_saved} new articles for {len(tickers)} tickers in {metrics['seconds']:.1f}s")
+        logger.info(f"Ingestion pipeline metrics: {metrics}")
+        try:
+            pipeline.save_metrics()
+        except OSError as e:
+            logger.error(f"Error writing ingestion metrics: {str(e)}")
+        if metrics["seconds"] > self.fetch_interval_minutes * 60:
+            logger.warning(
+                f"News fetch cycle took {metrics['seconds']:.1f}s, longer than the "
+                f"{self.fetch_interval_minutes} minute fetch interval"
+            )
+            
+        return total_saved
         
     def get_tickers_to_fetch(self) -> List[str]:
         """
@@ -1,9 +1,113 @@
-from sqlalchemy.orm import Session
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+import base64
+import json
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.orm import Session, aliased, defer
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime
 
 from app.models.models import Article
-from app.models.schemas import BiasDistribution, ArticleResponse
+from app.models.schemas import BiasDistribution, ArticleResponse, SimilarArticleResponse
+from app.services.similarity_index import similarity_index
+from app.services.article_stats import count_labels, build_bias_distribution
+
+def encode_cursor(published_date: datetime, article_id: int) -> str:
+    """
+    Build the opaque pagination cursor pointing after an article.
+    
+    Args:
+        published_date: Publication date of the last article on the page
+        article_id: ID of the last article on the page
+        
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps({"published_date": published_date.isoformat(), "id": article_id})
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Read a pagination cursor built by ``encode_cursor``.
+    
+    Args:
+        cursor: Cursor string from a previous page
+        
+    Returns:
+        (published_date, id) of the last article on the previous page
+        
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(payload["published_date"]), int(payload["id"])
+    except (TypeError, KeyError, ValueError) as e:
+        raise ValueError(f"Invalid pagination cursor: {cursor!r}") from e
+
+def get_news_page(
+    db: Session,
+    ticker: str,
+    bias_list: Optional[List[str]] = None,
+    sentiment_list: Optional[List[str]] = None,
+    limit: int = 20,
+    offset: int = 0,
+    cursor: Optional[str] = None
+) -> Tuple[List[ArticleResponse], Optional[str]]:
+    """
+    Get a page of news articles for a specific ticker with optional filtering.
+    
+    Articles are ordered by (published_date, id), newest first. With a cursor the
+    page starts right after the article it points to, an index range scan on
+    (ticker, published_date, id) that costs the same at any depth and neither
+    skips nor repeats articles when new ones arrive between requests. Without
+    one, ``offset`` rows are skipped as before.
+    
+    Args:
+        db: Database session
+        ticker: Stock ticker symbol
+        bias_list: Optional list of bias categories to filter by
+        sentiment_list: Optional list of sentiment values to filter by
+        limit: Maximum number of articles to return
+        offset: Offset for pagination, ignored when a cursor is given
+        cursor: Cursor from the previous page
+        
+    Returns:
+        Tuple of the article response objects and the cursor of the next page
+        (None on the last page)
+        
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    query = db.query(Article).filter(Article.ticker == ticker)
+    
+    # Apply bias filter if provided
+    if bias_list:
+        query = query.filter(Article.bias_label.in_(bias_list))
+        
+    # Apply sentiment filter if provided
+    if sentiment_list:
+        query = query.filter(Article.sentiment_label.in_(sentiment_list))
+    
+    # Order by published date (newest first), ID breaks ties so the order is total
+    query = query.order_by(Article.published_date.desc(), Article.id.desc())
+    
+    # Continue after the last article of the previous page
+    if cursor:
+        query = query.filter(tuple_(Article.published_date, Article.id) < decode_cursor(cursor))
+    elif offset:
+        query = query.offset(offset)
+    
+    # Fetch one extra row to know whether there is a next page
+    articles = query.limit(limit + 1).all()
+    has_more = len(articles) > limit
+    articles = articles[:limit]
+    
+    next_cursor = None
+    if has_more and articles:
+        next_cursor = encode_cursor(articles[-1].published_date, articles[-1].id)
+    
+    # Convert to response model
+    return [ArticleResponse.from_orm(article) for article in articles], next_cursor
 
 def get_news_by_ticker(
     db: Session, 
@@ -11,7 +115,8 @@ def get_news_by_ticker(
     bias_list: Optional[List[str]] = None, 
     sentiment_list: Optional[List[str]] = None,
     limit: int = 20,
-    offset: int = 0
+    offset: int = 0,
+    cursor: Optional[str] = None
 ) -> List[ArticleResponse]:
     """
     Get news articles for a specific ticker with optional filtering.
@@ -22,29 +127,119 @@ def get_news_by_ticker(
         bias_list: Optional list of bias categories to filter by
         sentiment_list: Optional list of sentiment values to filter by
         limit: Maximum number of articles to return
-        offset: Offset for pagination
+        offset: Offset for pagination, ignored when a cursor is given
+        cursor: Cursor from the previous page (see ``get_news_page``)
         
     Returns:
         List of article response objects
     """
-    query = db.query(Article).filter(Article.ticker == ticker)
+    return get_news_page(db, ticker, bias_list, sentiment_list, limit, offset, cursor)[0]
+
+def get_news_for_tickers(
+    db: Session,
+    tickers: List[str],
+    bias_list: Optional[List[str]] = None,
+    sentiment_list: Optional[List[str]] = None,
+    limit: int = 20
+) -> Dict[str, List[ArticleResponse]]:
+    """
+    Get the newest articles of every ticker in one windowed query.
+    
+    Ranks each ticker's articles with ``ROW_NUMBER() OVER (PARTITION BY ticker
+    ORDER BY published_date DESC, id DESC)`` and keeps the first ``limit`` per
+    ticker, so the cost is one round-trip however many tickers are requested.
+    
+    Args:
+        db: Database session
+        tickers: Stock ticker symbols
+        bias_list: Optional list of bias categories to filter by
+        sentiment_list: Optional list of sentiment values to filter by
+        limit: Maximum number of articles per ticker
+        
+    Returns:
+        Dictionary from ticker to its article response objects (newest first),
+        in the requested order, with an empty list for tickers without articles
+    """
+    unique_tickers = list(dict.fromkeys(tickers))
+    result: Dict[str, List[ArticleResponse]] = {ticker: [] for ticker in unique_tickers}
+    if not unique_tickers or limit <= 0:
+        return result
+    
+    rank = func.row_number().over(
+        partition_by=Article.ticker,
+        order_by=(Article.published_date.desc(), Article.id.desc())
+    ).label("rank")
+    ranked = select(Article, rank).where(Article.ticker.in_(unique_tickers))
     
     # Apply bias filter if provided
     if bias_list:
-        query = query.filter(Article.bias_label.in_(bias_list))
+        ranked = ranked.where(Article.bias_label.in_(bias_list))
         
     # Apply sentiment filter if provided
     if sentiment_list:
-        query = query.filter(Article.sentiment_label.in_(sentiment_list))
+        ranked = ranked.where(Article.sentiment_label.in_(sentiment_list))
+    
+    ranked = ranked.subquery()
+    ranked_article = aliased(Article, ranked)
+    
+    articles = db.query(ranked_article).options(
+        # Responses don't include embeddings, skip loading the vectors
+        defer(ranked_article.embedding_vector)
+    ).filter(
+        ranked.c.rank <= limit
+    ).order_by(
+        ranked_article.ticker, ranked.c.rank
+    ).all()
+    
+    for article in articles:
+        result[article.ticker].append(ArticleResponse.from_orm(article))
+    
+    return result
+
+def get_similar_articles(
+    db: Session,
+    article_id: int,
+    limit: int = 10
+) -> Optional[List[SimilarArticleResponse]]:
+    """
+    Get the articles most similar to an article, across sources and bias categories.
+    
+    Args:
+        db: Database session
+        article_id: ID of the article to find related coverage for
+        limit: Maximum number of articles to return
         
-    # Order by published date (newest first)
-    query = query.order_by(Article.published_date.desc())
+    Returns:
+        List of similar article response objects (most similar first),
+        or None if the article does not exist
+    """
+    article = db.query(Article).filter(Article.id == article_id).first()
+    if not article:
+        return None
     
-    # Apply pagination
-    articles = query.offset(offset).limit(limit).all()
+    # Pick up articles embedded since the last lookup
+    similarity_index.sync(db)
     
-    # Convert to response model
-    return [ArticleResponse.from_orm(article) for article in articles]
+    vector = similarity_index.get_vector(article_id)
+    if vector is None and article.embedding_vector:
+        vector = article.embedding_vector
+    if vector is None:
+        return []
+    
+    matches = similarity_index.search(vector, k=limit, exclude_ids=[article_id])
+    if not matches:
+        return []
+    
+    # Fetch all matched articles in one query and keep the similarity order
+    articles_by_id = {
+        a.id: a for a in db.query(Article).filter(Article.id.in_([match_id for match_id, _ in matches])).all()
+    }
+    
+    return [
+        SimilarArticleResponse(**ArticleResponse.from_orm(articles_by_id[match_id]).dict(), similarity=similarity)
+        for match_id, similarity in matches
+        if match_id in articles_by_id
+    ]
 
 def get_bias_distribution(
     db: Session,
@@ -62,74 +257,5 @@ def get_bias_distribution(
     Returns:
         BiasDistribution object with statistics
     """
-    # Calculate date threshold
-    date_threshold = datetime.now() - timedelta(days=days)
-    
-    # Get articles within date range
-    articles = db.query(Article).filter(
-        Article.ticker == ticker,
-        Article.published_date >= date_threshold
-    ).all()
-    
-    # Count total articles
-    total_articles = len(articles)
-    
-    if total_articles == 0:
-        return BiasDistribution(
-            ticker=ticker,
-            total_articles=0,
-            days=days,
-            is_biased=False
-        )
-    
-    # Count articles by bias category
-    left_count = sum(1 for a in articles if a.bias_label == "left")
-    lean_left_count = sum(1 for a in articles if a.bias_label == "lean_left")
-    center_count = sum(1 for a in articles if a.bias_label == "center")
-    lean_right_count = sum(1 for a in articles if a.bias_label == "lean_right")
-    right_count = sum(1 for a in articles if a.bias_label == "right")
-    unknown_count = sum(1 for a in articles if a.bias_label == "unknown")
-    
-    # Calculate percentages
-    left_percentage = (left_count / total_articles) * 100 if total_articles > 0 else 0
-    lean_left_percentage = (lean_left_count / total_articles) * 100 if total_articles > 0 else 0
-    center_percentage = (center_count / total_articles) * 100 if total_articles > 0 else 0
-    lean_right_percentage = (lean_right_count / total_articles) * 100 if total_articles > 0 else 0
-    right_percentage = (right_count / total_articles) * 100 if total_articles > 0 else 0
-    unknown_percentage = (unknown_count / total_articles) * 100 if total_articles > 0 else 0
-    
-    # Determine if coverage is biased (one category > 60%)
-    is_biased = False
-    dominant_bias = None
-    
-    for bias, percentage in [
-        ("left", left_percentage),
-        ("lean_left", lean_left_percentage),
-        ("center", center_percentage),
-        ("lean_right", lean_right_percentage),
-        ("right", right_percentage)
-    ]:
-        if percentage > 60:
-            is_biased = True
-            dominant_bias = bias
-            break
-    
-    return BiasDistribution(
-        ticker=ticker,
-        total_articles=total_articles,
-        left_count=left_count,
-        lean_left_count=lean_left_count,
-        center_count=center_count,
-        lean_right_count=lean_right_count,
-        right_count=right_count,
-        unknown_count=unknown_count,
-        left_percentage=left_percentage,
-        lean_left_percentage=lean_left_percentage,
-        center_percentage=center_percentage,
-        lean_right_percentage=lean_right_percentage,
-        right_percentage=right_percentage,
-        unknown_percentage=unknown_percentage,
-        days=days,
-        is_biased=is_biased,
-        dominant_bias=dominant_bias
-    )
+    # Counts come from one GROUP BY query instead of loading every article
+    return build_bias_distribution(ticker, days, count_labels(db, ticker, days))
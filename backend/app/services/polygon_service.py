@@ -1,20 +1,29 @@
 import httpx
 import asyncio
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Any, Optional
 import logging
 
 from app.core.config import settings
+from app.services.http_client import http_clients
+from app.services.rate_limiter import rate_limiters
 
 logger = logging.getLogger(__name__)
 
 class PolygonNewsService:
     """Service to fetch news from Polygon.io API."""
     
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, client: Optional[httpx.AsyncClient] = None):
         self.api_key = api_key or settings.POLYGON_API_KEY
         self.base_url = "https://api.polygon.io/v2"
         self.headers = {"Authorization": f"Bearer {self.api_key}"}
+        self._client = client
+        self.rate_limiter = rate_limiters.get("polygon")
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Pooled HTTP client, shared across service instances unless one was injected."""
+        return self._client or http_clients.get("polygon")
         
     async def get_ticker_news(
         self, 
@@ -39,10 +48,10 @@ class PolygonNewsService:
             
         # Set default published_after to 7 days ago if not provided
         if published_after is None:
-            published_after = datetime.now() - timedelta(days=settings.MAX_NEWS_AGE_DAYS)
+            published_after = datetime.now(timezone.utc) - timedelta(days=settings.MAX_NEWS_AGE_DAYS)
             
-        # Format date for API
-        published_after_str = published_after.strftime("%Y-%m-%d")
+        # Format timestamp for API (UTC, so incremental fetches are not rounded to the day)
+        published_after_str = published_after.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
         
         # Build URL
         url = f"{self.base_url}/reference/news"
@@ -55,21 +64,26 @@ class PolygonNewsService:
             "order": "published_utc.desc",
         }
         
+        # Wait for the provider's rate-limit budget
+        if not await self.rate_limiter.acquire():
+            logger.warning("Polygon rate limit budget exhausted, skipping request")
+            return []
+            
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, headers=self.headers, params=params)
-                response.raise_for_status()
-                data = response.json()
+            response = await self.client.get(url, headers=self.headers, params=params)
+            response.raise_for_status()
+            data = response.json()
                 
-                if data.get("status") == "OK":
-                    return data.get("results", [])
-                else:
-                    logger.error(f"Error fetching news from Polygon: {data.get('error')}")
-                    return []
+            if data.get("status") == "OK":
+                return data.get("results", [])
+            else:
+                logger.error(f"Error fetching news from Polygon: {data.get('error')}")
+                return []
                     
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 429:
-                logger.warning("Polygon API rate limit exceeded, consider implementing backoff")
+                self.rate_limiter.record_throttled()
+                logger.warning("Polygon API rate limit exceeded")
             logger.error(f"HTTP error fetching news from Polygon: {str(e)}")
             return []
         except Exception as e:
@@ -83,7 +97,10 @@ class PolygonNewsService:
         published_after: Optional[datetime] = None
     ) -> Dict[str, List[Dict[Any, Any]]]:
         """
-        Fetch news for multiple tickers with rate limiting for free tier.
+        Fetch news for multiple tickers concurrently.
+        
+        Requests are paced by the shared Polygon token bucket, so fan-out runs at
+        the configured quota rather than with fixed delays between tickers.
         
         Args:
             tickers: List of stock ticker symbols
@@ -93,19 +110,13 @@ class PolygonNewsService:
         Returns:
             Dictionary mapping tickers to their news articles
         """
-        results = {}
-        
-        # For free tier, we need to be careful about rate limits
-        # Process one ticker at a time with delay between requests
-        for ticker in tickers:
-            ticker_news = await self.get_ticker_news(
+        ticker_news = await asyncio.gather(*(
+            self.get_ticker_news(
                 ticker=ticker,
                 limit=limit_per_ticker,
                 published_after=published_after
             )
-            results[ticker] = ticker_news
-            
-            # Add delay to avoid hitting rate limits on free tier
-            await asyncio.sleep(0.5)
-            
-        return results
+            for ticker in tickers
+        ))
+        
+        return dict(zip(tickers, ticker_news))
@@ -0,0 +1,133 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Any, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Async token-bucket rate limiter.
+
+    Tokens refill continuously at ``rate`` per second up to ``burst``. Callers that
+    find the bucket empty reserve the next token (the balance goes negative) and
+    sleep until it is due, so concurrent callers are released at exactly the
+    configured rate in arrival order.
+    """
+
+    def __init__(self, name: str, rate: float, burst: int, max_wait: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError(f"Rate for {name} must be positive")
+        self.name = name
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.max_wait = max_wait
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+
+        # Metrics
+        self.acquired = 0
+        self.delayed = 0
+        self.rejected = 0
+        self.throttled = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Take one token, waiting for it if necessary.
+
+        Args:
+            timeout: Maximum seconds to wait; defaults to the bucket's ``max_wait``
+
+        Returns:
+            True if a token was acquired, False if the wait would exceed the timeout
+        """
+        timeout = self.max_wait if timeout is None else timeout
+
+        self._refill()
+        self._tokens -= 1
+        wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if timeout is not None and wait > timeout:
+            # Give the reservation back
+            self._tokens += 1
+            self.rejected += 1
+            return False
+
+        if wait > 0:
+            self.delayed += 1
+            await asyncio.sleep(wait)
+
+        self.acquired += 1
+        self.total_wait_seconds += wait
+        self.max_wait_seconds = max(self.max_wait_seconds, wait)
+        return True
+
+    def record_throttled(self):
+        """Record that the provider answered with HTTP 429 despite the limiter."""
+        self.throttled += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        """Return a snapshot of the limiter's configuration and counters."""
+        self._refill()
+        return {
+            "rate_per_second": self.rate,
+            "burst": self.burst,
+            "available_tokens": max(0.0, self._tokens),
+            "acquired": self.acquired,
+            "delayed": self.delayed,
+            "rejected": self.rejected,
+            "throttled": self.throttled,
+            "total_wait_seconds": self.total_wait_seconds,
+            "avg_wait_seconds": self.total_wait_seconds / self.acquired if self.acquired else 0.0,
+            "max_wait_seconds": self.max_wait_seconds,
+        }
+
+
+class RateLimiterRegistry:
+    """Process-wide token buckets, one per provider, configured from settings."""
+
+    def __init__(self):
+        self._limiters: Dict[str, TokenBucket] = {}
+
+    def get(self, provider: str) -> TokenBucket:
+        """
+        Get the token bucket for a provider, creating it from settings on first use.
+
+        Reads ``<PROVIDER>_RATE_LIMIT_PER_MINUTE`` and ``<PROVIDER>_RATE_LIMIT_BURST``.
+
+        Args:
+            provider: Provider name (e.g. "polygon", "finnhub")
+
+        Returns:
+            TokenBucket for the provider
+        """
+        limiter = self._limiters.get(provider)
+        if limiter is None:
+            prefix = provider.upper()
+            per_minute = getattr(settings, f"{prefix}_RATE_LIMIT_PER_MINUTE")
+            burst = getattr(settings, f"{prefix}_RATE_LIMIT_BURST")
+            limiter = TokenBucket(
+                name=provider,
+                rate=per_minute / 60.0,
+                burst=burst,
+                max_wait=settings.RATE_LIMIT_MAX_WAIT_SECONDS,
+            )
+            self._limiters[provider] = limiter
+        return limiter
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Return metrics for every provider limiter created so far."""
+        return {provider: limiter.metrics() for provider, limiter in self._limiters.items()}
+
+
+rate_limiters = RateLimiterRegistry()
@@ -0,0 +1,295 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from fastapi.encoders import jsonable_encoder
+
+from app.services.single_flight import SingleFlight, analysis_single_flight
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+RESULT_CACHE_BACKENDS = ("memory", "redis")
+
+
+def _redis_available() -> bool:
+    """Return True if the optional ``redis`` package is installed."""
+    try:
+        import redis  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class MemoryResultCacheBackend:
+    """
+    In-process LRU store with per-entry expiry.
+
+    Holds at most ``max_entries`` values, dropping the least recently used one
+    when full. Expired entries are dropped when they are read. Ticker generations
+    live in a plain dict, so invalidation only reaches the current process.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl_seconds: float):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def generations(self, tickers: List[str]) -> List[int]:
+        with self._lock:
+            return [self._generations.get(ticker, 0) for ticker in tickers]
+
+    def bump_generations(self, tickers: List[str]):
+        with self._lock:
+            for ticker in tickers:
+                self._generations[ticker] = self._generations.get(ticker, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class RedisResultCacheBackend:
+    """
+    Redis store shared by every API, scheduler and worker process.
+
+    Values are stored as JSON with a Redis expiry. Eviction beyond the TTL is
+    left to Redis, configure ``maxmemory-policy allkeys-lru`` for LRU behavior.
+    Ticker generations are Redis counters, so an invalidation in the scheduler
+    is seen by every API process on its next lookup.
+    """
+
+    def __init__(self, url: str, prefix: str = "result_cache"):
+        import redis
+
+        self._client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def _generation_key(self, ticker: str) -> str:
+        return f"{self.prefix}:generation:{ticker}"
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self._client.get(f"{self.prefix}:entry:{key}")
+        return json.loads(value) if value is not None else None
+
+    def set(self, key: str, value: Any, ttl_seconds: float):
+        self._client.set(f"{self.prefix}:entry:{key}", json.dumps(value), px=int(ttl_seconds * 1000))
+
+    def generations(self, tickers: List[str]) -> List[int]:
+        values = self._client.mget([self._generation_key(ticker) for ticker in tickers])
+        return [int(value) if value is not None else 0 for value in values]
+
+    def bump_generations(self, tickers: List[str]):
+        pipe = self._client.pipeline(transaction=False)
+        for ticker in tickers:
+            pipe.incr(self._generation_key(ticker))
+        pipe.execute()
+
+    def clear(self):
+        keys = list(self._client.scan_iter(match=f"{self.prefix}:*"))
+        if keys:
+            self._client.delete(*keys)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self._client.scan_iter(match=f"{self.prefix}:entry:*"))
+
+
+def create_result_cache_backend(backend: Optional[str] = None):
+    """
+    Create a result cache backend.
+
+    Args:
+        backend: "memory" (per process) or "redis" (shared, needs the 'redis'
+            package and RESULT_CACHE_REDIS_URL) (default: RESULT_CACHE_BACKEND)
+
+    Returns:
+        Backend instance
+    """
+    backend = backend or settings.RESULT_CACHE_BACKEND
+    if backend not in RESULT_CACHE_BACKENDS:
+        raise ValueError(f"Unknown result cache backend '{backend}', expected one of {RESULT_CACHE_BACKENDS}")
+
+    if backend == "redis":
+        if not _redis_available():
+            logger.warning("Redis result cache requested but the 'redis' package is not installed, using memory")
+        elif not settings.RESULT_CACHE_REDIS_URL:
+            logger.warning("Redis result cache requested but RESULT_CACHE_REDIS_URL is not set, using memory")
+        else:
+            return RedisResultCacheBackend(settings.RESULT_CACHE_REDIS_URL)
+
+    return MemoryResultCacheBackend(settings.RESULT_CACHE_MAX_ENTRIES)
+
+
+class ResultCache:
+    """
+    TTL cache of analysis endpoint results keyed by endpoint, ticker set and days.
+
+    Every key embeds the current generation of each of its tickers. Writers call
+    ``invalidate_tickers`` after committing new articles or labels, which bumps
+    those generations, so every cached result that covers one of the tickers
+    (including portfolios) stops matching at once, without scanning keys. Entries
+    that are never read again age out through the TTL and LRU bound.
+
+    With the default in-process backend an invalidation only reaches the process
+    that made it, so results computed by the API are refreshed after at most
+    RESULT_CACHE_TTL_SECONDS when the scheduler or analysis worker writes. The
+    Redis backend shares entries and generations across processes.
+
+    Concurrent misses for the same key share one computation through
+    ``single_flight``. The key carries the ticker generations, so a request that
+    started after an invalidation never joins a computation that may have read
+    pre-commit data, and never caches that data under the new generation.
+
+    Backend errors are logged and the result is computed without the cache.
+    """
+
+    def __init__(
+        self,
+        backend: Any = None,
+        ttl_seconds: Optional[float] = None,
+        enabled: Optional[bool] = None,
+        single_flight: Optional[SingleFlight] = None
+    ):
+        self._backend = backend
+        self.ttl_seconds = ttl_seconds or settings.RESULT_CACHE_TTL_SECONDS
+        self.enabled = settings.RESULT_CACHE_ENABLED if enabled is None else enabled
+        self.single_flight = single_flight or analysis_single_flight
+
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def backend(self):
+        """Backend, created on first use."""
+        if self._backend is None:
+            self._backend = create_result_cache_backend()
+        return self._backend
+
+    def _count(self, endpoint: str, outcome: str):
+        with self._lock:
+            counters = self._counters.setdefault(endpoint, {"hits": 0, "misses": 0, "errors": 0})
+            counters[outcome] += 1
+
+    def get_or_compute(self, endpoint: str, tickers: Iterable[str], days: int, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached result for a request, computing and storing it on a miss.
+
+        Concurrent identical misses share one computation, also with the cache
+        disabled (keyed without generations then, since nothing is stored).
+
+        Args:
+            endpoint: Endpoint name, part of the key
+            tickers: Tickers the result covers, order and repeats do not matter
+            days: Number of days included in the result
+            compute: Callable that computes the result
+
+        Returns:
+            JSON-compatible result (pydantic models and enums are encoded),
+            shared with concurrent identical requests, so treat it as read-only
+        """
+        ticker_set = sorted(set(tickers))
+        if not self.enabled:
+            return self.single_flight.do((endpoint, days, tuple(ticker_set)), lambda: jsonable_encoder(compute()))
+
+        try:
+            generations = self.backend.generations(ticker_set)
+            key = "|".join([endpoint, str(days)] + [f"{t}:{g}" for t, g in zip(ticker_set, generations)])
+            cached = self.backend.get(key)
+        except Exception as e:
+            logger.error(f"Result cache lookup failed: {str(e)}")
+            self._count(endpoint, "errors")
+            return compute()
+
+        if cached is not None:
+            self._count(endpoint, "hits")
+            return cached
+
+        self._count(endpoint, "misses")
+        return self.single_flight.do(key, lambda: self._compute_and_store(endpoint, key, compute))
+
+    def _compute_and_store(self, endpoint: str, key: str, compute: Callable[[], Any]) -> Any:
+        result = jsonable_encoder(compute())
+        try:
+            self.backend.set(key, result, self.ttl_seconds)
+        except Exception as e:
+            logger.error(f"Result cache store failed: {str(e)}")
+            self._count(endpoint, "errors")
+        return result
+
+    def invalidate_tickers(self, tickers: Iterable[str]):
+        """
+        Invalidate every cached result that covers one of the tickers.
+
+        Call after the transaction that changed the tickers' articles committed,
+        so a concurrent request cannot cache pre-commit data under the new generation.
+
+        Args:
+            tickers: Tickers whose articles or labels changed
+        """
+        ticker_set = sorted(set(tickers))
+        if not self.enabled or not ticker_set:
+            return
+        try:
+            self.backend.bump_generations(ticker_set)
+        except Exception as e:
+            logger.error(f"Result cache invalidation failed for {len(ticker_set)} tickers: {str(e)}")
+
+    def clear(self):
+        """Drop every entry and generation."""
+        self.backend.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Hit/miss counters per endpoint since process start and the current number of entries."""
+        with self._lock:
+            endpoints = {endpoint: dict(counters) for endpoint, counters in self._counters.items()}
+        hits = sum(counters["hits"] for counters in endpoints.values())
+        misses = sum(counters["misses"] for counters in endpoints.values())
+        lookups = hits + misses
+
+        try:
+            entries = len(self.backend) if self.enabled else 0
+        except Exception as e:
+            logger.error(f"Result cache size lookup failed: {str(e)}")
+            entries = None
+
+        return {
+            "enabled": self.enabled,
+            "backend": type(self.backend).__name__ if self.enabled else None,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "entries": entries,
+            "ttl_seconds": self.ttl_seconds,
+            "endpoints": endpoints,
+        }
+
+
+result_cache = ResultCache()
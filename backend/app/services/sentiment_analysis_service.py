@@ -1,20 +1,31 @@
 import logging
+from concurrent.futures.process import BrokenProcessPool
 from typing import List, Dict, Any, Optional
+from sqlalchemy import update
 from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
+from datetime import datetime
 
 from app.models.models import Article
 from app.models.schemas import SentimentCategory
-from app.services.sentiment_analyzer import SentimentAnalyzer
+from app.services.sentiment_analyzer import SentimentAnalyzer, pending_sentiment_filter, sentiment_model_version
+from app.services.article_store import DailyCountDeltas, daily_count_key, apply_daily_count_deltas
+from app.services.result_cache import result_cache
+from app.services.article_stats import count_labels, build_sentiment_distribution
+from app.services.sentiment_worker_pool import SentimentWorkerPool, sentiment_worker_pool
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
 class SentimentAnalysisService:
     """Service for analyzing sentiment in news articles."""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, worker_pool: Optional[SentimentWorkerPool] = None):
         self.db = db
         self.analyzer = SentimentAnalyzer()
+        # Run batch inference in worker processes when SENTIMENT_WORKERS is set
+        if worker_pool is None and settings.SENTIMENT_WORKERS > 0:
+            worker_pool = sentiment_worker_pool
+        self.worker_pool = worker_pool
         
     def analyze_article_sentiment(self, article_id: int) -> SentimentCategory:
         """
@@ -34,17 +45,28 @@ class SentimentAnalysisService:
             return SentimentCategory.NEUTRAL
             
         # Analyze sentiment
-        sentiment = self.analyzer.analyze_article(article)
+        sentiment = self.analyzer.analyze_sentiments([f"{article.headline} {article.summary}"], default=None)[0]
+        if sentiment is None:
+            return article.sentiment_label
+        
+        # Move the article to its new label in the daily count rollup
+        changed_tickers = apply_daily_count_deltas(self.db, DailyCountDeltas({
+            daily_count_key(article): -1,
+            daily_count_key(article, sentiment_label=sentiment): 1,
+        }))
         
         # Update article
         article.sentiment_label = sentiment
+        article.sentiment_analyzed_at = datetime.utcnow()
+        article.sentiment_model_version = sentiment_model_version()
         self.db.commit()
+        result_cache.invalidate_tickers(changed_tickers)
         
         return sentiment
     
     def batch_analyze_articles(self, limit: int = 100) -> int:
         """
-        Analyze sentiment for articles that don't have sentiment yet.
+        Analyze sentiment for articles not yet analyzed by the current model.
         
         Args:
             limit: Maximum number of articles to analyze
@@ -52,7 +74,61 @@ class SentimentAnalysisService:
         Returns:
             Number of articles analyzed
         """
-        return self.analyzer.batch_analyze_articles(self.db, limit)
+        if self.worker_pool is None:
+            return self.analyzer.batch_analyze_articles(self.db, limit)
+        
+        # Get articles without sentiment analysis from the current model
+        rows = self.db.query(
+            Article.id,
+            Article.headline,
+            Article.summary,
+            Article.ticker,
+            Article.published_date,
+            Article.bias_label,
+            Article.sentiment_label
+        ).filter(
+            pending_sentiment_filter()
+        ).limit(limit).all()
+        
+        # Split into chunks so every worker gets work and results stream back
+        chunk_size = settings.SENTIMENT_WORKER_CHUNK_SIZE
+        chunks = [rows[start:start + chunk_size] for start in range(0, len(rows), chunk_size)]
+        
+        analyzed_at = datetime.utcnow()
+        version = sentiment_model_version()
+        deltas = DailyCountDeltas()
+        count = 0
+        try:
+            for index, sentiments in self.worker_pool.imap_chunks(
+                [[f"{row.headline} {row.summary}" for row in chunk] for chunk in chunks]
+            ):
+                # One bulk UPDATE per completed chunk, skipping articles the model could not analyze
+                analyzed = []
+                for row, sentiment in zip(chunks[index], sentiments):
+                    if sentiment is None:
+                        continue
+                    analyzed.append({
+                        "id": row.id,
+                        "sentiment_label": sentiment,
+                        "sentiment_analyzed_at": analyzed_at,
+                        "sentiment_model_version": version,
+                    })
+                    deltas[daily_count_key(row)] -= 1
+                    deltas[daily_count_key(row, sentiment_label=sentiment)] += 1
+                if analyzed:
+                    self.db.execute(update(Article), analyzed)
+                count += len(analyzed)
+        except BrokenProcessPool as e:
+            # Keep the chunks that finished, the pool is restarted on next use
+            logger.error(f"Sentiment worker pool failed: {str(e)}")
+            self.worker_pool.shutdown(wait=False)
+        
+        # Commit changes together with the rollup
+        changed_tickers = apply_daily_count_deltas(self.db, deltas)
+        self.db.commit()
+        result_cache.invalidate_tickers(changed_tickers)
+        
+        return count
     
     def get_sentiment_distribution(self, ticker: str, days: int = 7) -> Dict[str, Any]:
         """
@@ -65,62 +141,8 @@ class SentimentAnalysisService:
         Returns:
             Dictionary with sentiment distribution statistics
         """
-        # Calculate date threshold
-        date_threshold = datetime.now() - timedelta(days=days)
-        
-        # Get articles within date range
-        articles = self.db.query(Article).filter(
-            Article.ticker == ticker,
-            Article.published_date >= date_threshold
-        ).all()
-        
-        # Count total articles
-        total_articles = len(articles)
-        
-        if total_articles == 0:
-            return {
-                "ticker": ticker,
-                "total_articles": 0,
-                "bullish_count": 0,
-                "bearish_count": 0,
-                "neutral_count": 0,
-                "bullish_percentage": 0,
-                "bearish_percentage": 0,
-                "neutral_percentage": 0,
-                "days": days,
-                "overall_sentiment": SentimentCategory.NEUTRAL
-            }
-        
-        # Count articles by sentiment category
-        bullish_count = sum(1 for a in articles if a.sentiment_label == SentimentCategory.BULLISH)
-        bearish_count = sum(1 for a in articles if a.sentiment_label == SentimentCategory.BEARISH)
-        neutral_count = sum(1 for a in articles if a.sentiment_label == SentimentCategory.NEUTRAL)
-        
-        # Calculate percentages
-        bullish_percentage = (bullish_count / total_articles) * 100 if total_articles > 0 else 0
-        bearish_percentage = (bearish_count / total_articles) * 100 if total_articles > 0 else 0
-        neutral_percentage = (neutral_count / total_articles) * 100 if total_articles > 0 else 0
-        
-        # Determine overall sentiment
-        overall_sentiment = SentimentCategory.NEUTRAL
-        
-        if bullish_percentage > bearish_percentage + 20:
-            overall_sentiment = SentimentCategory.BULLISH
-        elif bearish_percentage > bullish_percentage + 20:
-            overall_sentiment = SentimentCategory.BEARISH
-        
-        return {
-            "ticker": ticker,
-            "total_articles": total_articles,
-            "bullish_count": bullish_count,
-            "bearish_count": bearish_count,
-            "neutral_count": neutral_count,
-            "bullish_percentage": bullish_percentage,
-            "bearish_percentage": bearish_percentage,
-            "neutral_percentage": neutral_percentage,
-            "days": days,
-            "overall_sentiment": overall_sentiment
-        }
+        # Counts come from one GROUP BY query instead of loading every article
+        return build_sentiment_distribution(ticker, days, count_labels(self.db, ticker, days))
     
     def get_sentiment_summary(self, ticker: str, days: int = 7) -> str:
         """
@@ -133,8 +155,21 @@ class SentimentAnalysisService:
         Returns:
             Summary string
         """
-        distribution = self.get_sentiment_distribution(ticker, days)
+        return self.sentiment_summary_for(ticker, days, self.get_sentiment_distribution(ticker, days))
+    
+    @staticmethod
+    def sentiment_summary_for(ticker: str, days: int, distribution: Dict[str, Any]) -> str:
+        """
+        Build the sentiment summary from an already computed sentiment distribution.
         
+        Args:
+            ticker: Stock ticker symbol
+            days: Number of days included
+            distribution: Sentiment distribution from ``get_sentiment_distribution``
+            
+        Returns:
+            Summary string
+        """
         if distribution["total_articles"] == 0:
             return f"No sentiment data available for {ticker} in the past {days} days."
         
@@ -1,29 +1,63 @@
-from transformers import pipeline
+import torch
 import logging
-from typing import List, Dict, Any, Optional
+import sqlite3
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 
 from app.models.models import Article, Source
 from app.models.schemas import BiasCategory, SentimentCategory
+from app.services.article_store import DailyCountDeltas, daily_count_key, apply_daily_count_deltas
+from app.services.result_cache import result_cache
+from app.services.model_registry import model_registry
+from app.services.sentiment_cache import sentiment_cache, CachedSentiment
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+
+def sentiment_model_version() -> str:
+    """Marker stored on analyzed articles, identifying the model that labeled them."""
+    return f"{settings.SENTIMENT_MODEL_NAME}@{settings.SENTIMENT_MODEL_VERSION}"
+
+
+def pending_sentiment_filter():
+    """
+    Filter for articles not yet analyzed by the current sentiment model.
+    
+    Matches articles that were never analyzed and articles labeled by another
+    model or SENTIMENT_MODEL_VERSION. The version check is written as two ranges
+    rather than ``!=`` so every branch can use ix_articles_sentiment_model_version.
+    """
+    version = sentiment_model_version()
+    return or_(
+        Article.sentiment_model_version.is_(None),
+        Article.sentiment_model_version < version,
+        Article.sentiment_model_version > version
+    )
+
+
 class SentimentAnalyzer:
     """Analyze sentiment of news articles."""
     
     def __init__(self):
-        # Initialize sentiment analysis pipeline
-        try:
-            self.sentiment_pipeline = pipeline(
-                "sentiment-analysis",
-                model=settings.SENTIMENT_MODEL_NAME,
-                tokenizer=settings.SENTIMENT_MODEL_NAME
-            )
-            logger.info(f"Sentiment analysis model {settings.SENTIMENT_MODEL_NAME} loaded successfully")
-        except Exception as e:
-            logger.error(f"Error loading sentiment model: {str(e)}")
-            self.sentiment_pipeline = None
+        # Use the process-wide pipeline unless one is assigned explicitly
+        self._sentiment_pipeline = None
+        self._pipeline_assigned = False
+        self.cache = sentiment_cache if settings.SENTIMENT_CACHE_ENABLED else None
+    
+    @property
+    def sentiment_pipeline(self):
+        """Sentiment analysis pipeline, loaded once per process on first use."""
+        if self._pipeline_assigned:
+            return self._sentiment_pipeline
+        return model_registry.sentiment_pipeline()
+    
+    @sentiment_pipeline.setter
+    def sentiment_pipeline(self, value):
+        self._sentiment_pipeline = value
+        self._pipeline_assigned = True
     
     def analyze_sentiment(self, text: str) -> SentimentCategory:
         """
@@ -35,34 +69,145 @@ class SentimentAnalyzer:
         Returns:
             SentimentCategory enum value
         """
-        if not self.sentiment_pipeline:
+        key = self.cache.key(text) if self.cache is not None else None
+        if key is not None:
+            cached = self._cache_lookup([key]).get(key)
+            if cached:
+                return self._to_category(cached[0])
+                
+        sentiment_pipeline = self.sentiment_pipeline
+        if not sentiment_pipeline:
             logger.warning("Sentiment pipeline not available, returning NEUTRAL")
             return SentimentCategory.NEUTRAL
             
         try:
-            # Truncate text if too long
-            max_length = 512
-            if len(text) > max_length:
-                text = text[:max_length]
-                
-            # Get sentiment prediction
-            result = self.sentiment_pipeline(text)[0]
-            label = result['label']
-            score = result['score']
+            # Get sentiment prediction with the probabilities of every class, truncated
+            # by the tokenizer like the batch path so both store the same result per key
+            scores = sentiment_pipeline(text, truncation=True, top_k=None)
+            label = scores[0]['label']
             
-            # Map FinBERT labels to our sentiment categories
-            # FinBERT typically uses 'positive', 'negative', 'neutral'
-            if label.lower() == 'positive':
-                return SentimentCategory.BULLISH
-            elif label.lower() == 'negative':
-                return SentimentCategory.BEARISH
-            else:
-                return SentimentCategory.NEUTRAL
+            if key is not None:
+                self._cache_store([(key, label, self._probabilities(scores))])
+            return self._to_category(label)
                 
         except Exception as e:
             logger.error(f"Error analyzing sentiment: {str(e)}")
             return SentimentCategory.NEUTRAL
     
+    @staticmethod
+    def _to_category(label: str) -> SentimentCategory:
+        """Map a FinBERT label ('positive', 'negative', 'neutral') to a sentiment category."""
+        if label.lower() == 'positive':
+            return SentimentCategory.BULLISH
+        elif label.lower() == 'negative':
+            return SentimentCategory.BEARISH
+        else:
+            return SentimentCategory.NEUTRAL
+    
+    @staticmethod
+    def _probabilities(scores: List[Dict[str, Any]]) -> Dict[str, float]:
+        """Class probabilities from pipeline output with ``top_k=None``."""
+        return {score['label']: float(score['score']) for score in scores}
+    
+    def _cache_lookup(self, keys: List[str]) -> Dict[str, CachedSentiment]:
+        """Look up cached results, treating cache errors as misses."""
+        try:
+            return self.cache.get_many(keys)
+        except (sqlite3.Error, OSError) as e:
+            logger.error(f"Error reading sentiment cache: {str(e)}")
+            return {}
+    
+    def _cache_store(self, entries: List[Tuple[str, str, Dict[str, float]]]):
+        """Store results in the cache, logging cache errors."""
+        try:
+            self.cache.put_many(entries)
+        except (sqlite3.Error, OSError) as e:
+            logger.error(f"Error writing sentiment cache: {str(e)}")
+    
+    def analyze_sentiments(
+        self,
+        texts: List[str],
+        batch_size: Optional[int] = None,
+        default: Optional[SentimentCategory] = SentimentCategory.NEUTRAL
+    ) -> List[Optional[SentimentCategory]]:
+        """
+        Analyze sentiment of many texts with batched inference.
+        
+        Cached results are used first, and each distinct text that is left runs
+        through the model once. Texts are sorted by token length and split into
+        batches, so each batch is padded only to the length of its longest text.
+        Inputs are truncated by the tokenizer to the model's maximum sequence length.
+        
+        Args:
+            texts: Texts to analyze
+            batch_size: Texts per forward pass (default: SENTIMENT_BATCH_SIZE)
+            default: Result for texts that could not be analyzed
+            
+        Returns:
+            List of SentimentCategory enum values, in the order of texts
+        """
+        results = [default] * len(texts)
+        if not texts:
+            return results
+            
+        # Group positions by cache key (or text) so repeated texts are analyzed once
+        keys = [self.cache.key(text) for text in texts] if self.cache is not None else list(texts)
+        positions: Dict[str, List[int]] = {}
+        for i, key in enumerate(keys):
+            positions.setdefault(key, []).append(i)
+            
+        if self.cache is not None:
+            for key, (label, _) in self._cache_lookup(list(positions)).items():
+                for i in positions.pop(key):
+                    results[i] = self._to_category(label)
+                    
+        if not positions:
+            return results
+            
+        sentiment_pipeline = self.sentiment_pipeline
+        if not sentiment_pipeline:
+            logger.warning("Sentiment pipeline not available, returning NEUTRAL")
+            return results
+            
+        batch_size = batch_size or settings.SENTIMENT_BATCH_SIZE
+        pending = list(positions)
+        pending_texts = [texts[positions[key][0]] for key in pending]
+        
+        # Bucket by token length so batches are padded to similar lengths
+        tokenizer = getattr(sentiment_pipeline, "tokenizer", None)
+        if tokenizer is not None:
+            lengths = [len(ids) for ids in tokenizer(pending_texts, truncation=True)["input_ids"]]
+        else:
+            lengths = [len(text) for text in pending_texts]
+        order = sorted(range(len(pending)), key=lengths.__getitem__)
+        
+        with torch.inference_mode():
+            for start in range(0, len(order), batch_size):
+                batch = order[start:start + batch_size]
+                try:
+                    outputs = sentiment_pipeline(
+                        [pending_texts[j] for j in batch],
+                        batch_size=len(batch),
+                        truncation=True,
+                        top_k=None
+                    )
+                except Exception as e:
+                    logger.error(f"Error analyzing sentiment batch: {str(e)}")
+                    continue
+                    
+                entries = []
+                for j, scores in zip(batch, outputs):
+                    label = scores[0]['label']
+                    for i in positions[pending[j]]:
+                        results[i] = self._to_category(label)
+                    entries.append((pending[j], label, self._probabilities(scores)))
+                    
+                # Store each batch right away so an interrupted run keeps its progress
+                if self.cache is not None:
+                    self._cache_store(entries)
+                    
+        return results
+    
     def analyze_article(self, article: Article) -> SentimentCategory:
         """
         Analyze sentiment of an article.
@@ -79,7 +224,7 @@ class SentimentAnalyzer:
     
     def batch_analyze_articles(self, db: Session, limit: int = 100) -> int:
         """
-        Analyze sentiment for articles that don't have sentiment yet.
+        Analyze sentiment for articles not yet analyzed by the current model.
         
         Args:
             db: Database session
@@ -88,25 +233,37 @@ class SentimentAnalyzer:
         Returns:
             Number of articles analyzed
         """
-        # Get articles without sentiment analysis
-        articles = db.query(Article).filter(
-            Article.sentiment_label == SentimentCategory.NEUTRAL
-        ).limit(limit).all()
+        # Get articles without sentiment analysis from the current model
+        articles = db.query(Article).filter(pending_sentiment_filter()).limit(limit).all()
+        
+        # Combine headline and summary for better context
+        sentiments = self.analyze_sentiments(
+            [f"{article.headline} {article.summary}" for article in articles],
+            default=None
+        )
         
+        analyzed_at = datetime.utcnow()
+        version = sentiment_model_version()
+        deltas = DailyCountDeltas()
         count = 0
-        for article in articles:
-            try:
-                # Analyze sentiment
-                sentiment = self.analyze_article(article)
-                
-                # Update article
-                article.sentiment_label = sentiment
-                count += 1
-                
-            except Exception as e:
-                logger.error(f"Error analyzing article {article.id}: {str(e)}")
+        for article, sentiment in zip(articles, sentiments):
+            # Leave articles the model could not analyze pending for the next run
+            if sentiment is None:
+                continue
+            
+            # Move the article to its new label in the daily count rollup
+            deltas[daily_count_key(article)] -= 1
+            deltas[daily_count_key(article, sentiment_label=sentiment)] += 1
+            
+            # Update article
+            article.sentiment_label = sentiment
+            article.sentiment_analyzed_at = analyzed_at
+            article.sentiment_model_version = version
+            count += 1
         
-        # Commit changes
+        # Commit changes together with the rollup
+        changed_tickers = apply_daily_count_deltas(db, deltas)
         db.commit()
+        result_cache.invalidate_tickers(changed_tickers)
         
         return count
@@ -0,0 +1,199 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import List, Dict, Tuple, Optional, Any
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# (label, class probabilities)
+CachedSentiment = Tuple[str, Dict[str, float]]
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text for cache keys: Unicode NFKC, lowercase, collapsed whitespace."""
+    return " ".join(unicodedata.normalize("NFKC", text or "").lower().split())
+
+
+class SentimentCache:
+    """
+    Persistent cache of sentiment results keyed by content hash.
+
+    Keys are SHA-256 hashes of the normalized text, the model name, the model
+    version and the inference backend, so syndicated copies and re-runs reuse
+    earlier results while a new model, SENTIMENT_MODEL_VERSION or backend starts
+    from an empty cache. Results are stored as the top label plus all class
+    probabilities in a local SQLite file shared by every process on the host.
+
+    Entries older than SENTIMENT_CACHE_MAX_AGE_DAYS are evicted, and the oldest
+    entries beyond SENTIMENT_CACHE_MAX_ENTRIES are dropped, at most once per
+    ``evict_every`` writes.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_entries: Optional[int] = None,
+        max_age_days: Optional[float] = None,
+        evict_every: int = 1000
+    ):
+        self.path = path or settings.SENTIMENT_CACHE_PATH
+        self.max_entries = max_entries or settings.SENTIMENT_CACHE_MAX_ENTRIES
+        self.max_age_seconds = (max_age_days or settings.SENTIMENT_CACHE_MAX_AGE_DAYS) * 86400
+        self.evict_every = evict_every
+
+        self.hits = 0
+        self.misses = 0
+        self._writes_since_evict = 0
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the cache database on first use."""
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS sentiment_cache ("
+                "key TEXT PRIMARY KEY, label TEXT NOT NULL, probabilities TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS ix_sentiment_cache_created_at ON sentiment_cache (created_at)")
+            self._connection = connection
+        return self._connection
+
+    @staticmethod
+    def key(
+        text: str,
+        model_name: Optional[str] = None,
+        model_version: Optional[str] = None,
+        backend: Optional[str] = None
+    ) -> str:
+        """
+        Build the cache key for a text.
+
+        Args:
+            text: Text to analyze
+            model_name: Sentiment model name (default: SENTIMENT_MODEL_NAME)
+            model_version: Sentiment model version (default: SENTIMENT_MODEL_VERSION)
+            backend: Inference backend (default: SENTIMENT_INFERENCE_BACKEND)
+
+        Returns:
+            Hex SHA-256 digest
+        """
+        model_name = model_name or settings.SENTIMENT_MODEL_NAME
+        model_version = model_version or settings.SENTIMENT_MODEL_VERSION
+        backend = backend or settings.SENTIMENT_INFERENCE_BACKEND
+        payload = "\0".join((model_name, model_version, backend, normalize_text(text)))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, CachedSentiment]:
+        """
+        Look up cached results.
+
+        Args:
+            keys: Cache keys from ``key``
+
+        Returns:
+            Dictionary from key to (label, probabilities) for the keys that were found
+        """
+        unique_keys = list(dict.fromkeys(keys))
+        found: Dict[str, CachedSentiment] = {}
+        cutoff = time.time() - self.max_age_seconds
+
+        with self._lock:
+            connection = self._connect()
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(unique_keys), 500):
+                chunk = unique_keys[start:start + 500]
+                rows = connection.execute(
+                    f"SELECT key, label, probabilities FROM sentiment_cache "
+                    f"WHERE created_at >= ? AND key IN ({','.join('?' * len(chunk))})",
+                    [cutoff, *chunk]
+                ).fetchall()
+                for key, label, probabilities in rows:
+                    found[key] = (label, json.loads(probabilities))
+
+            hits = sum(1 for key in keys if key in found)
+            self.hits += hits
+            self.misses += len(keys) - hits
+
+        return found
+
+    def get(self, key: str) -> Optional[CachedSentiment]:
+        """Look up a single cached result."""
+        return self.get_many([key]).get(key)
+
+    def put_many(self, entries: List[Tuple[str, str, Dict[str, float]]]):
+        """
+        Store results.
+
+        Args:
+            entries: (key, label, probabilities) tuples
+        """
+        if not entries:
+            return
+
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            connection.execute("BEGIN")
+            connection.executemany(
+                "INSERT OR REPLACE INTO sentiment_cache (key, label, probabilities, created_at) VALUES (?, ?, ?, ?)",
+                [(key, label, json.dumps(probabilities), now) for key, label, probabilities in entries]
+            )
+            connection.execute("COMMIT")
+
+            self._writes_since_evict += len(entries)
+            if self._writes_since_evict >= self.evict_every:
+                self._evict(connection)
+
+    def put(self, key: str, label: str, probabilities: Dict[str, float]):
+        """Store a single result."""
+        self.put_many([(key, label, probabilities)])
+
+    def _evict(self, connection: sqlite3.Connection):
+        """Drop expired entries and the oldest entries beyond the size bound."""
+        self._writes_since_evict = 0
+        expired = connection.execute(
+            "DELETE FROM sentiment_cache WHERE created_at < ?", (time.time() - self.max_age_seconds,)
+        ).rowcount
+        overflow = connection.execute(
+            "DELETE FROM sentiment_cache WHERE key IN ("
+            "SELECT key FROM sentiment_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        ).rowcount
+        if expired or overflow:
+            logger.info(f"Evicted {expired} expired and {overflow} overflow sentiment cache entries")
+
+    def evict(self):
+        """Run eviction now."""
+        with self._lock:
+            self._evict(self._connect())
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM sentiment_cache").fetchone()[0]
+
+    def metrics(self) -> Dict[str, Any]:
+        """Hit/miss counters since process start and the current number of entries."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": len(self),
+            "max_entries": self.max_entries,
+        }
+
+
+sentiment_cache = SentimentCache()
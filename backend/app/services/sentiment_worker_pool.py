@@ -0,0 +1,107 @@
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Iterator, Tuple, Optional
+
+from app.models.schemas import SentimentCategory
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Per-process analyzer, created by the pool initializer in each worker
+_worker_analyzer = None
+
+
+def _init_worker(threads: int):
+    """Pin torch threads and load one model replica in a worker process."""
+    import torch
+    from app.services.sentiment_analyzer import SentimentAnalyzer
+
+    global _worker_analyzer
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Already set, e.g. when the worker imported a module that ran inference
+        pass
+
+    _worker_analyzer = SentimentAnalyzer()
+    if _worker_analyzer.sentiment_pipeline is None:
+        logger.error(f"Sentiment worker {os.getpid()} could not load the model")
+
+
+def _analyze_chunk(texts: List[str]) -> List[Optional[SentimentCategory]]:
+    """Analyze one chunk of texts in a worker process, None for texts that failed."""
+    return _worker_analyzer.analyze_sentiments(texts, default=None)
+
+
+class SentimentWorkerPool:
+    """
+    Pool of worker processes, each holding one sentiment model replica.
+
+    Workers are started with the ``spawn`` method, so they don't inherit the
+    parent's torch thread pools, and each pins torch to SENTIMENT_WORKER_THREADS
+    intra-op threads, so workers x threads matches the number of cores. The pool
+    is created on first use and closed by ``shutdown``.
+    """
+
+    def __init__(self, workers: Optional[int] = None, threads_per_worker: Optional[int] = None):
+        cpu_count = os.cpu_count() or 1
+        self.workers = workers or settings.SENTIMENT_WORKERS or cpu_count
+        self.threads_per_worker = threads_per_worker or settings.SENTIMENT_WORKER_THREADS or max(1, cpu_count // self.workers)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        """Process pool, started on first use."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.threads_per_worker,)
+                )
+                logger.info(
+                    f"Started sentiment worker pool with {self.workers} workers "
+                    f"x {self.threads_per_worker} torch threads"
+                )
+            return self._executor
+
+    def imap_chunks(self, chunks: List[List[str]]) -> Iterator[Tuple[int, List[SentimentCategory]]]:
+        """
+        Analyze chunks of texts across the workers.
+
+        Args:
+            chunks: Lists of texts, one task per list
+
+        Returns:
+            Iterator of (chunk index, sentiment categories), in completion order
+        """
+        executor = self.executor
+        futures = {executor.submit(_analyze_chunk, chunk): index for index, chunk in enumerate(chunks)}
+        try:
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def shutdown(self, wait: bool = True):
+        """
+        Stop the workers.
+
+        Args:
+            wait: Wait for running chunks to finish; queued chunks are cancelled
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+            logger.info("Sentiment worker pool stopped")
+
+
+sentiment_worker_pool = SentimentWorkerPool()
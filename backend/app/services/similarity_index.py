@@ -0,0 +1,481 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import List, Dict, Tuple, Optional, Iterable, Union
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.models.models import Article
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_FILES = ("vectors.npy", "ids.npy", "assignments.npy", "centroids.npy")
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize rows so inner product equals cosine similarity."""
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Positions of the k highest scores, best first."""
+    if k >= len(scores):
+        return np.argsort(-scores)
+    top = np.argpartition(-scores, k)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+def spherical_kmeans(vectors: np.ndarray, k: int, iterations: int = 10, seed: int = 0) -> np.ndarray:
+    """
+    Cluster normalized vectors by cosine similarity.
+
+    Args:
+        vectors: Normalized float32 vectors, one per row
+        k: Number of clusters
+        iterations: Lloyd iterations
+        seed: Random seed for centroid initialization
+
+    Returns:
+        Normalized centroids of shape (k, dimension)
+    """
+    rng = np.random.RandomState(seed)
+    centroids = vectors[rng.choice(len(vectors), size=k, replace=False)].copy()
+
+    for _ in range(iterations):
+        assignments = np.argmax(vectors @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, vectors)
+        empty = ~sums.any(axis=1)
+        # Re-seed empty clusters with random points
+        sums[empty] = vectors[rng.choice(len(vectors), size=int(empty.sum()))]
+        centroids = _normalize(sums)
+
+    return centroids
+
+
+class _Segment:
+    """Contiguous block of indexed vectors with its inverted lists."""
+
+    def __init__(self, vectors: np.ndarray, ids: np.ndarray, assignments: np.ndarray):
+        self.vectors = vectors
+        self.ids = ids
+        self.assignments = assignments
+        self._lists: Optional[Dict[int, np.ndarray]] = None
+        # Arrays with spare rows beyond len(self), which these arrays are views of
+        self._buffers: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def append(self, vectors: np.ndarray, ids: np.ndarray, assignments: np.ndarray) -> "_Segment":
+        """
+        Segment with rows added at the end.
+
+        Capacity doubles when it runs out, so a run of appends copies each row a
+        constant number of times on average. The new segment takes over the spare
+        capacity; searches still holding this segment keep seeing its rows only.
+        """
+        size, needed = len(self), len(self) + len(ids)
+        buffers = self._buffers
+        if buffers is None or len(buffers[1]) < needed:
+            capacity = max(needed, 2 * size)
+            buffers = tuple(
+                np.empty((capacity,) + array.shape[1:], dtype=array.dtype)
+                for array in (self.vectors, self.ids, self.assignments)
+            )
+            for buffer, array in zip(buffers, (self.vectors, self.ids, self.assignments)):
+                buffer[:size] = array
+
+        for buffer, array in zip(buffers, (vectors, ids, assignments)):
+            buffer[size:needed] = array
+
+        segment = _Segment(*(buffer[:needed] for buffer in buffers))
+        segment._buffers = buffers
+        self._buffers = None
+        return segment
+
+    @property
+    def lists(self) -> Dict[int, Union[slice, np.ndarray]]:
+        """
+        Rows of each cluster, built on first use.
+
+        Segments saved to disk are stored sorted by cluster, so their lists are
+        contiguous slices that can be scored without copying rows.
+        """
+        if self._lists is None:
+            assignments = np.asarray(self.assignments)
+            if np.all(assignments[:-1] <= assignments[1:]):
+                clusters, starts, counts = np.unique(assignments, return_index=True, return_counts=True)
+                self._lists = {
+                    int(cluster): slice(int(start), int(start + count))
+                    for cluster, start, count in zip(clusters, starts, counts)
+                }
+            else:
+                order = np.argsort(assignments, kind="stable")
+                clusters, starts = np.unique(assignments[order], return_index=True)
+                self._lists = {
+                    int(cluster): rows
+                    for cluster, rows in zip(clusters, np.split(order, starts[1:]))
+                }
+        return self._lists
+
+
+class SimilarityIndex:
+    """
+    In-process IVF (inverted file) index over normalized article embeddings.
+
+    Vectors are held in contiguous float32 matrices. Once the index holds enough
+    vectors it is trained with spherical k-means into SIMILARITY_INDEX_NLIST
+    clusters, and a query only scores the vectors in its SIMILARITY_INDEX_NPROBE
+    closest clusters. Until then every query is an exact scan.
+
+    The index lives in a base segment, memory-mapped from SIMILARITY_INDEX_PATH
+    so a restart does not re-read embeddings from the database, plus a small
+    in-memory segment for incremental inserts that ``save`` merges into the base.
+    Files are replaced atomically, and ``sync`` reloads them when another process
+    (the embedding job) has saved a newer index, then tops up from the database.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        nlist: Optional[int] = None,
+        nprobe: Optional[int] = None,
+        refresh_seconds: Optional[float] = None
+    ):
+        self.path = path or settings.SIMILARITY_INDEX_PATH
+        self.nlist = nlist or settings.SIMILARITY_INDEX_NLIST
+        self.nprobe = nprobe or settings.SIMILARITY_INDEX_NPROBE
+        self.refresh_seconds = settings.SIMILARITY_INDEX_REFRESH_SECONDS if refresh_seconds is None else refresh_seconds
+
+        self.centroids: Optional[np.ndarray] = None
+        self._base: Optional[_Segment] = None
+        self._delta: Optional[_Segment] = None
+        self._positions: Dict[int, Tuple[bool, int]] = {}
+        self._max_id = 0
+        self._loaded_version: Optional[str] = None
+        self._synced = False
+        self._checked_at = 0.0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    def _segments(self) -> List[_Segment]:
+        return [segment for segment in (self._base, self._delta) if segment is not None]
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        if self.centroids is None:
+            return np.zeros(len(vectors), dtype=np.int32)
+        return np.argmax(vectors @ self.centroids.T, axis=1).astype(np.int32)
+
+    def _index_positions(self):
+        positions: Dict[int, Tuple[bool, int]] = {}
+        for is_delta, segment in ((False, self._base), (True, self._delta)):
+            if segment is not None:
+                positions.update((int(article_id), (is_delta, row)) for row, article_id in enumerate(segment.ids))
+        self._positions = positions
+        self._max_id = max(positions) if positions else 0
+
+    def add(self, ids: Iterable[int], vectors: np.ndarray) -> int:
+        """
+        Add or replace article vectors.
+
+        Args:
+            ids: Article IDs
+            vectors: Embeddings, one row per ID
+
+        Returns:
+            Number of vectors added
+        """
+        ids = np.asarray(list(ids), dtype=np.int64)
+        if not len(ids):
+            return 0
+        vectors = _normalize(vectors)
+
+        with self._lock:
+            if any(int(article_id) in self._positions for article_id in ids):
+                # Replacing vectors is rare, so rebuild the segments without the old rows
+                self._drop(set(int(article_id) for article_id in ids))
+
+            assignments = self._assign(vectors)
+            offset = 0
+            if self._delta is None:
+                self._delta = _Segment(vectors, ids, assignments)
+            else:
+                offset = len(self._delta)
+                self._delta = self._delta.append(vectors, ids, assignments)
+            self._positions.update((int(article_id), (True, offset + row)) for row, article_id in enumerate(ids))
+            self._max_id = max(self._max_id, int(ids.max()))
+
+            if not self.is_trained and len(self) >= self.nlist * settings.SIMILARITY_INDEX_MIN_POINTS_PER_LIST:
+                self.train()
+
+        return len(ids)
+
+    def _drop(self, ids: set):
+        segments = []
+        for segment in self._segments():
+            keep = ~np.isin(segment.ids, list(ids))
+            if keep.any():
+                segments.append(_Segment(
+                    np.asarray(segment.vectors[keep]), segment.ids[keep], segment.assignments[keep]
+                ))
+        self._base = None
+        self._delta = self._merge(segments)
+        self._index_positions()
+
+    @staticmethod
+    def _merge(segments: List[_Segment]) -> Optional[_Segment]:
+        if not segments:
+            return None
+        if len(segments) == 1:
+            return segments[0]
+        return _Segment(
+            np.concatenate([np.asarray(segment.vectors) for segment in segments]),
+            np.concatenate([segment.ids for segment in segments]),
+            np.concatenate([segment.assignments for segment in segments])
+        )
+
+    def train(self, sample_size: Optional[int] = None):
+        """
+        Cluster the indexed vectors and reassign every vector to its cluster.
+
+        Args:
+            sample_size: Number of vectors to train on (default: 256 per cluster)
+        """
+        with self._lock:
+            merged = self._merge(self._segments())
+            if merged is None or len(merged) < self.nlist:
+                logger.warning(f"Not enough vectors ({len(self)}) to train {self.nlist} clusters")
+                return
+
+            vectors = np.asarray(merged.vectors)
+            sample_size = sample_size or self.nlist * 256
+            rng = np.random.RandomState(0)
+            sample = vectors if len(vectors) <= sample_size else vectors[rng.choice(len(vectors), sample_size, replace=False)]
+
+            started_at = time.monotonic()
+            self.centroids = spherical_kmeans(sample, self.nlist)
+            self._base = None
+            self._delta = _Segment(vectors, merged.ids, self._assign(vectors))
+            self._index_positions()
+            logger.info(f"Trained similarity index with {self.nlist} clusters in {time.monotonic() - started_at:.1f}s")
+
+    def get_vector(self, article_id: int) -> Optional[np.ndarray]:
+        """Get the indexed (normalized) vector of an article."""
+        position = self._positions.get(article_id)
+        if position is None:
+            return None
+        is_delta, row = position
+        segment = self._delta if is_delta else self._base
+        return np.asarray(segment.vectors[row])
+
+    def search(
+        self,
+        vector: np.ndarray,
+        k: int = 10,
+        exclude_ids: Optional[Iterable[int]] = None,
+        nprobe: Optional[int] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Find the approximate k nearest articles by cosine similarity.
+
+        Args:
+            vector: Query embedding
+            k: Number of results
+            exclude_ids: Article IDs to leave out of the results
+            nprobe: Number of clusters to scan (default: SIMILARITY_INDEX_NPROBE)
+
+        Returns:
+            List of (article ID, similarity), most similar first
+        """
+        query = _normalize(np.asarray(vector).reshape(1, -1))[0]
+        segments = self._segments()
+        centroids = self.centroids
+
+        probe = None
+        if centroids is not None:
+            probe = _top_k(centroids @ query, nprobe or self.nprobe)
+
+        candidate_ids = []
+        candidate_scores = []
+        for segment in segments:
+            if probe is None:
+                blocks = [slice(None)]
+            else:
+                lists = segment.lists
+                blocks = [lists[int(cluster)] for cluster in probe if int(cluster) in lists]
+            for block in blocks:
+                candidate_scores.append(np.asarray(segment.vectors[block]) @ query)
+                candidate_ids.append(segment.ids[block])
+
+        return self._best(candidate_ids, candidate_scores, k, exclude_ids)
+
+    def search_exact(
+        self,
+        vector: np.ndarray,
+        k: int = 10,
+        exclude_ids: Optional[Iterable[int]] = None
+    ) -> List[Tuple[int, float]]:
+        """Find the exact k nearest articles by scanning every vector."""
+        query = _normalize(np.asarray(vector).reshape(1, -1))[0]
+        segments = self._segments()
+        return self._best(
+            [segment.ids for segment in segments],
+            [np.asarray(segment.vectors) @ query for segment in segments],
+            k,
+            exclude_ids
+        )
+
+    @staticmethod
+    def _best(
+        candidate_ids: List[np.ndarray],
+        candidate_scores: List[np.ndarray],
+        k: int,
+        exclude_ids: Optional[Iterable[int]]
+    ) -> List[Tuple[int, float]]:
+        if not candidate_ids:
+            return []
+        ids = np.concatenate(candidate_ids)
+        scores = np.concatenate(candidate_scores)
+        if exclude_ids:
+            keep = ~np.isin(ids, list(exclude_ids))
+            ids, scores = ids[keep], scores[keep]
+        top = _top_k(scores, k)
+        return [(int(ids[i]), float(scores[i])) for i in top]
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _disk_version(self) -> Optional[str]:
+        try:
+            with open(self._file("manifest.json")) as manifest:
+                return json.load(manifest)["version"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def save(self):
+        """Merge pending inserts into the base segment and write it to disk atomically."""
+        with self._lock:
+            merged = self._merge(self._segments())
+            if merged is None:
+                return
+
+            # Store rows grouped by cluster so each inverted list is a contiguous slice
+            order = np.argsort(merged.assignments, kind="stable")
+
+            os.makedirs(self.path, exist_ok=True)
+            version = str(time.time_ns())
+            arrays = {
+                "vectors.npy": np.asarray(merged.vectors, dtype=np.float32)[order],
+                "ids.npy": merged.ids[order],
+                "assignments.npy": merged.assignments[order],
+                "centroids.npy": self.centroids if self.centroids is not None else np.empty((0, 0), dtype=np.float32),
+            }
+            for name, array in arrays.items():
+                tmp = self._file(f"{name}.{version}.tmp")
+                with open(tmp, "wb") as f:
+                    np.save(f, array)
+                os.replace(tmp, self._file(name))
+
+            # The manifest is written last so readers never see a half-written index
+            tmp = self._file(f"manifest.json.{version}.tmp")
+            with open(tmp, "w") as f:
+                json.dump({"version": version, "count": len(merged), "nlist": self.nlist}, f)
+            os.replace(tmp, self._file("manifest.json"))
+
+            self._loaded_version = version
+            self._load_files()
+            logger.info(f"Saved similarity index with {len(self)} vectors to {self.path}")
+
+    def load(self) -> bool:
+        """
+        Memory-map a saved index, replacing the in-memory one.
+
+        Returns:
+            True if an index was loaded
+        """
+        with self._lock:
+            version = self._disk_version()
+            if version is None:
+                return False
+            try:
+                self._load_files()
+            except (OSError, ValueError) as e:
+                logger.error(f"Error loading similarity index from {self.path}: {str(e)}")
+                return False
+            self._loaded_version = version
+            logger.info(f"Loaded similarity index with {len(self)} vectors from {self.path}")
+            return True
+
+    def _load_files(self):
+        # Only the vector matrix is memory-mapped, the rest is small
+        vectors = np.load(self._file("vectors.npy"), mmap_mode="r")
+        ids, assignments, centroids = (np.load(self._file(name)) for name in _FILES[1:])
+        self.centroids = centroids if centroids.size else None
+        self._base = _Segment(vectors, ids, assignments)
+        self._delta = None
+        self._index_positions()
+
+    def sync(self, db: Session, force: bool = False) -> int:
+        """
+        Bring the index up to date with the database.
+
+        Reloads the saved index if another process wrote a newer one, then adds
+        embedded articles with IDs above the highest indexed ID. Older articles
+        embedded later reach the index through ``EmbeddingService.embed_pending``
+        and the index it saves. Runs at most
+        every SIMILARITY_INDEX_REFRESH_SECONDS unless ``force`` is set.
+
+        Args:
+            db: Database session
+            force: Skip the refresh throttle
+
+        Returns:
+            Number of vectors added from the database
+        """
+        now = time.monotonic()
+        if not force and self._synced and now - self._checked_at < self.refresh_seconds:
+            return 0
+
+        with self._lock:
+            if not force and self._synced and now - self._checked_at < self.refresh_seconds:
+                return 0
+            self._checked_at = now
+
+            version = self._disk_version()
+            if version is not None and version != self._loaded_version:
+                self.load()
+
+            added = 0
+            while True:
+                rows = db.query(Article.id, Article.embedding_vector).filter(
+                    Article.embedding_vector.isnot(None),
+                    Article.id > self._max_id
+                ).order_by(Article.id).limit(settings.EMBEDDING_CHUNK_SIZE).all()
+                if not rows:
+                    break
+                added += self.add(
+                    [article_id for article_id, _ in rows],
+                    np.asarray([embedding for _, embedding in rows], dtype=np.float32)
+                )
+
+            self._synced = True
+            if added:
+                logger.info(f"Added {added} vectors to the similarity index")
+            return added
+
+
+similarity_index = SimilarityIndex()
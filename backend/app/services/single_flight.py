@@ -0,0 +1,106 @@
+import logging
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    """One in-flight computation and the requests waiting for it."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls into one computation.
+
+    The first caller for a key (the leader) runs the function. Callers that
+    arrive with the same key while it runs wait for it and receive the same
+    result object, or the same exception. Nothing is kept once the call
+    finishes, so later calls run again (``result_cache`` handles reuse over
+    time). Followers share the result, so they must treat it as read-only.
+
+    Works across the threads of one process, which is where FastAPI runs
+    synchronous endpoints.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.leaders = 0
+        self.followers = 0
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run ``fn`` unless an identical call is already in flight, then share its result.
+
+        Args:
+            key: Identifies identical calls
+            fn: Computation to run
+
+        Returns:
+            Result of the leader's call
+        """
+        if not self.enabled:
+            return fn()
+
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+                leader = True
+            else:
+                call.waiters += 1
+                self.followers += 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            # Later callers start a new call, waiting ones read the finished one
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+            if call.waiters:
+                logger.debug(f"Shared one computation of {key} with {call.waiters} concurrent requests")
+
+        return call.result
+
+    def in_flight(self) -> int:
+        """Number of computations currently running."""
+        with self._lock:
+            return len(self._calls)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Computations run and requests that shared one, since process start."""
+        with self._lock:
+            calls = self.leaders + self.followers
+            return {
+                "enabled": self.enabled,
+                "computations": self.leaders,
+                "coalesced_requests": self.followers,
+                "coalesced_rate": round(self.followers / calls, 4) if calls else 0.0,
+                "in_flight": len(self._calls),
+            }
+
+
+# Shared by the result cache misses of every analysis request in this process
+analysis_single_flight = SingleFlight(enabled=settings.ANALYSIS_COALESCE_REQUESTS)
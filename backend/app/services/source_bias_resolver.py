@@ -0,0 +1,174 @@
+import logging
+import re
+import threading
+import time
+from typing import Dict, Optional, Any
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.models import Source
+from app.models.schemas import BiasCategory
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Multi-label public suffixes under which the registrable domain has three labels.
+# A bare public suffix (e.g. "co.uk" or "com") never matches a source on its own.
+MULTI_LABEL_PUBLIC_SUFFIXES = {
+    "co.uk", "org.uk", "ac.uk", "gov.uk", "ltd.uk", "plc.uk",
+    "com.au", "net.au", "org.au",
+    "co.nz", "co.jp", "co.kr", "co.in", "co.za",
+    "com.br", "com.cn", "com.hk", "com.mx", "com.sg", "com.tw",
+}
+
+
+def normalize_domain(value: str) -> str:
+    """
+    Normalize a URL, host or domain to a bare lowercase host without ``www.``.
+
+    Args:
+        value: URL ("https://www.cnbc.com/markets"), host or domain
+
+    Returns:
+        Normalized domain (e.g. "cnbc.com")
+    """
+    domain = (value or "").strip().lower()
+    if "://" in domain:
+        domain = domain.split("://", 1)[1]
+    domain = domain.split("/", 1)[0].split("?", 1)[0]
+    domain = domain.rsplit("@", 1)[-1].split(":", 1)[0].strip(".")
+    if domain.startswith("www."):
+        domain = domain[4:]
+    return domain
+
+
+def registrable_domain(domain: str) -> str:
+    """
+    Get the registrable domain (public suffix plus one label) of a normalized domain.
+
+    Args:
+        domain: Normalized domain (e.g. "money.cnn.com")
+
+    Returns:
+        Registrable domain (e.g. "cnn.com", or "bbc.co.uk" for "news.bbc.co.uk")
+    """
+    labels = domain.split(".")
+    if len(labels) >= 3 and ".".join(labels[-2:]) in MULTI_LABEL_PUBLIC_SUFFIXES:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+
+def _normalize_name(value: str) -> str:
+    """Reduce a publisher name to lowercase alphanumerics ("Seeking Alpha" -> "seekingalpha")."""
+    return re.sub(r"[^a-z0-9]", "", (value or "").lower())
+
+
+class SourceBiasResolver:
+    """
+    In-memory resolver from source domains (or publisher names) to bias ratings.
+
+    The ``sources`` table is loaded into a suffix index keyed by reversed domain
+    ("com.yahoo.finance"), so a lookup walks from the full host towards its
+    registrable domain and costs one dict probe per label, without a database
+    round-trip. Inputs without a dot (Finnhub reports publisher names such as
+    "CNBC") are looked up in an index of normalized source names and brand labels
+    instead; domains never match by brand alone.
+
+    The index is reloaded when a cheap ``count``/``max(updated_at)`` check shows
+    the sources changed, at most every SOURCE_BIAS_REFRESH_SECONDS, or right
+    away after ``invalidate``.
+    """
+
+    def __init__(self, refresh_seconds: Optional[float] = None):
+        self.refresh_seconds = settings.SOURCE_BIAS_REFRESH_SECONDS if refresh_seconds is None else refresh_seconds
+        self._suffix_index: Dict[str, BiasCategory] = {}
+        self._name_index: Dict[str, BiasCategory] = {}
+        self._signature: Any = None
+        self._loaded = False
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        """Force the index to be reloaded on the next lookup."""
+        with self._lock:
+            self._loaded = False
+
+    def _ensure_fresh(self, db: Session):
+        """Reload the index if it was never loaded or the sources table changed."""
+        now = time.monotonic()
+        if self._loaded and now - self._checked_at < self.refresh_seconds:
+            return
+
+        with self._lock:
+            if self._loaded and now - self._checked_at < self.refresh_seconds:
+                return
+
+            signature = db.query(func.count(Source.id), func.max(Source.updated_at)).one()
+            if not self._loaded or signature != self._signature:
+                self._load(db)
+                self._signature = signature
+                self._loaded = True
+            self._checked_at = now
+
+    def _load(self, db: Session):
+        """Build fresh indexes from the sources table and swap them in."""
+        suffix_index: Dict[str, BiasCategory] = {}
+        name_index: Dict[str, BiasCategory] = {}
+
+        for source in db.query(Source).all():
+            domain = normalize_domain(source.domain)
+            if not domain:
+                continue
+            suffix_index[".".join(reversed(domain.split(".")))] = source.bias_rating
+
+            name = _normalize_name(source.name)
+            if name:
+                name_index.setdefault(name, source.bias_rating)
+            brand = registrable_domain(domain).split(".")[0]
+            name_index.setdefault(brand, source.bias_rating)
+
+        self._suffix_index = suffix_index
+        self._name_index = name_index
+        logger.info(f"Loaded bias ratings for {len(suffix_index)} source domains")
+
+    def resolve(self, source_domain: str, db: Session) -> BiasCategory:
+        """
+        Get the bias category for a source domain, URL or publisher name.
+
+        Args:
+            source_domain: Domain, URL or publisher name of the news source
+            db: Database session used only when the index needs (re)loading
+
+        Returns:
+            BiasCategory enum value, UNKNOWN if no source matches
+        """
+        self._ensure_fresh(db)
+        suffix_index = self._suffix_index
+        name_index = self._name_index
+
+        domain = normalize_domain(source_domain)
+        if not domain:
+            return BiasCategory.UNKNOWN
+
+        if "." in domain:
+            reversed_labels = list(reversed(domain.split(".")))
+            min_labels = registrable_domain(domain).count(".") + 1
+
+            # Walk from the full host up to (and including) the registrable domain
+            for length in range(len(reversed_labels), min_labels - 1, -1):
+                bias = suffix_index.get(".".join(reversed_labels[:length]))
+                if bias is not None:
+                    return bias
+        else:
+            # Brand labels only stand in for publisher names: a domain must match a
+            # source's registrable domain, or reuters.example would pass for reuters.com
+            bias = name_index.get(_normalize_name(domain))
+            if bias is not None:
+                return bias
+
+        logger.debug(f"No bias rating found for domain: {domain}")
+        return BiasCategory.UNKNOWN
+
+
+source_bias_resolver = SourceBiasResolver()
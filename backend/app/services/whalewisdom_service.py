@@ -4,16 +4,25 @@ from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 
 from app.core.config import settings
+from app.services.http_client import http_clients
+from app.services.rate_limiter import rate_limiters
 
 logger = logging.getLogger(__name__)
 
 class WhaleWisdomService:
     """Service to fetch data from WhaleWisdom API."""
     
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, client: Optional[httpx.AsyncClient] = None):
         self.api_key = api_key or settings.WHALEWISDOM_API_KEY
         self.base_url = "https://whalewisdom.com/api"
         self.headers = {"Authorization": f"Bearer {self.api_key}"}
+        self._client = client
+        self.rate_limiter = rate_limiters.get("whalewisdom")
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Pooled HTTP client, shared across service instances unless one was injected."""
+        return self._client or http_clients.get("whalewisdom")
         
     async def get_institutional_holdings(
         self, 
@@ -41,15 +50,21 @@ class WhaleWisdomService:
             "limit": 20,
         }
         
+        # Wait for the provider's rate-limit budget
+        if not await self.rate_limiter.acquire():
+            logger.warning("WhaleWisdom rate limit budget exhausted, skipping request")
+            return []
+            
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, headers=self.headers, params=params)
-                response.raise_for_status()
-                data = response.json()
+            response = await self.client.get(url, headers=self.headers, params=params)
+            response.raise_for_status()
+            data = response.json()
                 
-                return data.get("data", [])
+            return data.get("data", [])
                     
         except httpx.HTTPStatusError as e:
+            if e.response.status_code == 429:
+                self.rate_limiter.record_throttled()
             logger.error(f"HTTP error fetching holdings from WhaleWisdom: {str(e)}")
             return []
         except Exception as e:
@@ -84,15 +99,21 @@ class WhaleWisdomService:
             "limit": limit,
         }
         
+        # Wait for the provider's rate-limit budget
+        if not await self.rate_limiter.acquire():
+            logger.warning("WhaleWisdom rate limit budget exhausted, skipping request")
+            return []
+            
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, headers=self.headers, params=params)
-                response.raise_for_status()
-                data = response.json()
+            response = await self.client.get(url, headers=self.headers, params=params)
+            response.raise_for_status()
+            data = response.json()
                 
-                return data.get("data", [])
+            return data.get("data", [])
                     
         except httpx.HTTPStatusError as e:
+            if e.response.status_code == 429:
+                self.rate_limiter.record_throttled()
             logger.error(f"HTTP error fetching insider trading from WhaleWisdom: {str(e)}")
             return []
         except Exception as e:
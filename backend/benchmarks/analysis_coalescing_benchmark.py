@@ -0,0 +1,124 @@
+"""
+Load test ticker analysis under a thundering herd, with and without request coalescing.
+
+Fires ``--requests`` concurrent ticker analysis requests for the same ticker and
+window, each on its own database session and going through
+``ResultCache.get_or_compute`` as the API does, in ``--rounds`` waves. The cache
+is disabled so every wave misses and only request coalescing is measured. Every statement sent to the database is counted, and
+``--query-latency-ms`` adds a delay per statement to stand in for a loaded
+database, which is what lets identical requests overlap. For each mode it
+reports database queries, queries per request and request latency (p50/p95).
+
+The default database is a temporary SQLite file filled with 90 days of rollup
+rows. ``--database-url`` runs against an existing database instead.
+
+Usage (from the backend directory):
+    python -m benchmarks.analysis_coalescing_benchmark --requests 50 --query-latency-ms 20
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+# Add the parent directory to sys.path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.models.models import ArticleDailyCount
+from app.models.schemas import BiasCategory, SentimentCategory
+from app.services.analysis_manager import AnalysisManager
+from app.services.result_cache import ResultCache
+from app.services.single_flight import SingleFlight
+
+
+def create_fixture_database(path, ticker, days):
+    """SQLite database with one rollup row per day and label pair for the ticker."""
+    engine = create_engine(f"sqlite:///{path}")
+    ArticleDailyCount.__table__.create(engine)
+    today = datetime.utcnow().date()
+    rows = [
+        {"ticker": ticker, "day": today - timedelta(days=offset), "bias_label": bias, "sentiment_label": sentiment, "count": 3}
+        for offset in range(days)
+        for bias in BiasCategory
+        for sentiment in SentimentCategory
+    ]
+    with engine.begin() as connection:
+        connection.execute(ArticleDailyCount.__table__.insert(), rows)
+    engine.dispose()
+
+
+def run_herd(session_factory, cache, ticker, days, requests):
+    """Run one wave of concurrent identical requests, returning per-request latencies."""
+    barrier = threading.Barrier(requests)
+
+    def request():
+        db = session_factory()
+        try:
+            barrier.wait()
+            started_at = time.perf_counter()
+            cache.get_or_compute("analysis", [ticker], days, lambda: AnalysisManager(db).analyze_ticker(ticker, days))
+            return time.perf_counter() - started_at
+        finally:
+            db.close()
+
+    with ThreadPoolExecutor(max_workers=requests) as executor:
+        return list(executor.map(lambda _: request(), range(requests)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--ticker", default="TSLA")
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--query-latency-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = args.database_url
+        if database_url is None:
+            path = os.path.join(directory, "analysis.sqlite3")
+            create_fixture_database(path, args.ticker, 90)
+            database_url = f"sqlite:///{path}"
+
+        engine = create_engine(database_url, pool_size=args.requests, max_overflow=0)
+        session_factory = sessionmaker(bind=engine)
+
+        queries = 0
+        lock = threading.Lock()
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def count_query(*_):
+            nonlocal queries
+            with lock:
+                queries += 1
+            time.sleep(args.query_latency_ms / 1000)
+
+        print(f"{args.requests} concurrent requests x {args.rounds} rounds, {args.query_latency_ms:g} ms per query")
+        print(f"{'mode':>12}{'queries':>9}{'per request':>13}{'p50 ms':>9}{'p95 ms':>9}")
+
+        for mode, single_flight in (("independent", SingleFlight(enabled=False)), ("coalesced", SingleFlight())):
+            cache = ResultCache(enabled=False, single_flight=single_flight)
+            queries = 0
+            latencies = []
+            for _ in range(args.rounds):
+                latencies.extend(run_herd(session_factory, cache, args.ticker, args.days, args.requests))
+
+            total = args.requests * args.rounds
+            p50, p95 = np.percentile(latencies, [50, 95]) * 1000
+            print(f"{mode:>12}{queries:>9}{queries / total:>13.2f}{p50:>9.1f}{p95:>9.1f}")
+
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark per-call httpx clients against the shared, pooled provider client.
+
+Starts a local keep-alive HTTP stub server that counts accepted connections, then
+issues the same number of requests with a fresh ``httpx.AsyncClient`` per call (the
+old provider-service behaviour) and with the pooled client from ``http_clients``.
+
+Usage (from the backend directory):
+    python -m benchmarks.http_client_benchmark --requests 500 --concurrency 10
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+# Add the parent directory to sys.path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.services.http_client import HTTPClientRegistry
+
+RESPONSE_BODY = b'{"status": "OK", "results": []}'
+
+
+class StubServer:
+    """Minimal HTTP/1.1 keep-alive server that counts TCP connections."""
+
+    def __init__(self):
+        self.connections = 0
+        self.requests = 0
+        self.server = None
+        self.port = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                self.requests += 1
+                keep_alive = b"connection: close" not in head.lower()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\n"
+                    b"Content-Type: application/json\r\n"
+                    + f"Content-Length: {len(RESPONSE_BODY)}\r\n".encode()
+                    + (b"Connection: keep-alive\r\n" if keep_alive else b"Connection: close\r\n")
+                    + b"\r\n"
+                    + RESPONSE_BODY
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    def reset(self):
+        self.connections = 0
+        self.requests = 0
+
+
+async def _run(label: str, server: StubServer, total: int, concurrency: int, fetch):
+    server.reset()
+    semaphore = asyncio.Semaphore(concurrency)
+    url = f"http://127.0.0.1:{server.port}/v2/reference/news"
+
+    async def one(i: int):
+        async with semaphore:
+            await fetch(url, {"ticker": f"T{i % 50}"})
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"{label:<22} {total / elapsed:>10.1f} req/s  "
+        f"{elapsed * 1000 / total:>8.3f} ms/req  "
+        f"{server.connections:>6} connections"
+    )
+
+
+async def main(total: int, concurrency: int):
+    server = StubServer()
+    await server.start()
+
+    async def per_call_client(url, params):
+        async with httpx.AsyncClient() as client:
+            response = await client.get(url, params=params)
+            response.raise_for_status()
+
+    registry = HTTPClientRegistry()
+
+    async def pooled_client(url, params):
+        response = await registry.get("benchmark").get(url, params=params)
+        response.raise_for_status()
+
+    print(f"{total} requests, concurrency {concurrency}, stub server on port {server.port}")
+    await _run("per-call AsyncClient", server, total, concurrency, per_call_client)
+    await _run("pooled shared client", server, total, concurrency, pooled_client)
+
+    await registry.aclose()
+    await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500, help="Total requests per mode")
+    parser.add_argument("--concurrency", type=int, default=10, help="Concurrent in-flight requests")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.requests, args.concurrency))
@@ -0,0 +1,103 @@
+"""
+Compare sentiment inference backends against the fp32 PyTorch model.
+
+For each backend (pytorch, pytorch_int8, onnx) this loads the model, runs the
+fixed fixture set in benchmarks/fixtures/sentiment_parity.json and reports:
+
+- label agreement with fp32 PyTorch and the largest class-probability difference
+- single-text latency (p50/p95) over the fixtures
+- batched throughput in articles per second
+
+It exits with status 1 if a backend agrees with fp32 on fewer than
+``--min-agreement`` of the fixtures, so it can gate a backend switch.
+
+Usage (from the backend directory):
+    python -m benchmarks.sentiment_backend_benchmark --backends pytorch,pytorch_int8,onnx
+
+``--model`` accepts a Hugging Face model name or a local directory (default:
+SENTIMENT_MODEL_NAME).
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+
+# Add the parent directory to sys.path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.config import settings
+from app.services.model_registry import load_sentiment_pipeline, SENTIMENT_BACKENDS
+
+FIXTURES = Path(__file__).parent / "fixtures" / "sentiment_parity.json"
+
+
+def predict(sentiment_pipeline, texts, batch_size):
+    """Class probabilities for each text, as {label: probability}."""
+    with torch.inference_mode():
+        outputs = sentiment_pipeline(texts, batch_size=batch_size, truncation=True, top_k=None)
+    return [{score["label"].lower(): score["score"] for score in scores} for scores in outputs]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=settings.SENTIMENT_MODEL_NAME)
+    parser.add_argument("--backends", default=",".join(SENTIMENT_BACKENDS))
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--throughput-articles", type=int, default=512)
+    parser.add_argument("--min-agreement", type=float, default=0.98)
+    args = parser.parse_args()
+
+    texts = json.loads(FIXTURES.read_text())
+    backends = args.backends.split(",")
+    if "pytorch" not in backends:
+        backends.insert(0, "pytorch")
+    throughput_texts = (texts * (args.throughput_articles // len(texts) + 1))[:args.throughput_articles]
+
+    print(f"{len(texts)} fixtures, model {args.model}, {torch.get_num_threads()} threads")
+    print(
+        f"{'backend':<14}{'load s':>8}{'agree':>8}{'max diff':>10}"
+        f"{'p50 ms':>9}{'p95 ms':>9}{'articles/s':>12}"
+    )
+
+    reference = None
+    failed = False
+    for backend in backends:
+        started_at = time.perf_counter()
+        sentiment_pipeline = load_sentiment_pipeline(args.model, backend)
+        load_seconds = time.perf_counter() - started_at
+
+        probabilities = predict(sentiment_pipeline, texts, args.batch_size)
+        if reference is None:
+            reference = probabilities
+        labels = [max(p, key=p.get) for p in probabilities]
+        reference_labels = [max(p, key=p.get) for p in reference]
+        agreement = np.mean([a == b for a, b in zip(labels, reference_labels)])
+        max_diff = max(abs(p[label] - r[label]) for p, r in zip(probabilities, reference) for label in r)
+
+        latencies = []
+        for text in texts:
+            started_at = time.perf_counter()
+            predict(sentiment_pipeline, [text], 1)
+            latencies.append((time.perf_counter() - started_at) * 1000)
+
+        started_at = time.perf_counter()
+        predict(sentiment_pipeline, throughput_texts, args.batch_size)
+        throughput = len(throughput_texts) / (time.perf_counter() - started_at)
+
+        print(
+            f"{backend:<14}{load_seconds:>8.1f}{agreement:>8.1%}{max_diff:>10.4f}"
+            f"{np.percentile(latencies, 50):>9.1f}{np.percentile(latencies, 95):>9.1f}{throughput:>12.1f}"
+        )
+        if agreement < args.min_agreement:
+            failed = True
+            print(f"  {backend} agrees with fp32 on less than {args.min_agreement:.0%} of the fixtures")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark batched sentiment inference against one pipeline call per article.
+
+Runs ``SentimentAnalyzer.analyze_sentiments`` over synthetic headline + summary
+texts of mixed lengths at several batch sizes and reports articles per second,
+next to the old per-article ``analyze_sentiment`` loop.
+
+Usage (from the backend directory):
+    python -m benchmarks.sentiment_batch_benchmark --articles 512 --batch-sizes 1,8,16,32,64
+
+``--model`` accepts a Hugging Face model name or a local directory (default:
+SENTIMENT_MODEL_NAME).
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import torch
+from transformers import pipeline
+
+# Add the parent directory to sys.path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.config import settings
+from app.services.sentiment_analyzer import SentimentAnalyzer
+
+HEADLINES = [
+    "Company beats quarterly earnings estimates",
+    "Shares slide after guidance cut",
+    "Regulators open probe into accounting practices",
+    "Board approves expanded share buyback program",
+    "Analysts upgrade stock on strong cloud growth",
+]
+SUMMARY_SENTENCES = [
+    "Revenue rose on higher demand across all regions.",
+    "Margins narrowed as input costs increased.",
+    "Management reiterated its full-year outlook.",
+    "The company expects supply constraints to ease next quarter.",
+    "Investors focused on subscription growth and operating leverage.",
+    "Executives flagged currency headwinds in international markets.",
+]
+
+
+def synthetic_texts(count: int, seed: int = 0):
+    """Headline + summary texts with a realistic spread of lengths."""
+    rng = random.Random(seed)
+    return [
+        f"{rng.choice(HEADLINES)} {' '.join(rng.choice(SUMMARY_SENTENCES) for _ in range(rng.randint(1, 12)))}"
+        for _ in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=settings.SENTIMENT_MODEL_NAME)
+    parser.add_argument("--articles", type=int, default=512)
+    parser.add_argument("--batch-sizes", default="1,8,16,32,64")
+    parser.add_argument("--threads", type=int, default=None, help="torch intra-op threads")
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    analyzer = SentimentAnalyzer()
+    analyzer.sentiment_pipeline = pipeline("sentiment-analysis", model=args.model, tokenizer=args.model)
+    texts = synthetic_texts(args.articles)
+
+    # Warm up so the first measurement doesn't include lazy initialization
+    analyzer.analyze_sentiments(texts[:8], batch_size=8)
+
+    print(f"{args.articles} articles, model {args.model}, {torch.get_num_threads()} threads")
+    print(f"{'mode':<24}{'seconds':>10}{'articles/s':>12}")
+
+    started_at = time.perf_counter()
+    for text in texts:
+        analyzer.analyze_sentiment(text)
+    elapsed = time.perf_counter() - started_at
+    print(f"{'per-article (old)':<24}{elapsed:>10.2f}{len(texts) / elapsed:>12.1f}")
+
+    for batch_size in (int(size) for size in args.batch_sizes.split(",")):
+        started_at = time.perf_counter()
+        analyzer.analyze_sentiments(texts, batch_size=batch_size)
+        elapsed = time.perf_counter() - started_at
+        print(f"{'batched, size ' + str(batch_size):<24}{elapsed:>10.2f}{len(texts) / elapsed:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
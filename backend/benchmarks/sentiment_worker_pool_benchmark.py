@@ -0,0 +1,65 @@
+"""
+Benchmark sentiment throughput of the worker pool at several pool sizes.
+
+For each worker count, starts a ``SentimentWorkerPool`` (one model replica per
+process, CPU cores / workers torch threads each), waits for the models to load,
+then times the same synthetic articles through ``imap_chunks``. Throughput
+should grow close to linearly until workers x threads reaches the core count.
+The result cache is disabled so every article runs through the model.
+
+Usage (from the backend directory):
+    python -m benchmarks.sentiment_worker_pool_benchmark --articles 1024 --workers 1,2,4,8
+
+``--model`` accepts a Hugging Face model name or a local directory (default:
+SENTIMENT_MODEL_NAME).
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add the parent directory to sys.path
+sys.path.append(str(Path(__file__).parent.parent))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=None)
+    parser.add_argument("--articles", type=int, default=1024)
+    parser.add_argument("--workers", default="1,2,4")
+    parser.add_argument("--chunk-size", type=int, default=64)
+    args = parser.parse_args()
+
+    # Spawned workers read their settings from the environment
+    if args.model:
+        os.environ["SENTIMENT_MODEL_NAME"] = args.model
+    os.environ["SENTIMENT_CACHE_ENABLED"] = "false"
+
+    from app.core.config import settings
+    from app.services.sentiment_worker_pool import SentimentWorkerPool
+    from benchmarks.sentiment_batch_benchmark import synthetic_texts
+
+    texts = synthetic_texts(args.articles)
+    chunks = [texts[start:start + args.chunk_size] for start in range(0, len(texts), args.chunk_size)]
+
+    print(f"{args.articles} articles, model {settings.SENTIMENT_MODEL_NAME}, {os.cpu_count()} cores")
+    print(f"{'workers':>8}{'threads':>9}{'seconds':>10}{'articles/s':>12}")
+
+    for workers in (int(count) for count in args.workers.split(",")):
+        pool = SentimentWorkerPool(workers=workers)
+        try:
+            # Load every replica before timing, one warmup chunk per worker
+            list(pool.imap_chunks([texts[:8]] * workers))
+
+            started_at = time.perf_counter()
+            analyzed = sum(len(results) for _, results in pool.imap_chunks(chunks))
+            elapsed = time.perf_counter() - started_at
+        finally:
+            pool.shutdown()
+
+        print(f"{workers:>8}{pool.threads_per_worker:>9}{elapsed:>10.2f}{analyzed / elapsed:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark the IVF similar-article index against exact (brute-force) search.
+
+Builds an index over synthetic clustered embeddings with the dimension of the
+default embedding model, then reports recall@k against exact search and query
+latency for several ``nprobe`` values, plus save and memory-mapped load times.
+
+Usage (from the backend directory):
+    python -m benchmarks.similarity_index_benchmark --vectors 200000 --queries 200
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add the parent directory to sys.path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.services.similarity_index import SimilarityIndex
+
+
+def synthetic_embeddings(count: int, dimension: int, seed: int = 0) -> np.ndarray:
+    """
+    Embeddings with low intrinsic dimension, like sentence embeddings of news.
+
+    Points come from a 32-dimensional latent space projected into ``dimension``
+    plus a little noise, so neighbourhoods are continuous and cross IVF cluster
+    boundaries instead of lining up with them.
+    """
+    rng = np.random.RandomState(seed)
+    latent = rng.normal(size=(count, 32)).astype(np.float32)
+    projection = rng.normal(size=(32, dimension)).astype(np.float32)
+    noise = rng.normal(scale=0.5, size=(count, dimension)).astype(np.float32)
+    return latent @ projection + noise
+
+
+def timed_queries(search, queries: np.ndarray):
+    results, latencies = [], []
+    for query in queries:
+        started_at = time.perf_counter()
+        results.append(search(query))
+        latencies.append((time.perf_counter() - started_at) * 1000)
+    return results, np.array(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vectors", type=int, default=200000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--dimension", type=int, default=384)
+    parser.add_argument("--nlist", type=int, default=256)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    vectors = synthetic_embeddings(args.vectors + args.queries, args.dimension)
+    queries, vectors = vectors[:args.queries], vectors[args.queries:]
+
+    with tempfile.TemporaryDirectory() as path:
+        index = SimilarityIndex(path=path, nlist=args.nlist)
+
+        started_at = time.perf_counter()
+        index.add(range(1, len(vectors) + 1), vectors)
+        if not index.is_trained:
+            index.train()
+        print(f"Built index over {len(index)} x {args.dimension} vectors in {time.perf_counter() - started_at:.2f}s")
+
+        started_at = time.perf_counter()
+        index.save()
+        print(f"Saved in {time.perf_counter() - started_at:.2f}s")
+
+        started_at = time.perf_counter()
+        restored = SimilarityIndex(path=path, nlist=args.nlist)
+        restored.load()
+        print(f"Loaded (memory-mapped) in {(time.perf_counter() - started_at) * 1000:.1f}ms")
+
+        exact, exact_ms = timed_queries(lambda q: restored.search_exact(q, k=args.k), queries)
+        print(f"\n{'search':<16}{'recall@' + str(args.k):>10}{'p50 ms':>10}{'p95 ms':>10}")
+        print(f"{'exact':<16}{1.0:>10.3f}{np.percentile(exact_ms, 50):>10.2f}{np.percentile(exact_ms, 95):>10.2f}")
+
+        for nprobe in (1, 4, 8, 16, 32, 64):
+            approximate, approximate_ms = timed_queries(
+                lambda q: restored.search(q, k=args.k, nprobe=nprobe), queries
+            )
+            recall = np.mean([
+                len({i for i, _ in a} & {i for i, _ in e}) / len(e)
+                for a, e in zip(approximate, exact)
+            ])
+            print(
+                f"{'ivf nprobe=' + str(nprobe):<16}{recall:>10.3f}"
+                f"{np.percentile(approximate_ms, 50):>10.2f}{np.percentile(approximate_ms, 95):>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+import sys
+import os
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Add the parent directory to the path so we can import the app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.article_stats import (
+    count_labels_by_ticker, build_bias_distribution, build_sentiment_distribution
+)
+from app.services.article_store import DailyCountDeltas, daily_count_key, apply_daily_count_deltas
+from app.services.analysis_manager import AnalysisManager
+from app.models.models import ArticleDailyCount
+from app.models.schemas import BiasCategory, SentimentCategory
+
+class TestArticleStats(unittest.TestCase):
+
+    def test_counts_come_from_one_grouped_query(self):
+        mock_db = MagicMock()
+        mock_db.query.return_value.filter.return_value.group_by.return_value.all.return_value = [
+            ("AAPL", BiasCategory.CENTER, SentimentCategory.BULLISH, 4),
+            ("AAPL", BiasCategory.LEFT, SentimentCategory.BULLISH, 1),
+        ]
+
+        counts = count_labels_by_ticker(mock_db, ["AAPL", "MSFT"], days=7)
+
+        # Assert one aggregate query, with empty counts for tickers without articles
+        mock_db.query.assert_called_once()
+        self.assertEqual(counts["AAPL"][(BiasCategory.CENTER, SentimentCategory.BULLISH)], 4)
+        self.assertEqual(counts["MSFT"], Counter())
+
+    def test_distributions_from_counts(self):
+        counts = Counter({
+            (BiasCategory.CENTER, SentimentCategory.BULLISH): 7,
+            (BiasCategory.LEFT, SentimentCategory.BEARISH): 2,
+            (BiasCategory.UNKNOWN, SentimentCategory.NEUTRAL): 1,
+        })
+
+        bias = build_bias_distribution("AAPL", 7, counts)
+        self.assertEqual((bias.total_articles, bias.center_count, bias.unknown_count), (10, 7, 1))
+        self.assertEqual(bias.dominant_bias, BiasCategory.CENTER)
+        self.assertAlmostEqual(bias.left_percentage, 20.0)
+
+        sentiment = build_sentiment_distribution("AAPL", 7, counts)
+        self.assertEqual(sentiment["bullish_count"], 7)
+        self.assertEqual(sentiment["overall_sentiment"], SentimentCategory.BULLISH)
+
+    def test_empty_distributions(self):
+        bias = build_bias_distribution("AAPL", 7, Counter())
+        sentiment = build_sentiment_distribution("AAPL", 7, Counter())
+
+        self.assertEqual(bias.total_articles, 0)
+        self.assertFalse(bias.is_biased)
+        self.assertEqual(sentiment["total_articles"], 0)
+        self.assertEqual(sentiment["overall_sentiment"], SentimentCategory.NEUTRAL)
+
+class TestAnalysisQueries(unittest.TestCase):
+
+    def test_analysis_uses_one_query(self):
+        mock_db = MagicMock()
+        mock_db.query.return_value.filter.return_value.group_by.return_value.all.return_value = [
+            ("AAPL", BiasCategory.RIGHT, SentimentCategory.BEARISH, 8),
+            ("AAPL", BiasCategory.CENTER, SentimentCategory.NEUTRAL, 2),
+        ]
+
+        result = AnalysisManager(mock_db).analyze_ticker("AAPL", days=7)
+
+        # Assert warning and summary were derived from the same counts
+        mock_db.query.assert_called_once()
+        self.assertEqual(result["bias_distribution"].right_count, 8)
+        self.assertEqual(result["sentiment_distribution"]["bearish_count"], 8)
+        self.assertIn("predominantly from", result["diversity_warning"])
+        self.assertIn("predominantly bearish", result["sentiment_summary"])
+        self.assertEqual(
+            set(result),
+            {"ticker", "days", "bias_distribution", "sentiment_distribution", "diversity_warning", "sentiment_summary"}
+        )
+
+    def test_portfolio_uses_one_query(self):
+        mock_db = MagicMock()
+        mock_db.query.return_value.filter.return_value.group_by.return_value.all.return_value = [
+            ("AAPL", BiasCategory.LEFT, SentimentCategory.BULLISH, 9),
+            ("AAPL", BiasCategory.CENTER, SentimentCategory.NEUTRAL, 1),
+            ("MSFT", BiasCategory.CENTER, SentimentCategory.BEARISH, 2),
+            ("MSFT", BiasCategory.RIGHT, SentimentCategory.BEARISH, 2),
+        ]
+
+        result = AnalysisManager(mock_db).get_portfolio_analysis(["AAPL", "MSFT", "TSLA"], days=7)
+
+        # Assert one round-trip for every ticker, including those without articles
+        mock_db.query.assert_called_once()
+        self.assertEqual(set(result["ticker_results"]), {"AAPL", "MSFT", "TSLA"})
+        self.assertEqual(result["ticker_results"]["TSLA"]["bias_distribution"].total_articles, 0)
+
+        aggregate = result["aggregate"]
+        self.assertEqual(aggregate["total_articles"], 14)
+        self.assertEqual(aggregate["bias_distribution"]["center_count"], 3)
+        self.assertEqual(aggregate["sentiment_distribution"]["bearish_count"], 4)
+        self.assertEqual(aggregate["biased_tickers"], ["AAPL"])
+
+class TestDailyCountRollup(unittest.TestCase):
+
+    def setUp(self):
+        # In-memory SQLite database with only the rollup table
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        ArticleDailyCount.__table__.create(engine)
+        self.db = sessionmaker(bind=engine)()
+
+    def tearDown(self):
+        self.db.close()
+
+    def make_article(self, ticker, days_ago, bias=BiasCategory.CENTER, sentiment=SentimentCategory.NEUTRAL):
+        return MagicMock(
+            ticker=ticker,
+            published_date=datetime.utcnow() - timedelta(days=days_ago),
+            bias_label=bias,
+            sentiment_label=sentiment
+        )
+
+    def test_inserts_and_relabels_keep_counts_current(self):
+        articles = [self.make_article("AAPL", 1) for _ in range(3)] + [self.make_article("AAPL", 30)]
+        apply_daily_count_deltas(self.db, Counter(daily_count_key(article) for article in articles))
+        self.db.commit()
+
+        # Relabel one recent article, as the sentiment batch does
+        deltas = DailyCountDeltas()
+        deltas[daily_count_key(articles[0])] -= 1
+        deltas[daily_count_key(articles[0], sentiment_label=SentimentCategory.BULLISH)] += 1
+        apply_daily_count_deltas(self.db, deltas)
+        self.db.commit()
+
+        # Assert the window only sums days inside it and drops labels that reached zero
+        counts = count_labels_by_ticker(self.db, ["AAPL"], days=7)["AAPL"]
+        self.assertEqual(counts, Counter({
+            (BiasCategory.CENTER, SentimentCategory.NEUTRAL): 2,
+            (BiasCategory.CENTER, SentimentCategory.BULLISH): 1,
+        }))
+        self.assertEqual(sum(count_labels_by_ticker(self.db, ["AAPL"], days=90)["AAPL"].values()), 4)
+
+        # Assert the upsert reused the existing rows
+        self.assertEqual(self.db.query(ArticleDailyCount).count(), 3)
+
+    def test_window_is_whole_utc_days(self):
+        class FrozenDatetime(datetime):
+            @classmethod
+            def utcnow(cls):
+                # Shortly after midnight UTC, still the previous day in the Americas
+                return datetime(2025, 4, 18, 0, 30)
+
+        articles = [
+            MagicMock(ticker="AAPL", published_date=datetime(2025, 4, 11, 0, 0)),
+            # 04:30 UTC on April 11
+            MagicMock(ticker="AAPL", published_date=datetime(2025, 4, 10, 23, 30, tzinfo=timezone(timedelta(hours=-5)))),
+            MagicMock(ticker="AAPL", published_date=datetime(2025, 4, 10, 23, 59)),
+        ]
+        for article in articles:
+            article.bias_label, article.sentiment_label = BiasCategory.CENTER, SentimentCategory.NEUTRAL
+        apply_daily_count_deltas(self.db, Counter(daily_count_key(article) for article in articles))
+        self.db.commit()
+
+        with patch('app.services.article_stats.datetime', FrozenDatetime):
+            counts = count_labels_by_ticker(self.db, ["AAPL"], days=7)["AAPL"]
+
+        # Assert the window starts at midnight UTC on April 11, whatever the local time zone
+        self.assertEqual(sum(counts.values()), 2)
+
+if __name__ == '__main__':
+    unittest.main()
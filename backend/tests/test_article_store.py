@@ -0,0 +1,88 @@
+import unittest
+from unittest.mock import MagicMock
+from datetime import datetime
+from sqlalchemy.dialects import postgresql
+import sys
+import os
+
+# Add the parent directory to the path so we can import the app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.article_store import insert_new_articles
+from app.models.schemas import ArticleCreate, BiasCategory, SentimentCategory
+
+def make_article(url):
+    return ArticleCreate(
+        ticker="AAPL",
+        headline="Test Headline",
+        summary="Test Summary",
+        url=url,
+        source="Test Source",
+        bias_label=BiasCategory.CENTER,
+        sentiment_label=SentimentCategory.NEUTRAL,
+        published_date=datetime(2025, 4, 17, 12, 0)
+    )
+
+class TestInsertNewArticles(unittest.TestCase):
+
+    def setUp(self):
+        # Create a mock database session on a dialect without ON CONFLICT support
+        self.mock_db = MagicMock()
+        self.mock_db.get_bind.return_value.dialect.name = "mssql"
+
+    def test_empty_batch(self):
+        result = insert_new_articles(self.mock_db, [])
+
+        # Assert nothing was queried or inserted
+        self.assertEqual(result, [])
+        self.mock_db.query.assert_not_called()
+
+    def test_fallback_skips_existing_urls_with_one_lookup(self):
+        # Configure the IN lookup to report one URL as already stored
+        self.mock_db.query.return_value.filter.return_value.all.return_value = [("https://example.com/a",)]
+
+        result = insert_new_articles(self.mock_db, [
+            make_article("https://example.com/a"),
+            make_article("https://example.com/b"),
+            make_article("https://example.com/b"),
+        ])
+
+        # Assert only the new, de-duplicated article was inserted
+        self.assertEqual([article.url for article in result], ["https://example.com/b"])
+        self.assertEqual(self.mock_db.query.call_count, 1)
+        self.mock_db.add_all.assert_called_once_with(result)
+
+        # Assert the daily count rollup was incremented for the inserted article only
+        self.mock_db.execute.assert_called_once()
+        rollup = self.mock_db.execute.call_args[0][0].compile().params
+        self.assertEqual(rollup["ticker_1"], "AAPL")
+        self.assertEqual(rollup["count_1"], 1)
+
+    def test_upsert_dialect_uses_single_statement(self):
+        self.mock_db.get_bind.return_value.dialect.name = "postgresql"
+        inserted = [MagicMock(
+            ticker="AAPL",
+            published_date=datetime(2025, 4, 17, 12, 0),
+            bias_label=BiasCategory.CENTER,
+            sentiment_label=SentimentCategory.NEUTRAL
+        )]
+        self.mock_db.scalars.return_value = inserted
+
+        result = insert_new_articles(self.mock_db, [make_article("https://example.com/a")])
+
+        # Assert one INSERT ... ON CONFLICT DO NOTHING RETURNING was executed
+        self.assertEqual(result, inserted)
+        self.mock_db.scalars.assert_called_once()
+        compiled = str(self.mock_db.scalars.call_args[0][0].compile(dialect=postgresql.dialect()))
+        self.assertIn("ON CONFLICT (url) DO NOTHING", compiled)
+        self.assertIn("RETURNING", compiled)
+        self.mock_db.query.assert_not_called()
+
+        # Assert the rollup was updated with one upsert in the same session
+        self.mock_db.execute.assert_called_once()
+        rollup = str(self.mock_db.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+        self.assertIn("ON CONFLICT (ticker, day, bias_label, sentiment_label) DO UPDATE", rollup)
+        self.assertIn("count = (article_daily_counts.count + excluded.count)", rollup)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+from unittest.mock import MagicMock
+import tempfile
+import numpy as np
+import sys
+import os
+
+# Add the parent directory to the path so we can import the app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.embedding_service import EmbeddingService
+from app.services.similarity_index import SimilarityIndex
+
+def fake_encode(texts, **kwargs):
+    # One-dimensional "embedding" equal to the text length
+    return np.array([[float(len(text))] for text in texts], dtype=np.float32)
+
+class TestEmbeddingService(unittest.TestCase):
+
+    def setUp(self):
+        # Create a mock database session and encoder
+        self.mock_db = MagicMock()
+        self.mock_model = MagicMock()
+        self.mock_model.encode.side_effect = fake_encode
+        self.service = EmbeddingService(self.mock_db, model=self.mock_model, batch_size=2, chunk_size=2)
+        self.mock_rows = self.mock_db.query.return_value.filter.return_value.order_by.return_value.limit.return_value.all
+
+    def test_embed_texts_sorts_by_length_and_restores_order(self):
+        texts = ["a", "ccc", "bb"]
+
+        embeddings = self.service.embed_texts(texts)
+
+        # Assert the encoder saw the texts longest first
+        self.assertEqual(self.mock_model.encode.call_args[0][0], ["ccc", "bb", "a"])
+        self.assertEqual(self.mock_model.encode.call_args[1]["batch_size"], 2)
+        # Assert the embeddings come back in input order
+        self.assertEqual(embeddings[:, 0].tolist(), [1.0, 3.0, 2.0])
+
+    def test_embed_pending_writes_each_chunk_in_bulk(self):
+        self.mock_rows.side_effect = [
+            [(1, "Headline", "one"), (2, "Headline", "three")],
+            [(5, "Headline", "x")],
+            [],
+        ]
+
+        stats = self.service.embed_pending()
+
+        # Assert one bulk UPDATE and commit per chunk
+        self.assertEqual(stats["embedded"], 3)
+        self.assertEqual(self.mock_db.execute.call_count, 2)
+        self.assertEqual(self.mock_db.commit.call_count, 2)
+        first_chunk = self.mock_db.execute.call_args_list[0][0][1]
+        self.assertEqual(first_chunk, [
+            {"id": 1, "embedding_vector": [12.0]},
+            {"id": 2, "embedding_vector": [14.0]},
+        ])
+        self.assertGreaterEqual(stats["articles_per_second"], 0)
+
+    def test_embed_pending_respects_limit(self):
+        self.mock_rows.side_effect = [[(1, "Headline", "one")]]
+
+        stats = self.service.embed_pending(limit=1)
+
+        # Assert only the requested number of articles was read
+        self.assertEqual(stats["embedded"], 1)
+        self.mock_db.query.return_value.filter.return_value.order_by.return_value.limit.assert_called_once_with(1)
+
+    def test_embed_pending_adds_older_articles_to_the_index(self):
+        with tempfile.TemporaryDirectory() as path:
+            index = SimilarityIndex(path=path, nlist=4, nprobe=4)
+            index.add([10], np.array([[1.0, 0.0]], dtype=np.float32))
+            self.mock_model.encode.side_effect = lambda texts, **kwargs: np.array([[0.0, 1.0]] * len(texts), dtype=np.float32)
+            self.mock_rows.side_effect = [[(3, "Headline", "backlog")], []]
+
+            self.service.embed_pending(index=index)
+
+            # Assert the article below the newest indexed ID is searchable
+            self.assertEqual(index.search(np.array([0.0, 1.0]), k=1)[0][0], 3)
+            self.assertEqual(len(index), 2)
+
+    def test_embed_pending_with_nothing_to_do(self):
+        self.mock_rows.return_value = []
+
+        stats = self.service.embed_pending()
+
+        self.assertEqual(stats["embedded"], 0)
+        self.mock_model.encode.assert_not_called()
+        self.mock_db.commit.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
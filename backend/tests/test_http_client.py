@@ -0,0 +1,72 @@
+import unittest
+from unittest.mock import patch
+import asyncio
+import sys
+import os
+
+import httpx
+
+# Add the parent directory to the path so we can import the app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.http_client import HTTPClientRegistry
+
+class TestHTTPClientRegistry(unittest.TestCase):
+
+    def setUp(self):
+        settings_patcher = patch('app.services.http_client.settings')
+        self.mock_settings = settings_patcher.start()
+        self.mock_settings.HTTP2_ENABLED = False
+        self.mock_settings.HTTP_MAX_CONNECTIONS = 7
+        self.mock_settings.HTTP_MAX_KEEPALIVE_CONNECTIONS = 3
+        self.mock_settings.HTTP_KEEPALIVE_EXPIRY_SECONDS = 30.0
+        self.mock_settings.HTTP_TIMEOUT_SECONDS = 12.0
+        self.mock_settings.HTTP_CONNECT_TIMEOUT_SECONDS = 2.0
+        self.addCleanup(settings_patcher.stop)
+
+        self.registry = HTTPClientRegistry()
+
+    def tearDown(self):
+        asyncio.run(self.registry.aclose())
+
+    def test_one_client_per_provider(self):
+        polygon = self.registry.get("polygon")
+
+        self.assertIs(self.registry.get("polygon"), polygon)
+        self.assertIsNot(self.registry.get("finnhub"), polygon)
+
+    def test_configured_limits_and_timeouts(self):
+        with patch('app.services.http_client.httpx.AsyncClient', wraps=httpx.AsyncClient) as mock_client:
+            client = self.registry.get("polygon")
+
+        _, kwargs = mock_client.call_args
+        self.assertEqual(kwargs["limits"], httpx.Limits(max_connections=7, max_keepalive_connections=3, keepalive_expiry=30.0))
+        self.assertFalse(kwargs["http2"])
+        self.assertEqual(client.timeout, httpx.Timeout(12.0, connect=2.0))
+
+    def test_aclose_closes_clients_and_allows_recreating_them(self):
+        polygon = self.registry.get("polygon")
+        finnhub = self.registry.get("finnhub")
+
+        asyncio.run(self.registry.aclose())
+
+        # Assert every client was closed and the next get builds a fresh one
+        self.assertTrue(polygon.is_closed)
+        self.assertTrue(finnhub.is_closed)
+        recreated = self.registry.get("polygon")
+        self.assertIsNot(recreated, polygon)
+        self.assertFalse(recreated.is_closed)
+
+    def test_http2_without_h2_falls_back_to_http1(self):
+        self.mock_settings.HTTP2_ENABLED = True
+        with patch('app.services.http_client._http2_available', return_value=False):
+            registry = HTTPClientRegistry()
+
+        with patch('app.services.http_client.httpx.AsyncClient', wraps=httpx.AsyncClient) as mock_client:
+            registry.get("polygon")
+
+        self.assertFalse(mock_client.call_args[1]["http2"])
+        asyncio.run(registry.aclose())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import unittest
+from unittest.mock import patch, MagicMock, AsyncMock
+from datetime import datetime
+import asyncio
+import time
+import sys
+import os
+
+import numpy as np
+
+# Add the parent directory to the path so we can import the app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.ingestion_pipeline import IngestionPipeline
+from app.models.schemas import ArticleCreate, BiasCategory, SentimentCategory
+
+def make_article(ticker, n):
+    return ArticleCreate(
+        ticker=ticker,
+        headline=f"{ticker} headline {n}",
+        summary="Summary",
+        url=f"https://example.com/{ticker}/{n}",
+        source="Reuters",
+        bias_label=BiasCategory.CENTER,
+        sentiment_label=SentimentCategory.NEUTRAL,
+        published_date=datetime(2025, 4, 17, 12, 0),
+        provider="polygon"
+    )
+
+class TestIngestionPipeline(unittest.TestCase):
+
+    def setUp(self):
+        # Mock processor: two articles per ticker, stored articles returned as saved
+        self.processor = MagicMock()
+        self.processor.fetch_raw_news = AsyncMock(side_effect=lambda ticker, limit: ({}, {"polygon": [{}, {}]}))
+        self.processor.normalize_news.side_effect = lambda ticker, raw, starts: [make_article(ticker, n) for n in range(2)]
+        self.processor.duplicate_detector.partition.side_effect = lambda db, articles: (articles, [])
+        self.stored = []
+        def store(canonical, duplicates, fetched):
+            self.stored.extend(canonical)
+            return canonical
+        self.processor.store_articles.side_effect = store
+
+        self.analyzer = MagicMock()
+        self.analyzer.analyze_sentiments.side_effect = lambda texts, default: [SentimentCategory.BULLISH] * len(texts)
+        self.embedder = MagicMock()
+        self.embedder.embed_texts.side_effect = lambda texts: np.ones((len(texts), 3), dtype=np.float32)
+
+        patcher = patch('app.services.ingestion_pipeline.filter_unstored_articles', side_effect=lambda db, articles: articles)
+        self.mock_filter = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make_pipeline(self, **kwargs):
+        return IngestionPipeline(
+            self.processor, analyzer=self.analyzer, embedder=self.embedder,
+            embeddings_enabled=True, batch_wait_seconds=0.01, **kwargs
+        )
+
+    def test_articles_are_stored_with_labels_and_embeddings(self):
+        pipeline = self.make_pipeline()
+
+        total = asyncio.run(pipeline.run(["AAPL", "MSFT", "TSLA"]))
+
+        # Assert every new article was labeled and embedded before it was stored
+        self.assertEqual(total, 6)
+        self.assertTrue(all(a.sentiment_label == SentimentCategory.BULLISH for a in self.stored))
+        self.assertTrue(all(a.sentiment_model_version for a in self.stored))
+        self.assertTrue(all(a.embedding_vector == [1.0, 1.0, 1.0] for a in self.stored))
+
+        metrics = pipeline.metrics()
+        self.assertEqual(set(metrics["stages"]), {"fetch", "normalize", "enrich", "persist"})
+        self.assertEqual(metrics["stages"]["persist"]["articles"], 6)
+        self.assertIsNotNone(metrics["fetch_to_stored_seconds"])
+
+    def test_stored_urls_skip_inference(self):
+        self.mock_filter.side_effect = lambda db, articles: articles[:1]
+        pipeline = self.make_pipeline()
+
+        asyncio.run(pipeline.run(["AAPL"]))
+
+        # Assert only the unseen article reached the model, but all advanced the watermark
+        self.assertEqual(len(self.analyzer.analyze_sentiments.call_args[0][0]), 1)
+        canonical, _, fetched = self.processor.store_articles.call_args[0]
+        self.assertEqual((len(canonical), len(fetched)), (1, 2))
+
+    def test_failed_sentiment_leaves_article_pending(self):
+        self.analyzer.analyze_sentiments.side_effect = lambda texts, default: [default] * len(texts)
+        pipeline = self.make_pipeline()
+
+        asyncio.run(pipeline.run(["AAPL"]))
+
+        self.assertTrue(all(a.sentiment_model_version is None for a in self.stored))
+
+    def test_fetch_error_does_not_stop_other_tickers(self):
+        async def fetch(ticker, limit):
+            if ticker == "MSFT":
+                raise RuntimeError("provider down")
+            return {}, {"polygon": [{}, {}]}
+        self.processor.fetch_raw_news = AsyncMock(side_effect=fetch)
+        pipeline = self.make_pipeline()
+
+        total = asyncio.run(pipeline.run(["AAPL", "MSFT", "TSLA"]))
+
+        self.assertEqual(total, 4)
+        self.assertEqual(pipeline.metrics()["stages"]["fetch"]["errors"], 1)
+
+    def test_slow_persist_applies_backpressure(self):
+        def slow_store(canonical, duplicates, fetched):
+            time.sleep(0.02)
+            return canonical
+        self.processor.store_articles.side_effect = slow_store
+        pipeline = self.make_pipeline(queue_size=1, batch_size=2)
+
+        total = asyncio.run(pipeline.run([f"T{i}" for i in range(10)]))
+
+        # Assert every ticker got through while no queue grew past its bound
+        self.assertEqual(total, 20)
+        for stage in pipeline.metrics()["stages"].values():
+            self.assertLessEqual(stage["max_queue_depth"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from datetime import datetime, timedelta
+import sys
+import os
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Add the parent directory to the path so we can import the app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.models import AnalysisJob
+from app.models.schemas import JobStatus
+from app.services.job_queue import enqueue_job, claim_job, renew_lease, complete_job, fail_job, get_job
+from app.services.analysis_worker import AnalysisWorker
+
+class TestJobQueue(unittest.TestCase):
+
+    def setUp(self):
+        # In-memory SQLite database shared by every session
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        AnalysisJob.__table__.create(engine)
+        self.Session = sessionmaker(bind=engine)
+        self.db = self.Session()
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_enqueue_deduplicates_active_jobs(self):
+        job, created = enqueue_job(self.db, "batch_analysis", dedup_key="batch_analysis")
+        again, created_again = enqueue_job(self.db, "batch_analysis", dedup_key="batch_analysis")
+
+        self.assertTrue(created)
+        self.assertFalse(created_again)
+        self.assertEqual(again.id, job.id)
+
+        # Assert a finished job no longer blocks a new one
+        claim_job(self.db, "worker-1")
+        complete_job(self.db, job.id, "worker-1", {"count": 1})
+        _, created_after = enqueue_job(self.db, "batch_analysis", dedup_key="batch_analysis")
+        self.assertTrue(created_after)
+
+    def test_claim_leases_job_once(self):
+        job, _ = enqueue_job(self.db, "batch_analysis")
+
+        claimed = claim_job(self.db, "worker-1")
+        self.assertEqual(claimed.id, job.id)
+        self.assertEqual(claimed.status, JobStatus.RUNNING.value)
+        self.assertEqual(claimed.attempts, 1)
+        self.assertIsNotNone(claimed.lease_expires_at)
+
+        # Assert a running job with a live lease is not handed out again
+        self.assertIsNone(claim_job(self.db, "worker-2"))
+
+    def test_expired_lease_is_taken_over(self):
+        job, _ = enqueue_job(self.db, "batch_analysis")
+        claim_job(self.db, "worker-1")
+        job.lease_expires_at = datetime.utcnow() - timedelta(seconds=1)
+        self.db.commit()
+
+        claimed = claim_job(self.db, "worker-2")
+        self.assertEqual(claimed.worker_id, "worker-2")
+        self.assertEqual(claimed.attempts, 2)
+
+        # Assert the first worker can no longer renew or complete the job
+        self.assertFalse(renew_lease(self.db, job.id, "worker-1", 0.5, "halfway"))
+        self.assertFalse(complete_job(self.db, job.id, "worker-1"))
+        self.assertTrue(renew_lease(self.db, job.id, "worker-2", 0.5, "halfway"))
+        self.assertEqual(get_job(self.db, job.id).progress, 0.5)
+
+    def test_failures_retry_with_backoff_then_fail(self):
+        job, _ = enqueue_job(self.db, "batch_analysis", max_attempts=2)
+
+        claim_job(self.db, "worker-1")
+        self.assertEqual(fail_job(self.db, job.id, "worker-1", "boom"), JobStatus.QUEUED)
+
+        # Assert the retry waits for its backoff
+        self.assertIsNone(claim_job(self.db, "worker-1"))
+        job.run_after = datetime.utcnow() - timedelta(seconds=1)
+        self.db.commit()
+
+        claim_job(self.db, "worker-1")
+        self.assertEqual(fail_job(self.db, job.id, "worker-1", "boom"), JobStatus.FAILED)
+        self.assertEqual(get_job(self.db, job.id).error, "boom")
+
+    def test_worker_runs_handler_and_records_result(self):
+        handler = MagicMock(return_value={"sentiment_updated": 3})
+        job, _ = enqueue_job(self.db, "batch_analysis", payload={"limit": 10})
+
+        worker = AnalysisWorker(worker_id="worker-1", handlers={"batch_analysis": handler}, session_factory=self.Session)
+        self.assertTrue(worker.run_once())
+        self.assertFalse(worker.run_once())
+
+        self.assertEqual(handler.call_args[0][1], {"limit": 10})
+        self.db.expire_all()
+        job = get_job(self.db, job.id)
+        self.assertEqual(job.status, JobStatus.SUCCEEDED.value)
+        self.assertEqual(job.result, {"sentiment_updated": 3})
+        self.assertEqual(job.progress, 1.0)
+
+    def test_worker_requeues_failed_job(self):
+        handler = MagicMock(side_effect=RuntimeError("model not loaded"))
+        job, _ = enqueue_job(self.db, "batch_analysis")
+
+        worker = AnalysisWorker(worker_id="worker-1", handlers={"batch_analysis": handler}, session_factory=self.Session)
+        self.assertTrue(worker.run_once())
+
+        self.db.expire_all()
+        job = get_job(self.db, job.id)
+        self.assertEqual(job.status, JobStatus.QUEUED.value)
+        self.assertIn("model not loaded", job.error)
+
+if __name__ == '__main__':
+    unittest.main()
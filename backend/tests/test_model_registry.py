@@ -0,0 +1,102 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import threading
+import time
+import sys
+import os
+
+# Add the parent directory to the path so we can import the app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.model_registry import ModelRegistry, load_sentiment_pipeline
+from app.services.sentiment_cache import SentimentCache
+from app.services.sentiment_analyzer import SentimentAnalyzer
+
+class TestModelRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = ModelRegistry(retry_seconds=60)
+
+    def test_concurrent_callers_share_one_load(self):
+        model = object()
+        calls = []
+
+        def slow_loader():
+            calls.append(1)
+            time.sleep(0.05)
+            return model
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.registry.get("sentiment", slow_loader)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Assert the model was loaded once and shared by every caller
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(result is model for result in results))
+        self.assertEqual(self.registry.loaded(), ["sentiment"])
+
+    def test_failed_load_is_not_retried_immediately(self):
+        loader = MagicMock(side_effect=OSError("model not found"))
+
+        with self.assertRaises(OSError):
+            self.registry.get("sentiment", loader)
+        with self.assertRaises(RuntimeError):
+            self.registry.get("sentiment", loader)
+
+        self.assertEqual(loader.call_count, 1)
+
+    def test_sentiment_pipeline_returns_none_on_failure(self):
+        with patch('app.services.model_registry.pipeline', side_effect=OSError("model not found")):
+            self.assertIsNone(self.registry.sentiment_pipeline())
+
+    def test_analyzer_construction_does_not_load_model(self):
+        with patch('app.services.model_registry.pipeline') as mock_pipeline, \
+                patch('app.services.sentiment_analyzer.model_registry', self.registry):
+            analyzer = SentimentAnalyzer()
+            mock_pipeline.assert_not_called()
+
+            # The shared pipeline is loaded on first use and reused afterwards
+            self.assertIs(analyzer.sentiment_pipeline, mock_pipeline.return_value)
+            self.assertIs(SentimentAnalyzer().sentiment_pipeline, mock_pipeline.return_value)
+            mock_pipeline.assert_called_once()
+
+class TestSentimentBackends(unittest.TestCase):
+
+    def test_unknown_backend_raises(self):
+        with self.assertRaises(ValueError):
+            load_sentiment_pipeline("ProsusAI/finbert", "tensorrt")
+
+    def test_onnx_falls_back_to_pytorch_without_runtime(self):
+        with patch('app.services.model_registry._onnx_runtime_available', return_value=False), \
+                patch('app.services.model_registry.pipeline') as mock_pipeline:
+            result = load_sentiment_pipeline("ProsusAI/finbert", "onnx")
+
+        self.assertIs(result, mock_pipeline.return_value)
+        mock_pipeline.assert_called_once_with("sentiment-analysis", model="ProsusAI/finbert", tokenizer="ProsusAI/finbert")
+
+    def test_int8_backend_quantizes_linear_layers(self):
+        with patch('app.services.model_registry.AutoTokenizer'), \
+                patch('app.services.model_registry.AutoModelForSequenceClassification') as mock_model_class, \
+                patch('app.services.model_registry.torch.quantization.quantize_dynamic') as mock_quantize, \
+                patch('app.services.model_registry.pipeline') as mock_pipeline:
+            load_sentiment_pipeline("ProsusAI/finbert", "pytorch_int8")
+
+        model = mock_model_class.from_pretrained.return_value.eval.return_value
+        self.assertIs(mock_quantize.call_args[0][0], model)
+        self.assertIs(mock_pipeline.call_args[1]["model"], mock_quantize.return_value)
+
+    def test_cache_key_includes_backend(self):
+        text = "Apple beats earnings estimates"
+        self.assertNotEqual(
+            SentimentCache.key(text, "finbert", "1", "pytorch"),
+            SentimentCache.key(text, "finbert", "1", "pytorch_int8")
+        )
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import unittest
+from unittest.mock import MagicMock
+from datetime import datetime, timedelta
+import sys
+import os
+
+# Add the parent directory to the path so we can import the app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.near_duplicate_detector import NearDuplicateDetector
+from app.models.schemas import ArticleCreate, BiasCategory, SentimentCategory
+
+HEADLINE = "Apple beats quarterly earnings estimates on strong iPhone demand"
+SUMMARY = ("Apple reported quarterly revenue above analyst expectations as iPhone sales "
+           "grew in every region and services revenue reached a record high")
+
+def make_article(url, ticker="AAPL", headline=HEADLINE, summary=SUMMARY, published_date=None):
+    return ArticleCreate(
+        ticker=ticker,
+        headline=headline,
+        summary=summary,
+        url=url,
+        source="Test Source",
+        bias_label=BiasCategory.CENTER,
+        sentiment_label=SentimentCategory.NEUTRAL,
+        published_date=published_date or datetime.utcnow()
+    )
+
+class TestNearDuplicateDetector(unittest.TestCase):
+
+    def setUp(self):
+        self.detector = NearDuplicateDetector(threshold=0.8, window_hours=48, num_perm=128)
+
+        # Create a mock database session with no recent articles to seed from
+        self.mock_db = MagicMock()
+        self.mock_db.query.return_value.filter.return_value.all.return_value = []
+
+    def test_partition_links_cross_provider_copy(self):
+        original = make_article("https://polygon.example.com/a")
+        copy = make_article("https://finnhub.example.com/a", summary=SUMMARY + " on Thursday")
+
+        canonical, duplicates = self.detector.partition(self.mock_db, [original, copy])
+
+        # Assert the second copy was linked to the first
+        self.assertEqual(canonical, [original])
+        self.assertEqual(len(duplicates), 1)
+        duplicate, canonical_url, similarity = duplicates[0]
+        self.assertIs(duplicate, copy)
+        self.assertEqual(canonical_url, original.url)
+        self.assertGreaterEqual(similarity, 0.8)
+
+    def test_different_ticker_is_not_a_duplicate(self):
+        canonical, duplicates = self.detector.partition(self.mock_db, [
+            make_article("https://example.com/a", ticker="AAPL"),
+            make_article("https://example.com/b", ticker="MSFT"),
+        ])
+
+        self.assertEqual(len(canonical), 2)
+        self.assertEqual(duplicates, [])
+
+    def test_unrelated_story_is_not_a_duplicate(self):
+        canonical, duplicates = self.detector.partition(self.mock_db, [
+            make_article("https://example.com/a"),
+            make_article(
+                "https://example.com/b",
+                headline="Apple faces new antitrust lawsuit over App Store fees",
+                summary="Regulators allege the company abused its market position with developers"
+            ),
+        ])
+
+        self.assertEqual(len(canonical), 2)
+        self.assertEqual(duplicates, [])
+
+    def test_same_url_is_not_matched_against_itself(self):
+        article = make_article("https://example.com/a")
+        self.detector.partition(self.mock_db, [article])
+
+        signature = self.detector.signature(f"{article.headline} {article.summary}")
+
+        self.assertIsNone(self.detector.find_duplicate(article.url, signature, article.ticker))
+
+    def test_seeds_from_database_once(self):
+        self.mock_db.query.return_value.filter.return_value.all.return_value = [
+            ("https://example.com/stored", "AAPL", HEADLINE, SUMMARY, datetime.utcnow())
+        ]
+
+        _, duplicates = self.detector.partition(self.mock_db, [make_article("https://example.com/new")])
+        self.detector.partition(self.mock_db, [])
+
+        # Assert the new article matched the stored one and the database was read once
+        self.assertEqual(duplicates[0][1], "https://example.com/stored")
+        self.assertEqual(self.mock_db.query.call_count, 1)
+
+    def test_evicts_articles_outside_window(self):
+        old = make_article("https://example.com/old", published_date=datetime.utcnow() - timedelta(hours=72))
+        self.detector.partition(self.mock_db, [old])
+        self.assertEqual(len(self.detector), 1)
+
+        canonical, duplicates = self.detector.partition(self.mock_db, [make_article("https://example.com/new")])
+
+        # Assert the expired article was dropped before matching
+        self.assertEqual(len(canonical), 1)
+        self.assertEqual(duplicates, [])
+        self.assertEqual(len(self.detector), 1)
+
+    def test_reset_forces_reseed(self):
+        self.detector.partition(self.mock_db, [make_article("https://example.com/a")])
+        self.detector.reset()
+
+        self.assertEqual(len(self.detector), 0)
+        self.detector.partition(self.mock_db, [])
+        self.assertEqual(self.mock_db.query.call_count, 2)
+
+if __name__ == '__main__':
+    unittest.main()
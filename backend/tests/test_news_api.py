@@ -11,6 +11,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.main import app
 from app.api.api_v1.endpoints.news import get_news
+from app.models.schemas import ArticleResponse
 
 class TestNewsAPI(unittest.TestCase):
     
@@ -18,8 +19,8 @@ class TestNewsAPI(unittest.TestCase):
         self.client = TestClient(app)
         
     def test_get_news_endpoint(self):
-        # Mock the get_news_by_ticker function
-        with patch('app.api.api_v1.endpoints.news.get_news_by_ticker') as mock_get_news:
+        # Mock the get_news_page function
+        with patch('app.api.api_v1.endpoints.news.get_news_page') as mock_get_news:
             # Configure mock to return sample articles
             mock_articles = [
                 {
@@ -31,29 +32,49 @@ class TestNewsAPI(unittest.TestCase):
                     "source": "Test Source",
                     "bias_label": "center",
                     "sentiment_label": "bullish",
-                    "published_date": "2025-04-17T12:00:00Z"
+                    "published_date": "2025-04-17T12:00:00Z",
+                    "created_at": "2025-04-17T12:05:00Z"
                 }
             ]
-            mock_get_news.return_value = mock_articles
+            mock_get_news.return_value = (mock_articles, None)
             
             # Make request to the endpoint
             response = self.client.get("/api/v1/news?ticker=AAPL")
             
-            # Assert response status code and content
+            # Assert response status code and content, with no cursor on the last page
             self.assertEqual(response.status_code, 200)
             self.assertEqual(len(response.json()), 1)
             self.assertEqual(response.json()[0]["ticker"], "AAPL")
+            self.assertNotIn("X-Next-Cursor", response.headers)
             
             # Verify mock was called with correct parameters
             mock_get_news.assert_called_once()
             args, kwargs = mock_get_news.call_args
             self.assertEqual(kwargs["ticker"], "AAPL")
             
+    def test_get_news_cursor_pagination(self):
+        # Mock the get_news_page function
+        with patch('app.api.api_v1.endpoints.news.get_news_page') as mock_get_news:
+            mock_get_news.return_value = ([], "next-page")
+            
+            # Make request with the cursor of a previous page
+            response = self.client.get("/api/v1/news?ticker=AAPL&cursor=previous-page")
+            
+            # Assert the cursor was passed through and the next one returned in a header
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.headers["X-Next-Cursor"], "next-page")
+            self.assertEqual(mock_get_news.call_args[1]["cursor"], "previous-page")
+            
+            # Assert a malformed cursor is rejected
+            mock_get_news.side_effect = ValueError("Invalid pagination cursor")
+            response = self.client.get("/api/v1/news?ticker=AAPL&cursor=garbage")
+            self.assertEqual(response.status_code, 400)
+            
     def test_get_news_with_filters(self):
-        # Mock the get_news_by_ticker function
-        with patch('app.api.api_v1.endpoints.news.get_news_by_ticker') as mock_get_news:
+        # Mock the get_news_page function
+        with patch('app.api.api_v1.endpoints.news.get_news_page') as mock_get_news:
             # Configure mock to return sample articles
-            mock_get_news.return_value = []
+            mock_get_news.return_value = ([], None)
             
             # Make request to the endpoint with filters
             response = self.client.get("/api/v1/news?ticker=AAPL&bias=left,center&sentiment=bullish")
@@ -69,23 +90,26 @@ class TestNewsAPI(unittest.TestCase):
             self.assertEqual(kwargs["sentiment_list"], ["bullish"])
             
     def test_get_portfolio_news(self):
-        # Mock the get_news_by_ticker function
-        with patch('app.api.api_v1.endpoints.news.get_news_by_ticker') as mock_get_news:
+        # Mock the get_news_for_tickers function
+        with patch('app.api.api_v1.endpoints.news.get_news_for_tickers') as mock_get_news:
             # Configure mock to return different articles for different tickers
-            def side_effect(db, ticker, *args, **kwargs):
-                return [
-                    {
-                        "id": 1,
-                        "ticker": ticker,
-                        "headline": f"Test Headline for {ticker}",
-                        "summary": "Test Summary",
-                        "url": "https://example.com",
-                        "source": "Test Source",
-                        "bias_label": "center",
-                        "sentiment_label": "bullish",
-                        "published_date": "2025-04-17T12:00:00Z"
-                    }
-                ]
+            def side_effect(db, tickers, *args, **kwargs):
+                return {
+                    ticker: [
+                        {
+                            "id": 1,
+                            "ticker": ticker,
+                            "headline": f"Test Headline for {ticker}",
+                            "summary": "Test Summary",
+                            "url": "https://example.com",
+                            "source": "Test Source",
+                            "bias_label": "center",
+                            "sentiment_label": "bullish",
+                            "published_date": "2025-04-17T12:00:00Z"
+                        }
+                    ]
+                    for ticker in tickers
+                }
             
             mock_get_news.side_effect = side_effect
             
@@ -99,35 +123,80 @@ class TestNewsAPI(unittest.TestCase):
             self.assertEqual(response.json()["AAPL"][0]["ticker"], "AAPL")
             self.assertEqual(response.json()["MSFT"][0]["ticker"], "MSFT")
             
-            # Verify mock was called twice (once for each ticker)
-            self.assertEqual(mock_get_news.call_count, 2)
+            # Verify mock was called once for all tickers
+            mock_get_news.assert_called_once()
+            self.assertEqual(mock_get_news.call_args[0][1], ["AAPL", "MSFT"])
             
     def test_get_trending_news(self):
-        # Mock the get_news_by_ticker function
-        with patch('app.api.api_v1.endpoints.news.get_news_by_ticker') as mock_get_news:
+        # Mock the get_news_for_tickers function
+        with patch('app.api.api_v1.endpoints.news.get_news_for_tickers') as mock_get_news:
             # Configure mock to return sample articles
-            mock_get_news.return_value = [
+            mock_get_news.return_value = {
+                "AAPL": [
+                    ArticleResponse(
+                        id=1,
+                        ticker="AAPL",
+                        headline="Test Headline",
+                        summary="Test Summary",
+                        url="https://example.com",
+                        source="Test Source",
+                        bias_label="center",
+                        sentiment_label="bullish",
+                        published_date="2025-04-17T12:00:00Z",
+                        created_at="2025-04-17T12:05:00Z"
+                    )
+                ],
+                "MSFT": []
+            }
+            
+            # Make request to the trending endpoint
+            response = self.client.get("/api/v1/news/trending")
+            
+            # Assert response status code and content
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.json()), 1)
+            
+            # Verify the newest articles of every ticker came from one call
+            mock_get_news.assert_called_once()
+            
+    def test_get_similar_news(self):
+        # Mock the get_similar_articles function
+        with patch('app.api.api_v1.endpoints.news.get_similar_articles') as mock_get_similar:
+            mock_get_similar.return_value = [
                 {
-                    "id": 1,
+                    "id": 2,
                     "ticker": "AAPL",
-                    "headline": "Test Headline",
+                    "headline": "Related Headline",
                     "summary": "Test Summary",
-                    "url": "https://example.com",
+                    "url": "https://example.com/related",
                     "source": "Test Source",
-                    "bias_label": "center",
+                    "bias_label": "lean_left",
                     "sentiment_label": "bullish",
-                    "published_date": "2025-04-17T12:00:00Z"
+                    "published_date": "2025-04-17T12:00:00Z",
+                    "created_at": "2025-04-17T12:05:00Z",
+                    "similarity": 0.91
                 }
             ]
             
-            # Make request to the trending endpoint
-            response = self.client.get("/api/v1/news/trending")
+            # Make request to the similar articles endpoint
+            response = self.client.get("/api/v1/news/1/similar?limit=5")
             
-            # Assert response status code
+            # Assert response status code and content
             self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()[0]["similarity"], 0.91)
+            
+            # Verify mock was called with correct parameters
+            args, kwargs = mock_get_similar.call_args
+            self.assertEqual(args[1:], (1, 5))
+            
+    def test_get_similar_news_not_found(self):
+        # Mock get_similar_articles to report a missing article
+        with patch('app.api.api_v1.endpoints.news.get_similar_articles') as mock_get_similar:
+            mock_get_similar.return_value = None
+            
+            response = self.client.get("/api/v1/news/999/similar")
             
-            # Verify mock was called at least once
-            mock_get_news.assert_called()
+            self.assertEqual(response.status_code, 404)
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,113 @@
+import unittest
+from unittest.mock import patch
+from datetime import datetime, timedelta, timezone
+import sys
+import os
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Add the parent directory to the path so we can import the app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.news_processor import NewsProcessor, NEWS_PROVIDERS
+from app.models.models import FetchWatermark
+from app.models.schemas import ArticleCreate, BiasCategory, SentimentCategory
+
+def make_article(provider, published_date, ticker="AAPL"):
+    return ArticleCreate(
+        ticker=ticker,
+        headline="Headline",
+        summary="Summary",
+        url=f"https://example.com/{provider}/{published_date.isoformat()}",
+        source="Reuters",
+        bias_label=BiasCategory.CENTER,
+        sentiment_label=SentimentCategory.NEUTRAL,
+        published_date=published_date,
+        provider=provider
+    )
+
+class TestFetchWatermarks(unittest.TestCase):
+
+    def setUp(self):
+        # In-memory SQLite database with only the watermark table
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        FetchWatermark.__table__.create(engine)
+        self.db = sessionmaker(bind=engine)()
+        self.processor = NewsProcessor(self.db)
+
+        settings_patcher = patch('app.services.news_processor.settings')
+        self.mock_settings = settings_patcher.start()
+        self.mock_settings.MAX_NEWS_AGE_DAYS = 7
+        self.mock_settings.NEWS_FETCH_OVERLAP_MINUTES = 30
+        self.addCleanup(settings_patcher.stop)
+
+    def tearDown(self):
+        self.db.close()
+
+    def watermark(self, provider, ticker="AAPL"):
+        return self.db.query(FetchWatermark).filter(
+            FetchWatermark.provider == provider,
+            FetchWatermark.ticker == ticker
+        ).one().last_published_at
+
+    def test_first_fetch_starts_at_max_news_age(self):
+        starts = self.processor._get_fetch_window_starts("AAPL")
+
+        oldest = datetime.now(timezone.utc) - timedelta(days=7)
+        self.assertEqual(set(starts), set(NEWS_PROVIDERS))
+        for start in starts.values():
+            self.assertEqual(start.tzinfo, timezone.utc)
+            self.assertLess(abs(start - oldest), timedelta(minutes=1))
+
+    def test_window_starts_overlap_behind_the_watermark(self):
+        recent = datetime.utcnow().replace(microsecond=0) - timedelta(hours=2)
+        self.db.add(FetchWatermark(provider="polygon", ticker="AAPL", last_published_at=recent))
+        self.db.add(FetchWatermark(provider="finnhub", ticker="AAPL", last_published_at=datetime.utcnow() - timedelta(days=30)))
+        self.db.add(FetchWatermark(provider="financial_datasets", ticker="MSFT", last_published_at=recent))
+        self.db.commit()
+
+        starts = self.processor._get_fetch_window_starts("AAPL")
+
+        # Assert the stored naive UTC watermark comes back aware, minus the overlap
+        self.assertEqual(starts["polygon"], recent.replace(tzinfo=timezone.utc) - timedelta(minutes=30))
+        # Assert a stale watermark is capped at the maximum age, and other tickers' watermarks are ignored
+        oldest = datetime.now(timezone.utc) - timedelta(days=7)
+        self.assertLess(abs(starts["finnhub"] - oldest), timedelta(minutes=1))
+        self.assertLess(abs(starts["financial_datasets"] - oldest), timedelta(minutes=1))
+
+    def test_watermarks_advance_to_newest_article_in_utc(self):
+        self.processor._update_watermarks([
+            make_article("polygon", datetime(2025, 4, 17, 12, 0)),
+            # 13:30 UTC, newer than the naive 12:00 above
+            make_article("polygon", datetime(2025, 4, 17, 9, 30, tzinfo=timezone(timedelta(hours=-4)))),
+            make_article("finnhub", datetime(2025, 4, 17, 8, 0, tzinfo=timezone.utc)),
+        ])
+        self.db.commit()
+
+        # Assert one naive UTC watermark per provider
+        self.assertEqual(self.watermark("polygon"), datetime(2025, 4, 17, 13, 30))
+        self.assertEqual(self.watermark("finnhub"), datetime(2025, 4, 17, 8, 0))
+        self.assertEqual(self.db.query(FetchWatermark).count(), 2)
+
+    def test_watermarks_never_regress(self):
+        self.processor._update_watermarks([make_article("polygon", datetime(2025, 4, 17, 12, 0))])
+        self.db.commit()
+
+        # Late arrivals from the overlap are older than the watermark
+        self.processor._update_watermarks([make_article("polygon", datetime(2025, 4, 17, 11, 45))])
+        self.db.commit()
+        self.assertEqual(self.watermark("polygon"), datetime(2025, 4, 17, 12, 0))
+
+        self.processor._update_watermarks([make_article("polygon", datetime(2025, 4, 17, 12, 5))])
+        self.db.commit()
+        self.assertEqual(self.watermark("polygon"), datetime(2025, 4, 17, 12, 5))
+
+    def test_articles_without_provider_leave_watermarks_alone(self):
+        self.processor._update_watermarks([make_article(None, datetime(2025, 4, 17, 12, 0))])
+
+        self.assertEqual(self.db.query(FetchWatermark).count(), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from datetime import datetime
+import asyncio
+import sys
+import os
+
+# Add the parent directory to the path so we can import the app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.news_scheduler import NewsScheduler
+from app.services.ingestion_pipeline import IngestionPipeline
+from app.models.schemas import ArticleCreate, BiasCategory, SentimentCategory
+from app.core.config import settings
+
+def make_article(ticker):
+    return ArticleCreate(
+        ticker=ticker,
+        headline=f"{ticker} headline",
+        summary="Summary",
+        url=f"https://example.com/{ticker}",
+        source="Reuters",
+        bias_label=BiasCategory.CENTER,
+        sentiment_label=SentimentCategory.NEUTRAL,
+        published_date=datetime(2025, 4, 17, 12, 0),
+        provider="polygon"
+    )
+
+class TestRunFetchCycle(unittest.TestCase):
+
+    def setUp(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.stored = []
+
+        # Stub processor: one article per ticker, fetched with a short delay
+        self.processor = MagicMock()
+        self.processor.fetch_raw_news.side_effect = self.fetch_raw_news
+        self.processor.normalize_news.side_effect = lambda ticker, raw, starts: [make_article(ticker)]
+        self.processor.duplicate_detector.partition.side_effect = lambda db, articles: (articles, [])
+        def store(canonical, duplicates, fetched):
+            self.stored.extend(article.ticker for article in canonical)
+            return canonical
+        self.processor.store_articles.side_effect = store
+        self.failing = set()
+
+        analyzer = MagicMock()
+        analyzer.analyze_sentiments.side_effect = lambda texts, default: [SentimentCategory.BULLISH] * len(texts)
+        patchers = [
+            patch('app.services.news_scheduler.SessionLocal'),
+            patch('app.services.news_scheduler.NewsProcessor', return_value=self.processor),
+            patch('app.services.ingestion_pipeline.SentimentAnalyzer', return_value=analyzer),
+            patch('app.services.ingestion_pipeline.EmbeddingService'),
+            patch('app.services.ingestion_pipeline.filter_unstored_articles', side_effect=lambda db, articles: articles),
+            patch.object(IngestionPipeline, 'save_metrics'),
+            patch.object(settings, 'NEWS_FETCH_CONCURRENCY', 2),
+            patch.object(settings, 'INGESTION_EMBEDDINGS_ENABLED', False),
+            patch.object(settings, 'INGESTION_ENRICH_MAX_WAIT_SECONDS', 0.01),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.scheduler = NewsScheduler()
+        self.addCleanup(self.scheduler.loop.close)
+
+    async def fetch_raw_news(self, ticker, limit):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if ticker in self.failing:
+                raise RuntimeError("provider down")
+            return {}, {"polygon": [{}]}
+        finally:
+            self.in_flight -= 1
+
+    def run_cycle(self, tickers):
+        return self.scheduler.loop.run_until_complete(self.scheduler.run_fetch_cycle(tickers))
+
+    def test_tickers_are_fetched_concurrently_within_the_bound(self):
+        tickers = ["AAPL", "MSFT", "GOOGL", "AMZN", "TSLA", "NVDA"]
+
+        total = self.run_cycle(tickers)
+
+        # Assert tickers overlapped, but never more than NEWS_FETCH_CONCURRENCY at once
+        self.assertEqual(total, 6)
+        self.assertEqual(sorted(self.stored), sorted(tickers))
+        self.assertEqual(self.max_in_flight, 2)
+
+    def test_failing_ticker_does_not_cancel_the_others(self):
+        self.failing = {"AAPL", "AMZN"}
+
+        total = self.run_cycle(["AAPL", "MSFT", "GOOGL", "AMZN", "TSLA"])
+
+        self.assertEqual(total, 3)
+        self.assertEqual(sorted(self.stored), ["GOOGL", "MSFT", "TSLA"])
+        self.assertEqual(self.processor.fetch_raw_news.call_count, 5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+from datetime import datetime, timedelta
+import sys
+import os
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.types import ARRAY
+
+# Add the parent directory to the path so we can import the app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.models import Article
+from app.models.schemas import BiasCategory, SentimentCategory
+from app.services.news_service import get_news_for_tickers, get_news_page, get_news_by_ticker
+
+# SQLite has no ARRAY type; embeddings are not read by these tests
+@compiles(ARRAY, "sqlite")
+def compile_array_sqlite(type_, compiler, **kwargs):
+    return "TEXT"
+
+class NewsServiceTestCase(unittest.TestCase):
+
+    def setUp(self):
+        # In-memory SQLite database with five articles per ticker, one hour apart
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Article.__table__.create(engine)
+        self.db = sessionmaker(bind=engine)()
+
+        published = datetime(2025, 4, 17, 12, 0)
+        for ticker in ("AAPL", "MSFT", "TSLA"):
+            for n in range(5):
+                self.db.add(Article(
+                    ticker=ticker,
+                    headline=f"{ticker} {n}",
+                    summary="Summary",
+                    url=f"https://example.com/{ticker}/{n}",
+                    source="Reuters",
+                    bias_label=BiasCategory.LEFT if n % 2 else BiasCategory.CENTER,
+                    sentiment_label=SentimentCategory.NEUTRAL,
+                    published_date=published + timedelta(hours=n)
+                ))
+        self.db.commit()
+
+        self.statements = []
+        event.listen(engine, "before_cursor_execute", lambda *args: self.statements.append(args[2]))
+
+    def tearDown(self):
+        self.db.close()
+
+class TestNewsForTickers(NewsServiceTestCase):
+
+    def test_newest_articles_per_ticker_in_one_query(self):
+        result = get_news_for_tickers(self.db, ["MSFT", "AAPL", "NVDA", "AAPL"], limit=2)
+
+        # Assert one round-trip, the requested order and an empty list for tickers without articles
+        self.assertEqual(len(self.statements), 1)
+        self.assertIn("row_number() OVER (PARTITION BY articles.ticker", self.statements[0])
+        self.assertEqual(list(result), ["MSFT", "AAPL", "NVDA"])
+        self.assertEqual([a.headline for a in result["MSFT"]], ["MSFT 4", "MSFT 3"])
+        self.assertEqual([a.headline for a in result["AAPL"]], ["AAPL 4", "AAPL 3"])
+        self.assertEqual(result["NVDA"], [])
+
+    def test_filters_apply_before_ranking(self):
+        result = get_news_for_tickers(self.db, ["AAPL", "TSLA"], bias_list=["left"], limit=3)
+
+        # Assert the limit counts matching articles only
+        self.assertEqual([a.headline for a in result["AAPL"]], ["AAPL 3", "AAPL 1"])
+        self.assertTrue(all(a.bias_label == BiasCategory.LEFT for a in result["TSLA"]))
+
+class TestNewsPagination(NewsServiceTestCase):
+
+    def test_cursor_walks_every_article_once_while_new_ones_arrive(self):
+        first_page, cursor = get_news_page(self.db, "AAPL", limit=2)
+
+        # A newer article lands between requests
+        self.db.add(Article(
+            ticker="AAPL", headline="AAPL new", summary="Summary", url="https://example.com/AAPL/new",
+            source="Reuters", bias_label=BiasCategory.CENTER, sentiment_label=SentimentCategory.NEUTRAL,
+            published_date=datetime(2025, 4, 18, 12, 0)
+        ))
+        self.db.commit()
+
+        headlines = [a.headline for a in first_page]
+        while cursor:
+            page, cursor = get_news_page(self.db, "AAPL", limit=2, cursor=cursor)
+            headlines.extend(a.headline for a in page)
+
+        # Assert no article was skipped or repeated, and the last page has no cursor
+        self.assertEqual(headlines, ["AAPL 4", "AAPL 3", "AAPL 2", "AAPL 1", "AAPL 0"])
+
+    def test_offset_still_works(self):
+        articles = get_news_by_ticker(self.db, "AAPL", limit=2, offset=2)
+
+        self.assertEqual([a.headline for a in articles], ["AAPL 2", "AAPL 1"])
+
+    def test_invalid_cursor(self):
+        for cursor in ("garbage", "W10", "eyJpZCI6IDF9"):
+            with self.assertRaises(ValueError):
+                get_news_page(self.db, "AAPL", cursor=cursor)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import asyncio
+import time
+import sys
+import os
+
+# Add the parent directory to the path so we can import the app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.rate_limiter import TokenBucket
+
+class TestTokenBucket(unittest.IsolatedAsyncioTestCase):
+
+    async def test_burst_acquired_without_waiting(self):
+        bucket = TokenBucket("test", rate=1.0, burst=3)
+
+        start = time.monotonic()
+        results = [await bucket.acquire() for _ in range(3)]
+
+        # Assert the whole burst was served immediately
+        self.assertEqual(results, [True, True, True])
+        self.assertLess(time.monotonic() - start, 0.05)
+        self.assertEqual(bucket.delayed, 0)
+
+    async def test_waits_for_refill_at_configured_rate(self):
+        bucket = TokenBucket("test", rate=50.0, burst=1)
+
+        start = time.monotonic()
+        await asyncio.gather(*(bucket.acquire() for _ in range(3)))
+        elapsed = time.monotonic() - start
+
+        # Two tokens beyond the burst at 50/s take ~40ms
+        self.assertGreaterEqual(elapsed, 0.035)
+        self.assertEqual(bucket.acquired, 3)
+        self.assertEqual(bucket.delayed, 2)
+        self.assertGreater(bucket.total_wait_seconds, 0)
+
+    async def test_rejects_when_wait_exceeds_timeout(self):
+        bucket = TokenBucket("test", rate=1.0, burst=1)
+
+        self.assertTrue(await bucket.acquire())
+        self.assertFalse(await bucket.acquire(timeout=0.1))
+
+        # Assert the rejected reservation was returned to the bucket
+        metrics = bucket.metrics()
+        self.assertEqual(metrics["rejected"], 1)
+        self.assertEqual(metrics["acquired"], 1)
+        self.assertFalse(await bucket.acquire(timeout=0.1))
+        self.assertEqual(bucket.rejected, 2)
+
+    async def test_record_throttled(self):
+        bucket = TokenBucket("test", rate=1.0, burst=1)
+        bucket.record_throttled()
+
+        self.assertEqual(bucket.metrics()["throttled"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import sys
+import os
+
+# Add the parent directory to the path so we can import the app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.result_cache import ResultCache, MemoryResultCacheBackend, create_result_cache_backend
+from app.api.api_v1.endpoints.analysis import get_portfolio_analysis
+from app.models.schemas import BiasDistribution, BiasCategory
+
+class TestResultCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = ResultCache(backend=MemoryResultCacheBackend(max_entries=3), ttl_seconds=60, enabled=True)
+
+    def test_hit_after_miss_is_keyed_by_ticker_set_and_days(self):
+        compute = MagicMock(return_value={"total": 1})
+
+        self.cache.get_or_compute("portfolio", ["MSFT", "AAPL"], 7, compute)
+        self.cache.get_or_compute("portfolio", ["AAPL", "MSFT", "AAPL"], 7, compute)
+        self.cache.get_or_compute("portfolio", ["AAPL", "MSFT"], 30, compute)
+
+        # Assert order and repeats share an entry, while another window does not
+        self.assertEqual(compute.call_count, 2)
+        metrics = self.cache.metrics()
+        self.assertEqual((metrics["hits"], metrics["misses"]), (1, 2))
+        self.assertEqual(metrics["endpoints"]["portfolio"]["hits"], 1)
+
+    def test_invalidation_reaches_every_key_with_the_ticker(self):
+        compute = MagicMock(return_value={"total": 1})
+        self.cache.get_or_compute("bias", ["AAPL"], 7, compute)
+        self.cache.get_or_compute("portfolio", ["AAPL", "MSFT"], 7, compute)
+        self.cache.get_or_compute("bias", ["TSLA"], 7, compute)
+
+        self.cache.invalidate_tickers(["AAPL"])
+
+        self.cache.get_or_compute("bias", ["AAPL"], 7, compute)
+        self.cache.get_or_compute("portfolio", ["AAPL", "MSFT"], 7, compute)
+        self.cache.get_or_compute("bias", ["TSLA"], 7, compute)
+
+        # Assert both AAPL results were recomputed and TSLA was still served from the cache
+        self.assertEqual(compute.call_count, 5)
+
+    def test_lru_and_ttl_eviction(self):
+        backend = MemoryResultCacheBackend(max_entries=2)
+        backend.set("a", 1, 60)
+        backend.set("b", 2, 60)
+        backend.get("a")
+        backend.set("c", 3, 60)
+
+        # Assert the least recently used entry was dropped
+        self.assertIsNone(backend.get("b"))
+        self.assertEqual(backend.get("a"), 1)
+
+        with patch('app.services.result_cache.time.monotonic', return_value=10 ** 9):
+            self.assertIsNone(backend.get("a"))
+        self.assertEqual(len(backend), 1)
+
+    def test_results_are_cached_json_encoded(self):
+        distribution = BiasDistribution(ticker="AAPL", total_articles=0, days=7, is_biased=False, dominant_bias=BiasCategory.LEFT)
+
+        first = self.cache.get_or_compute("bias", ["AAPL"], 7, lambda: distribution)
+        second = self.cache.get_or_compute("bias", ["AAPL"], 7, lambda: None)
+
+        self.assertEqual(first, second)
+        self.assertEqual(second["dominant_bias"], "left")
+
+    def test_backend_errors_fall_back_to_computing(self):
+        backend = MagicMock()
+        backend.generations.side_effect = ConnectionError("redis down")
+        cache = ResultCache(backend=backend, ttl_seconds=60, enabled=True)
+
+        self.assertEqual(cache.get_or_compute("bias", ["AAPL"], 7, lambda: {"total": 1}), {"total": 1})
+        cache.invalidate_tickers(["AAPL"])
+        self.assertEqual(cache.metrics()["endpoints"]["bias"]["errors"], 1)
+
+    def test_portfolio_orderings_get_the_same_body(self):
+        with patch('app.api.api_v1.endpoints.analysis.result_cache', self.cache), \
+                patch('app.api.api_v1.endpoints.analysis.AnalysisManager') as mock_manager:
+            mock_manager.return_value.get_portfolio_analysis.side_effect = lambda tickers, days: {"tickers": tickers}
+
+            first = get_portfolio_analysis(tickers="MSFT,AAPL,AAPL", days=7, db=MagicMock())
+            second = get_portfolio_analysis(tickers="AAPL,MSFT", days=7, db=MagicMock())
+
+        # Assert the body does not depend on which request filled the cache
+        self.assertEqual(first, {"tickers": ["AAPL", "MSFT"]})
+        self.assertEqual(second, first)
+        mock_manager.return_value.get_portfolio_analysis.assert_called_once_with(["AAPL", "MSFT"], 7)
+
+    def test_redis_without_package_uses_memory(self):
+        with patch('app.services.result_cache._redis_available', return_value=False):
+            backend = create_result_cache_backend("redis")
+
+        self.assertIsInstance(backend, MemoryResultCacheBackend)
+        with self.assertRaises(ValueError):
+            create_result_cache_backend("memcached")
+
+if __name__ == '__main__':
+    unittest.main()
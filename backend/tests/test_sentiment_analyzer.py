@@ -1,13 +1,14 @@
 import unittest
 from unittest.mock import patch, MagicMock
+from datetime import datetime
 import sys
 import os
 
 # Add the parent directory to the path so we can import the app modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.services.sentiment_analyzer import SentimentAnalyzer
-from app.models.schemas import SentimentCategory
+from app.services.sentiment_analyzer import SentimentAnalyzer, pending_sentiment_filter, sentiment_model_version
+from app.models.schemas import BiasCategory, SentimentCategory
 
 class TestSentimentAnalyzer(unittest.TestCase):
     
@@ -15,13 +16,13 @@ class TestSentimentAnalyzer(unittest.TestCase):
         # Create a mock sentiment pipeline
         self.mock_pipeline = MagicMock()
         
-        # Patch the pipeline initialization
-        with patch('app.services.sentiment_analyzer.pipeline', return_value=self.mock_pipeline):
-            self.sentiment_analyzer = SentimentAnalyzer()
-            
-        # Set the pipeline directly to ensure it's available
+        # Set the pipeline directly instead of loading the shared model
+        self.sentiment_analyzer = SentimentAnalyzer()
         self.sentiment_analyzer.sentiment_pipeline = self.mock_pipeline
         
+        # Disable the persistent result cache
+        self.sentiment_analyzer.cache = None
+        
     def test_analyze_sentiment_bullish(self):
         # Configure mock to return bullish sentiment
         self.mock_pipeline.return_value = [{'label': 'positive', 'score': 0.95}]
@@ -62,9 +63,10 @@ class TestSentimentAnalyzer(unittest.TestCase):
         # Test the method with long text
         result = self.sentiment_analyzer.analyze_sentiment(long_text)
         
-        # Assert the pipeline was called with truncated text
-        args, _ = self.mock_pipeline.call_args
-        self.assertTrue(len(args[0]) <= 512)
+        # Assert the tokenizer truncates the full text, as in the batch path
+        args, kwargs = self.mock_pipeline.call_args
+        self.assertEqual(args[0], long_text)
+        self.assertTrue(kwargs["truncation"])
         
     def test_analyze_sentiment_pipeline_error(self):
         # Configure mock to raise an exception
@@ -104,6 +106,99 @@ class TestSentimentAnalyzer(unittest.TestCase):
         # Assert the pipeline was called with combined headline and summary
         args, _ = self.mock_pipeline.call_args
         self.assertEqual(args[0], "Great quarterly results Company exceeds expectations")
+        
+    def test_analyze_sentiments_batches_by_token_length(self):
+        # Configure the tokenizer to report token lengths equal to word counts
+        self.mock_pipeline.tokenizer.side_effect = lambda texts, **kwargs: {
+            "input_ids": [text.split() for text in texts]
+        }
+        labels = {"short": "positive", "a bit longer": "negative", "the longest text of all": "neutral"}
+        self.mock_pipeline.side_effect = lambda batch, **kwargs: [[{'label': labels[text], 'score': 0.9}] for text in batch]
+        
+        # Test the method with texts of different lengths
+        result = self.sentiment_analyzer.analyze_sentiments(
+            ["the longest text of all", "short", "a bit longer"], batch_size=2
+        )
+        
+        # Assert results come back in input order
+        self.assertEqual(result, [SentimentCategory.NEUTRAL, SentimentCategory.BULLISH, SentimentCategory.BEARISH])
+        
+        # Assert the two shortest texts were batched together, with tokenizer truncation
+        batches = [call[0][0] for call in self.mock_pipeline.call_args_list]
+        self.assertEqual(batches, [["short", "a bit longer"], ["the longest text of all"]])
+        self.assertTrue(self.mock_pipeline.call_args_list[0][1]["truncation"])
+        
+    def test_analyze_sentiments_batch_error(self):
+        # Configure the pipeline to fail
+        self.mock_pipeline.tokenizer.side_effect = lambda texts, **kwargs: {"input_ids": [[0]] * len(texts)}
+        self.mock_pipeline.side_effect = Exception("Test error")
+        
+        result = self.sentiment_analyzer.analyze_sentiments(["Any text", "Other text"])
+        
+        # Assert the failed batch defaults to NEUTRAL
+        self.assertEqual(result, [SentimentCategory.NEUTRAL, SentimentCategory.NEUTRAL])
+        
+    def test_batch_analyze_articles(self):
+        # Configure mock to return bullish sentiment for every article
+        self.mock_pipeline.tokenizer.side_effect = lambda texts, **kwargs: {"input_ids": [[0]] * len(texts)}
+        self.mock_pipeline.side_effect = lambda batch, **kwargs: [[{'label': 'positive', 'score': 0.9}]] * len(batch)
+        
+        # Create a mock database session with two unanalyzed articles
+        mock_db = MagicMock()
+        mock_db.get_bind.return_value.dialect.name = "sqlite"
+        mock_articles = [
+            MagicMock(
+                headline=f"Headline {i}", summary="Summary", ticker="AAPL",
+                published_date=datetime(2025, 4, 17, 12, 0),
+                bias_label=BiasCategory.CENTER, sentiment_label=SentimentCategory.NEUTRAL
+            )
+            for i in range(2)
+        ]
+        mock_db.query.return_value.filter.return_value.limit.return_value.all.return_value = mock_articles
+        
+        # Test the method
+        count = self.sentiment_analyzer.batch_analyze_articles(mock_db, limit=10)
+        
+        # Assert every article was updated in a single pipeline call and committed
+        self.assertEqual(count, 2)
+        self.assertTrue(all(a.sentiment_label == SentimentCategory.BULLISH for a in mock_articles))
+        self.assertEqual(self.mock_pipeline.call_count, 1)
+        mock_db.commit.assert_called_once()
+        
+        # Assert the articles were marked as analyzed by the current model
+        self.assertTrue(all(a.sentiment_model_version == sentiment_model_version() for a in mock_articles))
+        self.assertTrue(all(a.sentiment_analyzed_at is not None for a in mock_articles))
+
+        # Assert both articles moved from neutral to bullish in the daily count rollup
+        mock_db.execute.assert_called_once()
+        rollup = mock_db.execute.call_args[0][0].compile().params
+        self.assertEqual(
+            {(rollup[f"sentiment_label_m{i}"], rollup[f"count_m{i}"]) for i in range(2)},
+            {(SentimentCategory.BULLISH, 2), (SentimentCategory.NEUTRAL, -2)}
+        )
+        
+    def test_batch_analyze_articles_leaves_failures_pending(self):
+        # Configure the pipeline to fail
+        self.mock_pipeline.tokenizer.side_effect = lambda texts, **kwargs: {"input_ids": [[0]] * len(texts)}
+        self.mock_pipeline.side_effect = Exception("Test error")
+        
+        mock_db = MagicMock()
+        mock_article = MagicMock(headline="Headline", summary="Summary", sentiment_model_version=None)
+        mock_db.query.return_value.filter.return_value.limit.return_value.all.return_value = [mock_article]
+        
+        count = self.sentiment_analyzer.batch_analyze_articles(mock_db, limit=10)
+        
+        # Assert the article was not marked, so the next run picks it up again
+        self.assertEqual(count, 0)
+        self.assertIsNone(mock_article.sentiment_model_version)
+        
+    def test_pending_filter_matches_unanalyzed_and_stale_articles(self):
+        sql = str(pending_sentiment_filter().compile(compile_kwargs={"literal_binds": True}))
+        
+        # Assert neutral articles are no longer selected by label
+        self.assertNotIn("sentiment_label", sql)
+        self.assertIn("articles.sentiment_model_version IS NULL", sql)
+        self.assertIn(f"articles.sentiment_model_version < '{sentiment_model_version()}'", sql)
 
 if __name__ == '__main__':
     unittest.main()
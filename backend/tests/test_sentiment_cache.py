@@ -0,0 +1,102 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import os
+import tempfile
+import sys
+
+# Add the parent directory to the path so we can import the app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.sentiment_cache import SentimentCache
+from app.services.sentiment_analyzer import SentimentAnalyzer
+from app.models.schemas import SentimentCategory
+
+PROBABILITIES = {'positive': 0.8, 'neutral': 0.15, 'negative': 0.05}
+
+class TestSentimentCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = SentimentCache(path=os.path.join(self.tmpdir.name, "cache.sqlite3"), max_entries=3, max_age_days=1)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_key_normalizes_text_and_includes_model(self):
+        key = SentimentCache.key("Apple  beats\nEstimates", "finbert", "1")
+
+        # Assert whitespace and case differences share a key, other models don't
+        self.assertEqual(key, SentimentCache.key("apple beats estimates", "finbert", "1"))
+        self.assertNotEqual(key, SentimentCache.key("apple beats estimates", "finbert", "2"))
+        self.assertNotEqual(key, SentimentCache.key("apple beats estimates", "other-model", "1"))
+
+    def test_put_and_get_with_metrics(self):
+        self.cache.put("a", "positive", PROBABILITIES)
+
+        self.assertEqual(self.cache.get("a"), ("positive", PROBABILITIES))
+        self.assertIsNone(self.cache.get("b"))
+
+        metrics = self.cache.metrics()
+        self.assertEqual((metrics["hits"], metrics["misses"], metrics["entries"]), (1, 1, 1))
+        self.assertEqual(metrics["hit_rate"], 0.5)
+
+    def test_evicts_oldest_entries_beyond_max_entries(self):
+        with patch('app.services.sentiment_cache.time.time', side_effect=[100.0, 101.0, 102.0, 103.0, 104.0]):
+            for key in ("a", "b", "c", "d"):
+                self.cache.put(key, "neutral", PROBABILITIES)
+            self.cache.evict()
+
+        self.assertEqual(len(self.cache), 3)
+        self.assertIsNone(self.cache.get("a"))
+
+    def test_expired_entries_are_misses(self):
+        with patch('app.services.sentiment_cache.time.time', return_value=0.0):
+            self.cache.put("a", "neutral", PROBABILITIES)
+
+        self.assertIsNone(self.cache.get("a"))
+        self.cache.evict()
+        self.assertEqual(len(self.cache), 0)
+
+class TestSentimentAnalyzerCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.mock_pipeline = MagicMock()
+        self.mock_pipeline.tokenizer.side_effect = lambda texts, **kwargs: {"input_ids": [[0]] * len(texts)}
+        self.mock_pipeline.side_effect = lambda batch, **kwargs: [
+            [{'label': 'positive', 'score': 0.8}, {'label': 'negative', 'score': 0.2}] for _ in batch
+        ]
+
+        self.analyzer = SentimentAnalyzer()
+        self.analyzer.sentiment_pipeline = self.mock_pipeline
+        self.analyzer.cache = SentimentCache(path=os.path.join(self.tmpdir.name, "cache.sqlite3"))
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_batch_analyzes_each_distinct_text_once(self):
+        texts = ["Apple beats estimates", "apple  beats estimates", "Apple beats estimates"]
+
+        result = self.analyzer.analyze_sentiments(texts)
+
+        # Assert normalized duplicates went through the model once
+        self.assertEqual(result, [SentimentCategory.BULLISH] * 3)
+        self.assertEqual(self.mock_pipeline.call_count, 1)
+        self.assertEqual(len(self.mock_pipeline.call_args[0][0]), 1)
+        self.assertEqual(self.mock_pipeline.call_args[1]["top_k"], None)
+
+    def test_cached_results_skip_inference(self):
+        self.analyzer.analyze_sentiments(["Apple beats estimates"])
+        self.mock_pipeline.reset_mock()
+
+        # Assert both the batch and single-text paths are served from the cache
+        self.assertEqual(self.analyzer.analyze_sentiments(["Apple beats estimates"]), [SentimentCategory.BULLISH])
+        self.assertEqual(self.analyzer.analyze_sentiment("Apple beats estimates"), SentimentCategory.BULLISH)
+        self.mock_pipeline.assert_not_called()
+
+        # Assert the class probabilities were stored
+        cached = self.analyzer.cache.get(self.analyzer.cache.key("Apple beats estimates"))
+        self.assertEqual(cached, ("positive", {'positive': 0.8, 'negative': 0.2}))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from types import SimpleNamespace
+import sys
+import os
+
+# Add the parent directory to the path so we can import the app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.sentiment_analysis_service import SentimentAnalysisService
+from app.models.schemas import BiasCategory, SentimentCategory
+
+class TestWorkerPoolDispatch(unittest.TestCase):
+
+    def setUp(self):
+        # Create a mock database session with three unanalyzed articles
+        self.mock_db = MagicMock()
+        self.mock_db.get_bind.return_value.dialect.name = "sqlite"
+        self.mock_db.query.return_value.filter.return_value.limit.return_value.all.return_value = [
+            SimpleNamespace(
+                id=i, headline=f"Headline {i}", summary="Summary", ticker="AAPL",
+                published_date=datetime(2025, 4, 17, 12, 0),
+                bias_label=BiasCategory.CENTER, sentiment_label=SentimentCategory.NEUTRAL
+            )
+            for i in (1, 2, 3)
+        ]
+        self.mock_pool = MagicMock()
+        self.service = SentimentAnalysisService(self.mock_db, worker_pool=self.mock_pool)
+
+    def test_results_written_back_per_completed_chunk(self):
+        # Return the second chunk first, as a faster worker would
+        self.mock_pool.imap_chunks.return_value = iter([
+            (1, [SentimentCategory.BEARISH]),
+            (0, [SentimentCategory.BULLISH, None]),
+        ])
+
+        with patch('app.services.sentiment_analysis_service.settings') as mock_settings:
+            mock_settings.SENTIMENT_WORKER_CHUNK_SIZE = 2
+            count = self.service.batch_analyze_articles(limit=10)
+
+        # Assert texts were split into chunks for the workers
+        chunks = self.mock_pool.imap_chunks.call_args[0][0]
+        self.assertEqual(chunks, [["Headline 1 Summary", "Headline 2 Summary"], ["Headline 3 Summary"]])
+
+        # Assert one bulk UPDATE per chunk, matched back to the right articles,
+        # and the article the model failed on was left pending
+        self.assertEqual(count, 2)
+        *updates, rollup = [call[0] for call in self.mock_db.execute.call_args_list]
+        updates = [args[1] for args in updates]
+        self.assertEqual(
+            [[(row["id"], row["sentiment_label"]) for row in rows] for rows in updates],
+            [[(3, SentimentCategory.BEARISH)], [(1, SentimentCategory.BULLISH)]]
+        )
+        self.assertTrue(all(row["sentiment_model_version"] and row["sentiment_analyzed_at"] for rows in updates for row in rows))
+        self.mock_db.commit.assert_called_once()
+
+        # Assert the rollup moved the two analyzed articles with one upsert before the commit
+        params = rollup[0].compile().params
+        self.assertEqual(
+            {(params[f"sentiment_label_m{i}"], params[f"count_m{i}"]) for i in range(3)},
+            {(SentimentCategory.BEARISH, 1), (SentimentCategory.BULLISH, 1), (SentimentCategory.NEUTRAL, -2)}
+        )
+
+    def test_broken_pool_keeps_finished_chunks(self):
+        def results(chunks):
+            yield 0, [SentimentCategory.BULLISH] * len(chunks[0])
+            raise BrokenProcessPool("worker died")
+
+        self.mock_pool.imap_chunks.side_effect = results
+
+        with patch('app.services.sentiment_analysis_service.settings') as mock_settings:
+            mock_settings.SENTIMENT_WORKER_CHUNK_SIZE = 2
+            count = self.service.batch_analyze_articles(limit=10)
+
+        # Assert the finished chunk was committed and the pool was reset
+        self.assertEqual(count, 2)
+        self.mock_db.commit.assert_called_once()
+        self.mock_pool.shutdown.assert_called_once_with(wait=False)
+
+    def test_without_pool_runs_in_process(self):
+        service = SentimentAnalysisService(self.mock_db, worker_pool=None)
+        service.worker_pool = None
+        service.analyzer = MagicMock()
+        service.analyzer.batch_analyze_articles.return_value = 5
+
+        self.assertEqual(service.batch_analyze_articles(limit=10), 5)
+        service.analyzer.batch_analyze_articles.assert_called_once_with(self.mock_db, 10)
+
+if __name__ == '__main__':
+    unittest.main()
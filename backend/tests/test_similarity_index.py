@@ -0,0 +1,118 @@
+import unittest
+from unittest.mock import MagicMock
+import tempfile
+import numpy as np
+import sys
+import os
+
+# Add the parent directory to the path so we can import the app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.similarity_index import SimilarityIndex
+
+def random_vectors(count, dimension=16, seed=0):
+    return np.random.RandomState(seed).normal(size=(count, dimension)).astype(np.float32)
+
+class TestSimilarityIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.index = SimilarityIndex(path=self.tmpdir.name, nlist=4, nprobe=4, refresh_seconds=60)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_search_before_training_is_exact(self):
+        vectors = random_vectors(20)
+        self.index.add(range(1, 21), vectors)
+
+        results = self.index.search(vectors[4], k=3)
+
+        # Assert the article is its own nearest neighbour with cosine similarity 1
+        self.assertFalse(self.index.is_trained)
+        self.assertEqual(results[0][0], 5)
+        self.assertAlmostEqual(results[0][1], 1.0, places=5)
+        self.assertEqual(results, self.index.search_exact(vectors[4], k=3))
+
+    def test_exclude_ids(self):
+        vectors = random_vectors(10)
+        self.index.add(range(1, 11), vectors)
+
+        results = self.index.search(vectors[0], k=3, exclude_ids=[1])
+
+        self.assertNotIn(1, [article_id for article_id, _ in results])
+        self.assertEqual(len(results), 3)
+
+    def test_trained_search_probing_all_clusters_matches_exact(self):
+        vectors = random_vectors(400)
+        self.index.add(range(1, 401), vectors)
+        self.index.train()
+
+        query = random_vectors(1, seed=1)[0]
+
+        self.assertTrue(self.index.is_trained)
+        self.assertEqual(self.index.search(query, k=5), self.index.search_exact(query, k=5))
+
+    def test_save_and_load_round_trip(self):
+        vectors = random_vectors(400)
+        self.index.add(range(1, 401), vectors)
+        self.index.train()
+        self.index.save()
+
+        restored = SimilarityIndex(path=self.tmpdir.name, nlist=4, nprobe=4)
+
+        # Assert the restored index is memory-mapped and answers like the original
+        self.assertTrue(restored.load())
+        self.assertEqual(len(restored), 400)
+        self.assertIsInstance(restored._base.vectors, np.memmap)
+        self.assertEqual(restored.search(vectors[7], k=5), self.index.search(vectors[7], k=5))
+        np.testing.assert_allclose(restored.get_vector(8), self.index.get_vector(8), rtol=1e-6)
+
+    def test_incremental_add_after_load(self):
+        self.index.add(range(1, 11), random_vectors(10))
+        self.index.save()
+
+        new_vector = random_vectors(1, seed=2)
+        self.index.add([11], new_vector)
+
+        self.assertEqual(len(self.index), 11)
+        self.assertEqual(self.index.search(new_vector[0], k=1)[0][0], 11)
+
+    def test_add_replaces_existing_vector(self):
+        vectors = random_vectors(10)
+        self.index.add(range(1, 11), vectors)
+
+        self.index.add([3], vectors[:1])
+
+        self.assertEqual(len(self.index), 10)
+        np.testing.assert_allclose(self.index.get_vector(3), self.index.get_vector(1), rtol=1e-6)
+
+    def test_repeated_adds_grow_the_delta_geometrically(self):
+        vectors = random_vectors(100)
+        for article_id in range(1, 101):
+            self.index.add([article_id], vectors[article_id - 1:article_id])
+
+        # Assert every row landed in place and spare capacity stayed within a doubling
+        self.assertEqual(len(self.index._delta), 100)
+        self.assertLess(len(self.index._delta._buffers[1]), 200)
+        np.testing.assert_allclose(self.index.get_vector(42), vectors[41] / np.linalg.norm(vectors[41]), rtol=1e-6)
+        self.assertEqual(self.index.search(vectors[99], k=1)[0][0], 100)
+
+    def test_sync_adds_new_embeddings_from_database(self):
+        mock_db = MagicMock()
+        mock_rows = mock_db.query.return_value.filter.return_value.order_by.return_value.limit.return_value.all
+        mock_rows.side_effect = [
+            [(1, [1.0, 0.0]), (2, [0.0, 1.0])],
+            [],
+        ]
+
+        added = self.index.sync(mock_db)
+
+        self.assertEqual(added, 2)
+        self.assertEqual(len(self.index), 2)
+        # Assert a second sync within the refresh interval does not query again
+        self.assertEqual(self.index.sync(mock_db), 0)
+        self.assertEqual(mock_db.query.call_count, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+import unittest
+from unittest.mock import MagicMock
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+import sys
+import os
+
+# Add the parent directory to the path so we can import the app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.single_flight import SingleFlight
+from app.services.result_cache import ResultCache, MemoryResultCacheBackend
+from app.services.analysis_manager import AnalysisManager
+from app.models.schemas import BiasCategory, SentimentCategory
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+class TestSingleFlight(unittest.TestCase):
+
+    def setUp(self):
+        self.single_flight = SingleFlight()
+        self.release = threading.Event()
+        self.calls = 0
+
+    def slow_compute(self):
+        self.calls += 1
+        self.release.wait(5)
+        return {"calls": self.calls}
+
+    def run_concurrently(self, requests, fn):
+        with ThreadPoolExecutor(max_workers=requests) as executor:
+            futures = [executor.submit(fn) for _ in range(requests)]
+            # Release the leader once every other request is waiting on it
+            wait_for(lambda: self.single_flight.followers == requests - 1)
+            self.release.set()
+            return futures
+
+    def test_concurrent_identical_calls_share_one_computation(self):
+        futures = self.run_concurrently(10, lambda: self.single_flight.do(("analyze_ticker", "TSLA", 7), self.slow_compute))
+        results = [future.result() for future in futures]
+
+        # Assert one computation, and every caller got the same result object
+        self.assertEqual(self.calls, 1)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(self.single_flight.metrics()["coalesced_requests"], 9)
+        self.assertEqual(self.single_flight.in_flight(), 0)
+
+        # Assert a later call computes again
+        self.assertEqual(self.single_flight.do(("analyze_ticker", "TSLA", 7), lambda: "fresh"), "fresh")
+
+    def test_different_keys_run_separately(self):
+        self.release.set()
+        self.single_flight.do(("analyze_ticker", "TSLA", 7), self.slow_compute)
+        self.single_flight.do(("analyze_ticker", "TSLA", 30), self.slow_compute)
+
+        self.assertEqual(self.calls, 2)
+
+    def test_errors_reach_every_waiting_caller(self):
+        def failing_compute():
+            self.release.wait(5)
+            raise RuntimeError("database unavailable")
+
+        futures = self.run_concurrently(5, lambda: self.single_flight.do("key", failing_compute))
+
+        for future in futures:
+            with self.assertRaises(RuntimeError):
+                future.result()
+        self.assertEqual(self.single_flight.in_flight(), 0)
+
+class TestAnalysisCoalescing(unittest.TestCase):
+
+    def test_thundering_herd_runs_one_query(self):
+        single_flight = SingleFlight()
+        release = threading.Event()
+        requests = 20
+
+        # One session per request, as the API does; only the leader's session is queried
+        sessions = []
+        def make_session():
+            db = MagicMock()
+            def slow_rows():
+                release.wait(5)
+                return [("TSLA", BiasCategory.CENTER, SentimentCategory.BULLISH, 5)]
+            db.query.return_value.filter.return_value.group_by.return_value.all.side_effect = slow_rows
+            sessions.append(db)
+            return db
+
+        cache = ResultCache(backend=MemoryResultCacheBackend(max_entries=10), ttl_seconds=60, enabled=True, single_flight=single_flight)
+        managers = [AnalysisManager(make_session()) for _ in range(requests)]
+        def request(manager):
+            return cache.get_or_compute("analysis", ["TSLA"], 7, lambda: manager.analyze_ticker("TSLA", 7))
+
+        with ThreadPoolExecutor(max_workers=requests) as executor:
+            futures = [executor.submit(request, manager) for manager in managers]
+            wait_for(lambda: single_flight.followers == requests - 1)
+            release.set()
+            results = [future.result() for future in futures]
+
+        self.assertEqual(sum(db.query.call_count for db in sessions), 1)
+        self.assertTrue(all(result["bias_distribution"]["center_count"] == 5 for result in results))
+
+    def test_request_after_invalidation_does_not_join_older_computation(self):
+        single_flight = SingleFlight()
+        cache = ResultCache(backend=MemoryResultCacheBackend(max_entries=10), ttl_seconds=60, enabled=True, single_flight=single_flight)
+        started = threading.Event()
+        release = threading.Event()
+
+        def pre_commit_compute():
+            # The leader's query ran before the writer committed
+            started.set()
+            release.wait(5)
+            return {"total": 1}
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            leader = executor.submit(cache.get_or_compute, "analysis", ["TSLA"], 7, pre_commit_compute)
+            started.wait(5)
+
+            # The writer commits and invalidates while the leader is in flight
+            cache.invalidate_tickers(["TSLA"])
+            follower = cache.get_or_compute("analysis", ["TSLA"], 7, lambda: {"total": 2})
+
+            release.set()
+            self.assertEqual(leader.result(), {"total": 1})
+
+        # Assert the follower computed its own result and that is what the new key holds
+        self.assertEqual(follower, {"total": 2})
+        self.assertEqual(single_flight.followers, 0)
+        self.assertEqual(cache.get_or_compute("analysis", ["TSLA"], 7, lambda: {"total": 3}), {"total": 2})
+
+if __name__ == '__main__':
+    unittest.main()
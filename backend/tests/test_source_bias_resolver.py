@@ -0,0 +1,82 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+
+# Add the parent directory to the path so we can import the app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.source_bias_resolver import SourceBiasResolver, normalize_domain, registrable_domain
+from app.models.schemas import BiasCategory
+
+def make_source(name, domain, bias_rating):
+    source = MagicMock()
+    source.name = name
+    source.domain = domain
+    source.bias_rating = bias_rating
+    return source
+
+class TestSourceBiasResolver(unittest.TestCase):
+    
+    def setUp(self):
+        # Create a mock database session with a small sources table
+        self.mock_db = MagicMock()
+        self.mock_db.query.return_value.all.return_value = [
+            make_source("CNBC", "cnbc.com", BiasCategory.CENTER),
+            make_source("Yahoo Finance", "finance.yahoo.com", BiasCategory.CENTER),
+            make_source("BBC News", "bbc.co.uk", BiasCategory.LEAN_LEFT),
+            make_source("Seeking Alpha", "seekingalpha.com", BiasCategory.CENTER),
+            make_source("Fox News", "foxnews.com", BiasCategory.RIGHT),
+        ]
+        self.resolver = SourceBiasResolver(refresh_seconds=300)
+        
+    def test_normalize_domain(self):
+        self.assertEqual(normalize_domain("https://www.CNBC.com/markets?x=1"), "cnbc.com")
+        self.assertEqual(normalize_domain("foxnews.com:443"), "foxnews.com")
+        self.assertEqual(normalize_domain(""), "")
+        
+    def test_registrable_domain(self):
+        self.assertEqual(registrable_domain("money.cnn.com"), "cnn.com")
+        self.assertEqual(registrable_domain("news.bbc.co.uk"), "bbc.co.uk")
+        
+    def test_resolves_exact_and_subdomains(self):
+        self.assertEqual(self.resolver.resolve("www.cnbc.com", self.mock_db), BiasCategory.CENTER)
+        self.assertEqual(self.resolver.resolve("https://video.foxnews.com/v/1", self.mock_db), BiasCategory.RIGHT)
+        self.assertEqual(self.resolver.resolve("news.bbc.co.uk", self.mock_db), BiasCategory.LEAN_LEFT)
+        
+    def test_does_not_match_public_suffix_or_parent_of_source(self):
+        # "co.uk" alone is a public suffix, and other-site.co.uk is a different site
+        self.assertEqual(self.resolver.resolve("other-site.co.uk", self.mock_db), BiasCategory.UNKNOWN)
+        self.assertEqual(self.resolver.resolve("example.com", self.mock_db), BiasCategory.UNKNOWN)
+        
+    def test_domains_do_not_match_by_brand(self):
+        # Same first label as a rated outlet, but a different registrable domain
+        self.assertEqual(self.resolver.resolve("cnbc.xx", self.mock_db), BiasCategory.UNKNOWN)
+        self.assertEqual(self.resolver.resolve("https://news.foxnews.example/a", self.mock_db), BiasCategory.UNKNOWN)
+        self.assertEqual(self.resolver.resolve("bbc.com", self.mock_db), BiasCategory.UNKNOWN)
+        
+    def test_resolves_publisher_names(self):
+        # Finnhub reports publisher names rather than domains
+        self.assertEqual(self.resolver.resolve("SeekingAlpha", self.mock_db), BiasCategory.CENTER)
+        self.assertEqual(self.resolver.resolve("Yahoo", self.mock_db), BiasCategory.CENTER)
+        self.assertEqual(self.resolver.resolve("Unknown Blog", self.mock_db), BiasCategory.UNKNOWN)
+        
+    def test_loads_sources_once(self):
+        for _ in range(5):
+            self.resolver.resolve("cnbc.com", self.mock_db)
+            
+        # Assert the sources table was only loaded once
+        self.assertEqual(self.mock_db.query.return_value.all.call_count, 1)
+        
+    def test_invalidate_reloads(self):
+        self.resolver.resolve("cnbc.com", self.mock_db)
+        self.mock_db.query.return_value.all.return_value = [
+            make_source("CNBC", "cnbc.com", BiasCategory.LEAN_LEFT),
+        ]
+        self.resolver.invalidate()
+        
+        # Assert the new rating is picked up after invalidation
+        self.assertEqual(self.resolver.resolve("cnbc.com", self.mock_db), BiasCategory.LEAN_LEFT)
+
+if __name__ == '__main__':
+    unittest.main()
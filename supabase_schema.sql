@@ -139,64 +139,19 @@ CREATE INDEX IF NOT EXISTS portfolio_tickers_portfolio_id_idx ON portfolio_ticke
 CREATE INDEX IF NOT EXISTS portfolio_tickers_ticker_symbol_idx ON portfolio_tickers(ticker_symbol);
 
 -- ==============================================
--- Materialized Views for Analysis
+-- Daily Counts for Analysis
 -- ==============================================
 
--- Bias Distribution by Ticker and Date
-CREATE MATERIALIZED VIEW IF NOT EXISTS bias_analysis_mv AS
-SELECT 
-  t.symbol AS ticker_symbol,
-  DATE_TRUNC('day', na.published_date) AS date,
-  ns.bias_label,
-  COUNT(DISTINCT na.id) AS article_count
-FROM 
-  tickers t
-  JOIN article_tickers at ON t.symbol = at.ticker_symbol
-  JOIN news_articles na ON at.article_id = na.id
-  JOIN news_sources ns ON na.source_id = ns.id
-WHERE 
-  na.published_date >= NOW() - INTERVAL '90 days'
-GROUP BY 
-  t.symbol, DATE_TRUNC('day', na.published_date), ns.bias_label
-WITH DATA;
-
-CREATE UNIQUE INDEX IF NOT EXISTS bias_analysis_mv_unique_idx 
-  ON bias_analysis_mv(ticker_symbol, date, bias_label);
-
--- Sentiment Distribution by Ticker and Date
-CREATE MATERIALIZED VIEW IF NOT EXISTS sentiment_analysis_mv AS
-SELECT 
-  t.symbol AS ticker_symbol,
-  DATE_TRUNC('day', na.published_date) AS date,
-  sa.sentiment_label,
-  COUNT(DISTINCT na.id) AS analysis_count
-FROM 
-  tickers t
-  JOIN article_tickers at ON t.symbol = at.ticker_symbol
-  JOIN news_articles na ON at.article_id = na.id
-  JOIN sentiment_analysis sa ON na.id = sa.article_id
-WHERE 
-  na.published_date >= NOW() - INTERVAL '90 days'
-GROUP BY 
-  t.symbol, DATE_TRUNC('day', na.published_date), sa.sentiment_label
-WITH DATA;
-
-CREATE UNIQUE INDEX IF NOT EXISTS sentiment_analysis_mv_unique_idx 
-  ON sentiment_analysis_mv(ticker_symbol, date, sentiment_label);
+-- Bias and sentiment counts per ticker and day are kept in the article_daily_counts
+-- rollup table, created by the backend (python -m app.db.init_db) and updated in the
+-- same transaction as article inserts and label changes, so no refresh is needed.
+-- Backfill it once for existing articles with:
+--   python -m app.services.article_store
 
 -- ==============================================
 -- Functions
 -- ==============================================
 
--- Function to refresh materialized views
-CREATE OR REPLACE FUNCTION refresh_analysis_views()
-RETURNS void AS $$
-BEGIN
-  REFRESH MATERIALIZED VIEW CONCURRENTLY bias_analysis_mv;
-  REFRESH MATERIALIZED VIEW CONCURRENTLY sentiment_analysis_mv;
-END;
-$$ LANGUAGE plpgsql;
-
 -- Function to get trending tickers based on article count
 CREATE OR REPLACE FUNCTION get_trending_tickers(p_days INTEGER DEFAULT 1, p_limit INTEGER DEFAULT 10)
 RETURNS TABLE (
@@ -387,17 +342,3 @@ INSERT INTO tickers (symbol, company_name, exchange, sector, industry, market_ca
 ('AMZN', 'Amazon.com Inc.', 'NASDAQ', 'Technology', 'Internet Retail', 1700000000000),
 ('TSLA', 'Tesla, Inc.', 'NASDAQ', 'Consumer Discretionary', 'Auto Manufacturers', 800000000000);
 */
-
--- ==============================================
--- Set up scheduled refresh of materialized views
--- ==============================================
-
--- Uncomment and run this in the Supabase Dashboard > Database > Functions section
-/*
-SELECT
-  cron.schedule(
-    'refresh-analysis-views',  -- Name of the schedule
-    '0 */4 * * *',             -- Cron expression (every 4 hours)
-    'SELECT refresh_analysis_views()'
-  );
-*/ 
\ No newline at end of file